@@ -1,45 +1,76 @@
-import streamlit as st
-import numpy as np
+import os
+import time
+from datetime import datetime
+
 import pandas as pd
-import matplotlib.pyplot as plt
-import folium
+import streamlit as st
 import streamlit.components.v1 as components
-import requests
-import xml.etree.ElementTree as ET
-from datetime import datetime
-from folium.plugins import HeatMap  # 히트맵 오버레이용
-import os
-from matplotlib import font_manager as fm
-import warnings
 
 # 페이지 설정 (전체 레이아웃으로 변경 – 사이드바 숨김)
 st.set_page_config(layout="wide", page_title="침수 위험 진단 서비스")
 
+from modules.profiling import span, observe, prometheus_text, start_profile, stop_profile
+
+# ?profile=1 또는 FLOOD_RISK_PROFILE=1일 때만 이번 실행 전체를 cProfile로 측정
+rerun_start = time.perf_counter()
+profiler = start_profile(st.query_params.get("profile") == "1" or os.environ.get("FLOOD_RISK_PROFILE") == "1")
+
 from modules.data import korean_cities
-from modules.api import get_weather_data
-from modules.visualization import create_map, create_rainfall_chart, create_trend_chart, create_simulation_chart
-from modules.utils import calculate_risk, get_recommendations, get_past_data, get_alert_text
-
-# 폰트 경로 설정 (fonts/ 폴더 기준)
-font_dir = os.path.join(os.path.dirname(__file__), 'fonts')
-font_files = fm.findSystemFonts(font_dir)
-for font_file in font_files:
-    try:
-        fm.fontManager.addfont(font_file)
-    except Exception as e:
-        print(f"Font load warning: {e}")  # 디버깅용 (Cloud 로그에 출력)
-
-# 폰트 캐시 재빌드
-fm._load_fontmanager(try_read_cache=False)
-
-# 폰트 가족 설정: NanumGothic 우선, Noto CJK / Liberation Sans / sans-serif fallback
-plt.rcParams['font.family'] = ['NanumGothic', 'Noto Sans CJK KR', 'Liberation Sans', 'sans-serif']
-plt.rcParams['axes.unicode_minus'] = False  # 마이너스 기호 깨짐 방지
-
-# 워닝 완전 무시 (findfont, Glyph, UserWarning 관련)
-warnings.filterwarnings("ignore", message="findfont")
-warnings.filterwarnings("ignore", category=UserWarning, message="Glyph")
-warnings.filterwarnings("ignore", message="Font family")
+from modules.api import get_observation, get_base_datetime, get_cache_stats, WeatherAPIError
+from modules.pipeline import memo
+from modules.scheduler import ObservationRefresher
+from modules.tiles import RiskTileRenderer
+from modules.history import ObservationHistory
+from modules.alerts import AlertEngine, JsonlAlertSink, ALERT_MARGIN
+from modules.district_index import get_district_index
+from modules.ensemble import get_depth_ensemble
+from modules.risk_table import get_risk_table
+from modules.raster import get_terrain
+from modules.ranking import get_ranking
+from modules.forecast import ULTRA_SHORT, get_forecast, get_forecast_base, score_forecast, hours_to_risk
+from modules.utils import calculate_risk, get_recommendations, get_past_data, get_alert_text, RISK_THRESHOLD
+
+
+FORECAST_CHART_SPEC = {
+    'transform': [{'fold': ['예보 강수량 (mm)', '위험 점수'], 'as': ['항목', '값']}],
+    'mark': {'type': 'line', 'point': True},
+    'encoding': {
+        'x': {'field': '예보 시각', 'type': 'temporal', 'timeUnit': 'hours', 'title': '예보 시각 (시)'},
+        'y': {'field': '값', 'type': 'quantitative'},
+        'color': {'field': '항목', 'type': 'nominal'},
+        'tooltip': [{'field': '항목'}, {'field': '값', 'format': '.1f'}]
+    }
+}
+
+
+@st.cache_resource
+def get_tile_renderer():
+    """프로세스 공용 위험도 타일 피라미드 (static/tiles, 관측 갱신 때마다 바뀐 타일만 재생성)"""
+    return RiskTileRenderer()
+
+
+@st.cache_resource
+def get_history():
+    """프로세스 공용 관측 이력 (data/history, 갱신마다 시간 행 추가)"""
+    return ObservationHistory()
+
+
+@st.cache_resource
+def get_alert_engine():
+    """프로세스 공용 구독 알림 엔진 (data/alerts/alerts.jsonl에 전환 알림 기록)"""
+    return AlertEngine(JsonlAlertSink())
+
+
+@st.cache_resource
+def get_refresher(api_key):
+    """프로세스당 1개의 백그라운드 관측 갱신기 (API 키별)"""
+    refresher = ObservationRefresher(api_key)
+    refresher.add_listener(get_history().record_snapshot)
+    refresher.add_listener(get_alert_engine().on_snapshot)
+    refresher.add_listener(get_tile_renderer().update_from_snapshot)
+    refresher.add_listener(get_ranking().on_snapshot)  # 전국 위험 순위 페이지 (pages/)
+    return refresher.start()
+
 
 st.title("침수 위험 진단 서비스 (GIS & AI 프로토타입 + 기상청/시뮬레이션 침수 API 연동)")
 
@@ -48,6 +79,10 @@ if st.secrets.get("dev_mode", False):  # Cloud Secrets 우선, 로컬 fallback
     api_key = st.sidebar.text_input("기상청 API 키", value='c965d7cee76ede7e4be93efd1040a83589b93b4e5c25bd81006e81901d66b809', type="password")
     use_weather = st.sidebar.checkbox("기상청 강수량 연동", value=True)
     use_flood = st.sidebar.checkbox("시뮬레이션 침수심 연동", value=True)
+    with st.sidebar.expander("관측 캐시 통계"):
+        st.json(get_cache_stats())
+    with st.sidebar.expander("단계별 소요 시간 (Prometheus)"):
+        st.code(prometheus_text(), language="text")
 else:
     api_key = st.secrets.get("api_key", "")  # Cloud에서 불러옴
     use_weather = True  # 로컬 기본 활성화
@@ -60,152 +95,217 @@ selected_gu = st.selectbox("구 선택", list(korean_cities[selected_sido].keys(
 lat, lon, nx, ny, base_depth = korean_cities[selected_sido][selected_gu]
 st.write(f"선택된 지역: {selected_sido} {selected_gu} (위도: {lat}, 경도: {lon}, 격자: nx={nx}, ny={ny})")
 
-# 기상청 강수량
-# 기상청 강수량
+# 기상청 강수량 (지역 또는 새 관측 스냅샷이 있을 때만 다시 조회)
 rainfall = st.slider("예상 강수량 (mm)", 50, 200, 100)  # 기본값
 if use_weather and api_key:
     st.info("기상청 API 연동 중...")
-    try:
-        today = datetime.now().strftime('%Y%m%d')
-        now_hour = datetime.now().hour
-        # 단순화된 base_time: 최근 3시간 전 (유효 시간 중)
-        valid_times = ['0200', '0500', '0800', '1100', '1400', '1700', '2000', '2300']
-        hour_idx = max(0, (now_hour // 3 - 1) % 8)  # 1시간 전 인덱스
-        base_time = valid_times[hour_idx]
-        
-        # JSON으로 변경 (파싱 쉽음)
-        url = "http://apis.data.go.kr/1360000/VilageFcstInfoService_2.0/getUltraSrtNcst"
-        params = {
-            'serviceKey': api_key, 'pageNo': '1', 'numOfRows': '10', 'dataType': 'JSON',
-            'base_date': today, 'base_time': base_time, 'nx': str(nx), 'ny': str(ny)
-        }
-        response = requests.get(url, params=params, timeout=10)
-        if response.status_code == 200:
-            data = response.json()
-            result_code = data.get('response', {}).get('header', {}).get('resultCode')
-            if result_code == '00':
-                items = data.get('response', {}).get('body', {}).get('items', {}).get('item', [])
-                pty, rn1 = '0', '0'
-                for item in items:
-                    if item.get('category') == 'PTY':
-                        pty_raw = str(item.get('obsrValue') or '0')  # None/빈 → '0', str 보장
-                        pty = '0' if pty_raw in ['-999', '-998'] else pty_raw
-                    elif item.get('category') == 'RN1':
-                        rn1_raw = str(item.get('obsrValue') or '0')  # None/빈 → '0', str 보장
-                        rn1 = '0' if rn1_raw in ['-999', '-998', '-998.9'] else rn1_raw
-                
-                # 안전한 float 변환 (None/빈 체크 추가)
-                rainfall = float(rn1) if rn1 and rn1 != '0' else 0.0
-                if pty == '0':
-                    rainfall = 0.0
-                    st.info("현재 무강수 (PTY=0), 1시간 후 예보 확인 추천.")
-                st.success(f"기상청 성공! 강수량: {rainfall}mm (형태: {pty}, 발표 시간: {base_time})")
-            elif result_code == '03':  # 데이터 없음: 이전 시간 재시도
-                st.warning(f"데이터 없음 (코드: {result_code}). 이전 시간 재시도 중...")
-                # 이전 시간으로 재시도 (1스텝 전)
-                prev_idx = max(0, hour_idx - 1)
-                params['base_time'] = valid_times[prev_idx]
-                response_retry = requests.get(url, params=params, timeout=10)
-                if response_retry.status_code == 200:
-                    data_retry = response_retry.json()
-                    if data_retry.get('response', {}).get('header', {}).get('resultCode') == '00':
-                        # 동일 파싱 로직 (위와 반복)
-                        items = data_retry.get('response', {}).get('body', {}).get('items', {}).get('item', [])
-                        pty, rn1 = '0', '0'
-                        for item in items:
-                            if item.get('category') == 'PTY':
-                                pty_raw = str(item.get('obsrValue') or '0')  # None/빈 → '0', str 보장
-                                pty = '0' if pty_raw in ['-999', '-998'] else pty_raw
-                            elif item.get('category') == 'RN1':
-                                rn1_raw = str(item.get('obsrValue') or '0')  # None/빈 → '0', str 보장
-                                rn1 = '0' if rn1_raw in ['-999', '-998', '-998.9'] else rn1_raw
-                        
-                        # 안전한 float 변환 (None/빈 체크 추가)
-                        rainfall = float(rn1) if rn1 and rn1 != '0' else 0.0
-                        if pty == '0':
-                            rainfall = 0.0
-                            st.info("현재 무강수 (PTY=0), 1시간 후 예보 확인 추천.")
-                        st.success(f"재시도 성공! 강수량: {rainfall}mm (시간: {valid_times[prev_idx]})")
-                    else:
-                        st.warning("재시도 실패. 슬라이더 사용.")
-                else:
-                    st.error("재시도 HTTP 에러. 슬라이더 사용.")
-            else:
-                st.warning(f"기상청 응답 오류 (코드: {result_code}). 슬라이더 사용.")
-                st.write(f"상세: {response.text[:200]}...")  # 디버깅용
-        else:
-            st.error(f"기상청 HTTP 에러 ({response.status_code}). 슬라이더 사용.")
-            st.write(f"응답: {response.text[:200]}...")  # 디버깅
-    except Exception as e:
-        st.error(f"기상청 실패: {str(e)}. 슬라이더 사용.")
-
-elevation = st.slider("건물 고도 (m)", 0, 50, 10)
-
-# 시뮬레이션 침수심
-flood_depth = 0.0
+    with span('weather_snapshot'):
+        refresher = get_refresher(api_key)
+        refresher.mark_viewed(nx, ny)
+        snapshot = refresher.get_snapshot()
+
+    def load_weather():
+        """(관측, 기준 시각, 오류) – 첫 갱신 전에는 요청 경로에서 직접 조회 (공용 캐시)"""
+        obs, _ = refresher.get_observation(nx, ny)
+        if obs is not None:
+            return obs, snapshot.updated_at, None
+        try:
+            with span('weather_fetch'):
+                return get_observation(api_key, nx, ny), datetime.now(), None
+        except Exception as e:
+            return None, None, e
+
+    obs, fetched_at, weather_error = memo(st.session_state, 'weather',
+                                          (api_key, nx, ny, snapshot.updated_at, get_base_datetime()), load_weather)
+    if isinstance(weather_error, WeatherAPIError):
+        st.warning(f"{weather_error}. 슬라이더 사용.")
+    elif weather_error is not None:
+        st.error(f"기상청 실패: {str(weather_error)}. 슬라이더 사용.")
+    else:
+        rainfall = obs['rainfall']
+        age = (datetime.now() - fetched_at).total_seconds()
+        if obs['pty'] == '0':
+            st.info("현재 무강수 (PTY=0), 1시간 후 예보 확인 추천.")
+        if obs.get('stale'):
+            st.warning("기상청 API 장애 – 마지막 정상 관측값 사용 중.")
+        label = "재시도 성공" if obs['fallback'] else "기상청 성공"
+        st.success(f"{label}! 강수량: {rainfall}mm (형태: {obs['pty']}, 발표 시간: {obs['base_time']}, {int(age // 60)}분 전 갱신)")
+        if snapshot.last_error:
+            st.warning(f"최근 갱신 실패 ({snapshot.last_error}) – 마지막 정상 관측값 표시 중.")
+        # 침수는 누적 강수에 좌우되므로 관측 이력이 있으면 누적 강수량으로 진단 가능
+        accumulations = get_history().cell_accumulations(nx, ny)
+        if accumulations:
+            st.caption(" / ".join(f"{w}시간 누적 {v:.1f}mm" for w, v in accumulations.items()))
+            basis = st.selectbox("위험 계산 강수량 기준", ["1시간 관측"] + [f"{w}시간 누적" for w in accumulations])
+            if basis != "1시간 관측":
+                rainfall = round(accumulations[int(basis.split("시간")[0])], 1)
+
+# 시뮬레이션 침수심 (지역이 바뀔 때만 다시 계산)
+flood_depth, district_code = 0.0, None
 if use_flood:
     st.info("시뮬레이션 침수심 연동 중... (도시별 100년 빈도 가정)")
-    flood_depth = base_depth + np.random.uniform(0, 2, 1)[0]
-    flood_depth = round(flood_depth, 1)
-    st.success(f"시뮬레이션 성공! 예상 침수심: {flood_depth}m (100년 빈도)")
 
-if st.button("위험 진단 실행"):
+    def load_flood():
+        code = get_district_index().code_of(selected_sido, selected_gu)[0]
+        return (code,) + tuple(float(d) for d in get_depth_ensemble().depth_percentiles[code])
+
+    district_code, depth_p50, depth_p90, depth_p99 = memo(st.session_state, 'flood_simulation',
+                                                          (selected_sido, selected_gu), load_flood)
+    flood_depth = round(depth_p50, 1)  # 앙상블 중앙값 (seed 고정 → 재실행해도 동일)
+    st.success(f"시뮬레이션 성공! 예상 침수심: {flood_depth}m (P90 {depth_p90:.1f}m / P99 {depth_p99:.1f}m, 100년 빈도)")
+
+# 초단기예보 (격자·발표 시각이 바뀔 때만 조회, 점수는 고도에 따라 진단 fragment에서 계산)
+forecast = None
+if use_weather and api_key:
+    def load_forecast():
+        try:
+            grid = get_forecast(api_key, cells=[(nx, ny)])
+        except Exception:
+            return None
+        return grid if not grid.failed and len(grid.valid_times) else None
+
+    forecast = memo(st.session_state, 'forecast', (api_key, nx, ny, get_forecast_base(ULTRA_SHORT)), load_forecast)
+
+
+# 수치표고(DEM) 래스터가 있으면 지역 중심 고도를 슬라이더 기본값으로 (data/rasters/dem)
+dem_elevation = get_terrain().elevation_at(lat, lon)
+
+
+@st.fragment
+def diagnosis_panel(rainfall, flood_depth, district_code, forecast, dem_elevation=None):
+    """
+    고도 입력과 진단 결과(점수·예보·지도). 고도를 바꾸면 이 fragment만 다시 실행되어
+    재채점과 지도 마커 색만 갱신 (기상 조회·차트는 재실행되지 않음).
+    """
+    fragment_start = time.perf_counter()
+    default_elevation = 10 if dem_elevation is None else int(min(max(round(dem_elevation), 0), 50))
+    elevation = st.slider("건물 고도 (m)", 0, 50, default_elevation)
+    if dem_elevation is not None:
+        st.caption(f"기본값: 수치표고(DEM) 기준 {selected_gu} 중심 고도 {dem_elevation}m")
+    if st.button("위험 진단 실행") and not st.session_state.get("diagnosed"):
+        st.session_state["diagnosed"] = True
+        st.rerun()  # 고도와 무관한 참고 자료(표·차트)까지 전체 1회 렌더링
+    if not st.session_state.get("diagnosed"):
+        return
+
     # AI 예측
-    risk_score, predicted_risk = calculate_risk(rainfall, elevation, flood_depth)
-    
+    with span('risk_scoring'):
+        risk_score, predicted_risk = calculate_risk(rainfall, elevation, flood_depth)
+        if use_flood:
+            exceedance = get_risk_table().lookup(rainfall, elevation, district_code)  # 조회표 인덱싱
+
     st.header("2. 진단 결과")
     st.metric("위험 점수 (강수량 + 침수)", f"{risk_score:.2f}")
+    if use_flood:
+        st.metric("고위험 확률 (침수심 앙상블)", f"{exceedance:.0%}")
     if predicted_risk == 1:
         st.error("🚨 고위험: 강화형 차수판 설치 추천!")
     else:
         st.success("✅ 저위험: 기본형으로 충분할 수 있어요.")
-    
+
+    # 초단기예보 기준 향후 6시간 위험
+    if forecast is not None:
+        code = get_district_index().code_of(selected_sido, selected_gu)
+        forecast_score, forecast_risk = score_forecast(forecast, elevation, code, flood_depth)
+        st.subheader("향후 6시간 예보 위험 (기상청 초단기예보)")
+        # st.line_chart는 Altair 스키마 검증에 수백 ms가 들어 고정 Vega-Lite 스펙을 직접 사용
+        st.vega_lite_chart(pd.DataFrame({
+            '예보 시각': pd.DatetimeIndex(forecast.valid_times),
+            '예보 강수량 (mm)': forecast.rainfall[forecast.rows_of(nx, ny)[0]],
+            '위험 점수': forecast_score[0]
+        }), FORECAST_CHART_SPEC, use_container_width=True)
+        lead = hours_to_risk(forecast_risk)[0]
+        if lead >= 0:
+            st.error(f"⏰ {forecast.valid_times[lead].astype(object):%H}시 예보 기준 고위험 전환 예상 – 사전 설치 점검 추천!")
+
+    # GIS 지도 (구 단위 히트맵 포함) – 마커 색/팝업만 고도에 따라 바뀌고 HTML은 LRU 캐시
+    st.header("3. 위치 기반 GIS 지도 (구 단위 히트맵 오버레이)")
+    with span('viz_import'):
+        from modules.visualization import create_map_html
+    tile_renderer = get_tile_renderer()
+    tile_url = tile_renderer.tile_url() if tile_renderer.version else None  # 첫 피라미드 생성 전에는 히트맵
+    with span('map_build'):
+        map_html = create_map_html(lat, lon, predicted_risk, selected_gu, risk_score, rainfall, flood_depth,
+                                   korean_cities, tile_url)
+    with span('html_embed'):
+        components.html(map_html, height=500, width=700)
+
+    # 히트맵 설명 추가
+    st.write("### 히트맵 설명")
+    if tile_url:
+        st.write("- **색상**: 최신 기상청 관측 강수량과 구별 침수심으로 계산한 현재 위험 점수 (파랑 < 10 < 노랑 < 20 < 주황 < 40 < 빨강 < 80 < 진홍).")
+        st.write("- **갱신**: 관측 발표마다 위험 등급이 바뀐 지역의 타일만 다시 그립니다 (건물 고도 10m 기준).")
+    else:
+        st.write("- **색상**: 빨간색은 높은 침수 위험(기본 침수심이 큼), 파란색은 낮은 침수 위험을 나타냅니다.")
+        st.write("- **가중치**: 각 구의 기본 침수심(base_depth)을 10배 스케일링하여 표시. 값이 클수록 침수 가능성이 높습니다.")
+    st.info("히트맵: 각 구의 침수심 기반 위험도 – 현재 위치와 비교해 위험 파악하세요!")
+
+    # 관측 갱신 때마다 알림 엔진이 이 지점의 고위험 진입/해제를 평가
+    if use_weather and api_key:
+        with st.expander("이 지점 위험 알림 구독"):
+            contact = st.text_input("알림 받을 연락처 (이메일/전화)")
+            alert_engine = get_alert_engine()
+            if st.button("알림 구독", disabled=not contact):
+                alert_engine.subscribe(contact, nx, ny, elevation, flood_depth)
+                st.success(f"구독 완료: {selected_gu} (고도 {elevation}m) – 위험 점수가 {RISK_THRESHOLD}점을 넘으면 알림, "
+                           f"{RISK_THRESHOLD - ALERT_MARGIN:g}점 미만으로 내려가면 해제 알림.")
+            if contact and alert_engine.is_active(contact):
+                st.error("🔔 현재 고위험 알림 발령 중")
+    observe('diagnosis_panel', time.perf_counter() - fragment_start)
+
+
+diagnosis_panel(rainfall, flood_depth, district_code, forecast, dem_elevation)
+
+# 고도와 무관한 참고 자료: 전체 재실행 때만 그리며 차트 PNG는 프로세스 캐시 재사용
+if st.session_state.get("diagnosed"):
+    # matplotlib은 진단 결과를 그릴 때만 로드 (최초 1회, 이후 모듈 캐시)
+    with span('viz_import'):
+        from modules.visualization import (get_rainfall_chart_png, get_trend_chart_png, get_simulation_chart_png,
+                                           get_accumulation_chart_png)
+
+    st.header("4. 참고 자료")
+
     # 추천 테이블
     st.subheader("추천 설치 옵션")
     recommendations = get_recommendations()
     st.table(recommendations)
-    
+
     # 과거 데이터
     st.subheader("지역 과거 침수 사례 (강수량 초과 시 위험 ↑)")
     past_data = get_past_data()
     st.table(past_data)
     st.warning("강수량 200mm 초과 시 침수 확률 50% ↑ – 2025년 사례처럼 피해 예방하세요!")
-    
+
     # 강수량 vs 침수 확률 차트
     st.subheader("강수량 vs 침수 확률 (과거 데이터 기반)")
-    fig_rainfall = create_rainfall_chart(rainfall)
-    st.pyplot(fig_rainfall)
+    with span('chart_rainfall'):
+        st.image(get_rainfall_chart_png(rainfall))
     st.info("200mm 초과 시 80% 이상 침수 위험 – 과거 호우 사례처럼 주의!")
-    
+
+    # 관측 이력 기반 누적 강수량 (메모리 맵 이력에서 최근 72시간만 slice)
+    recent = get_history().cell_recent(nx, ny) if use_weather and api_key else None
+    if recent is not None:
+        st.subheader("최근 72시간 관측 강수량 (24시간 누적)")
+        with span('chart_accumulation'):
+            st.image(get_accumulation_chart_png(*recent))
+
     # 개인화 알림
     with st.expander("침수 위험 상세 알림 (개인화)"):
         alert_text = get_alert_text(rainfall)
         st.write(alert_text)
         st.warning("차수판 설치로 피해 70% 예방 가능! 문의하세요.")
-    
+
     # 연간 강수량 추세
     st.subheader("연간 강수량 추세 (침수 위험 증가)")
-    fig_trend = create_trend_chart()
-    st.pyplot(fig_trend)
+    with span('chart_trend'):
+        st.image(get_trend_chart_png())
     st.info("2025년 장마 강수량 증가 – 과거 데이터로 30% 위험 ↑! 예방이 핵심.")
-    
-    # GIS 지도 (구 단위 히트맵 포함)
-    st.subheader("3. 위치 기반 GIS 지도 (구 단위 히트맵 오버레이)")
-    m = create_map(lat, lon, predicted_risk, selected_gu, risk_score, rainfall, flood_depth, korean_cities)
-    map_html = m._repr_html_()
-    components.html(map_html, height=500, width=700)
-    
-    # 히트맵 설명 추가
-    st.write("### 히트맵 설명")
-    st.write("- **색상**: 빨간색은 높은 침수 위험(기본 침수심이 큼), 파란색은 낮은 침수 위험을 나타냅니다.")
-    st.write("- **가중치**: 각 구의 기본 침수심(base_depth)을 10배 스케일링하여 표시. 값이 클수록 침수 가능성이 높습니다.")
-    st.info("히트맵: 각 구의 침수심 기반 위험도 – 현재 위치와 비교해 위험 파악하세요!")
-    
+
     # 시뮬레이션 그래프
-    st.subheader("4. 시뮬레이션 그래프")
-    fig_simulation = create_simulation_chart()
-    st.pyplot(fig_simulation)
-    
+    st.subheader("5. 시뮬레이션 그래프")
+    with span('chart_simulation'):
+        st.image(get_simulation_chart_png(district_code))
+
     st.info("💡 구 단위 히트맵으로 침수 위험 시각화! 배포 시 WMS 오버레이 추가 추천.")
 
 # 사이드바 도움말
@@ -220,4 +320,10 @@ st.caption("""
 **데이터 출처**: 
 - 기상청_단기예보 (공공데이터포털): https://www.data.go.kr/data/15007722/openapi.do
 - 공공누리 "출처표시" 조건에 따라 이용. 원본 데이터 제공: 기상청.
-""")
\ No newline at end of file
+""")
+
+observe('rerun_total', time.perf_counter() - rerun_start)
+profile_stats = stop_profile(profiler)
+if profile_stats:
+    with st.expander("이번 실행 프로파일 (cProfile)"):
+        st.code(profile_stats, language="text")
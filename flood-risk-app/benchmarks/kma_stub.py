@@ -0,0 +1,155 @@
+"""
+기상청 getUltraSrtNcst 녹화 응답 재생용 로컬 스텁 서버.
+getUltraSrtFcst/getVilageFcst는 같은 형식의 시간별 항목을 합성해 응답 (격자당 60/870여 항목).
+
+    stub = KMAStub(scenario='nodata').start()
+    api.NCST_URL = stub.url
+
+scenario
+- ok: 항상 정상 응답 (fixtures/ncst_ok.*)
+- nodata: 최신 발표 시각 요청은 코드 03, 이전 발표 시각은 정상 (재시도 경로)
+- error: 서비스 키 오류 등 에러 payload
+- http500: HTTP 500
+"""
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qsl
+
+from modules.api import get_base_datetime
+from modules.forecast import ULTRA_SHORT, SHORT, get_forecast_base
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURE_DIR, name), 'rb') as f:
+        return f.read()
+
+
+# operation -> (상품, 예보 시간 수, 항목 순서)
+FORECAST_ITEMS = {
+    'getUltraSrtFcst': (ULTRA_SHORT, 6, ('LGT', 'PTY', 'RN1', 'SKY', 'T1H', 'REH', 'UUU', 'VVV', 'VEC', 'WSD')),
+    'getVilageFcst': (SHORT, 72, ('TMP', 'UUU', 'VVV', 'VEC', 'WSD', 'SKY', 'PTY', 'POP', 'WAV', 'PCP', 'REH', 'SNO'))
+}
+RAIN_VALUES = ('강수없음', '1mm 미만', '2.0mm', '6.0mm', '30.0~50.0mm', '50.0mm 이상')
+
+
+def forecast_items(operation, params):
+    """발표 시각 다음 정시부터 시간별 (category, fcstDate, fcstTime, fcstValue) 합성"""
+    _, leads, categories = FORECAST_ITEMS[operation]
+    base = datetime.strptime(params['base_date'] + params['base_time'], '%Y%m%d%H%M')
+    origin = base.replace(minute=0) + timedelta(hours=1)
+    for lead in range(leads):
+        valid = origin + timedelta(hours=lead)
+        rain = RAIN_VALUES[lead % len(RAIN_VALUES)]
+        for category in categories:
+            if category in ('RN1', 'PCP'):
+                value = rain
+            elif category == 'PTY':
+                value = '0' if rain == '강수없음' else '1'
+            elif category == 'POP':
+                value = str(lead * 7 % 100)
+            else:
+                value = '1'
+            yield category, valid.strftime('%Y%m%d'), valid.strftime('%H%M'), value
+
+
+def render_forecast(operation, params, ext):
+    """녹화 응답과 같은 형식의 예보 본문 (기상청 필드 순서)"""
+    base_date, base_time, nx, ny = (params.get(k, '') for k in ('base_date', 'base_time', 'nx', 'ny'))
+    items = list(forecast_items(operation, params))
+    if ext == 'json':
+        body = ','.join(
+            f'{{"baseDate":"{base_date}","baseTime":"{base_time}","category":"{c}","fcstDate":"{d}",'
+            f'"fcstTime":"{t}","fcstValue":{json.dumps(v, ensure_ascii=False)},"nx":{nx},"ny":{ny}}}'
+            for c, d, t, v in items)
+        return (f'{{"response":{{"header":{{"resultCode":"00","resultMsg":"NORMAL_SERVICE"}},"body":{{'
+                f'"dataType":"JSON","items":{{"item":[{body}]}},"pageNo":1,"numOfRows":{len(items)},'
+                f'"totalCount":{len(items)}}}}}}}').encode()
+    body = ''.join(
+        f'<item><baseDate>{base_date}</baseDate><baseTime>{base_time}</baseTime><category>{c}</category>'
+        f'<fcstDate>{d}</fcstDate><fcstTime>{t}</fcstTime><fcstValue>{v}</fcstValue><nx>{nx}</nx><ny>{ny}</ny></item>'
+        for c, d, t, v in items)
+    return (f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?><response><header><resultCode>00</resultCode>'
+            f'<resultMsg>NORMAL_SERVICE</resultMsg></header><body><dataType>XML</dataType><items>{body}</items>'
+            f'<numOfRows>{len(items)}</numOfRows><pageNo>1</pageNo><totalCount>{len(items)}</totalCount>'
+            f'</body></response>').encode()
+
+
+def render_fixture(template, params):
+    """녹화 응답의 {base_date}/{base_time}/{nx}/{ny} 자리를 요청 값으로 치환"""
+    for key in ('base_date', 'base_time', 'nx', 'ny'):
+        template = template.replace(('{%s}' % key).encode(), params.get(key, '').encode())
+    return template
+
+
+class KMAStub:
+    def __init__(self, scenario='ok', latency=0.0, host='127.0.0.1', port=0):
+        self.scenario = scenario
+        self.latency = latency
+        self.requests = 0
+        self._fixtures = {name: load_fixture(name) for name in os.listdir(FIXTURE_DIR)}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/1360000/VilageFcstInfoService_2.0/getUltraSrtNcst"
+
+    def respond(self, params, operation='getUltraSrtNcst'):
+        """요청 파라미터 → (HTTP 상태, content-type, body)"""
+        ext = 'json' if params.get('dataType', 'XML').upper() == 'JSON' else 'xml'
+        content_type = 'application/json' if ext == 'json' else 'text/xml'
+        if self.scenario == 'http500':
+            return 500, 'text/plain', b'Internal Server Error'
+        if self.scenario == 'error':
+            return 200, content_type, self._fixtures[f'ncst_error.{ext}']
+        if operation in FORECAST_ITEMS:
+            latest = get_forecast_base(FORECAST_ITEMS[operation][0]).strftime('%H%M')
+            if self.scenario == 'nodata' and params.get('base_time') == latest:
+                return 200, content_type, self._fixtures[f'ncst_nodata.{ext}']
+            return 200, content_type, render_forecast(operation, params, ext)
+        if self.scenario == 'nodata' and params.get('base_time') == get_base_datetime().strftime('%H%M'):
+            return 200, content_type, self._fixtures[f'ncst_nodata.{ext}']
+        return 200, content_type, render_fixture(self._fixtures[f'ncst_ok.{ext}'], params)
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # keep-alive
+            disable_nagle_algorithm = True  # 헤더/본문 분할 전송 시 지연 ACK 방지
+
+            def do_GET(self):
+                with stub._lock:
+                    stub.requests += 1
+                if stub.latency:
+                    time.sleep(stub.latency)
+                url = urlsplit(self.path)
+                status, content_type, body = stub.respond(dict(parse_qsl(url.query)), url.path.rsplit('/', 1)[-1])
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
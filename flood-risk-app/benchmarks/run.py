@@ -0,0 +1,466 @@
+"""
+성능 벤치마크 (실제 data.go.kr 대신 로컬 녹화 응답 스텁 사용).
+
+    python -m benchmarks.run --output bench.json
+    python -m benchmarks.run --output new.json --baseline bench.json --threshold 0.2
+
+각 항목은 대표 지표 1개(value)와 방향(better: lower/higher)을 가지며,
+--baseline 대비 threshold 비율 이상 나빠지면 종료 코드 1로 실패.
+RSS 증가량(진단 반복, 리포트 연속 생성)은 기준 리포트 없이 절대 한도(--max-*-rss-growth-mb)로 검사.
+"""
+import argparse
+import gc
+import json
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+
+from benchmarks.kma_stub import KMAStub, load_fixture, render_forecast
+from modules import api, forecast, shared_cache
+from modules.alerts import AlertEngine
+from modules.district_index import get_district_index
+from modules.ensemble import get_depth_ensemble
+from modules.history import ObservationHistory
+from modules.ranking import RiskRanking
+from modules.raster import RasterLayer, write_tiles
+from modules.risk_table import RiskTable, get_risk_table
+from modules.shared_cache import SharedCache
+from modules.data import korean_cities
+from modules.utils import calculate_risk, calculate_risk_array
+
+NOISE_FLOOR_MS = 0.05  # 이보다 빠른 항목은 측정 잡음이 커서 상대 비교 제외
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app.py')
+
+
+def measure(fn, repeat, warmup=1):
+    """fn 반복 실행 시간 분포 (ms)"""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples = np.array(samples)
+    return {
+        'metric': 'p50_ms', 'value': float(np.percentile(samples, 50)), 'better': 'lower',
+        'p95_ms': float(np.percentile(samples, 95)), 'mean_ms': float(samples.mean()), 'repeat': repeat
+    }
+
+
+def throughput(fn, rows, repeat):
+    """fn 1회가 rows개를 처리할 때 초당 처리량 (최고 회차 기준)"""
+    best = min(measure(fn, 1, warmup=1 if i == 0 else 0)['value'] for i in range(repeat))
+    return {'metric': 'rows_per_sec', 'value': rows / (best / 1000), 'better': 'higher', 'rows': rows}
+
+
+def current_rss_mb():
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def bench_fetch(stub, repeat):
+    results = {}
+
+    def fetch():
+        api._obs_cache.clear()
+        try:
+            api.get_observation('bench', 60, 127)
+        except api.WeatherAPIError:
+            pass
+
+    for scenario in ('ok', 'nodata', 'error'):
+        stub.scenario = scenario
+        results[f'fetch_parse_xml_{scenario}'] = measure(fetch, repeat)
+    stub.scenario = 'ok'
+
+    def fetch_json():
+        params = {'serviceKey': 'bench', 'dataType': 'JSON', 'base_date': '20250101', 'base_time': '0000',
+                  'nx': '60', 'ny': '127'}
+        api._session.get(stub.url, params=params, timeout=10).json()
+
+    results['fetch_parse_json_ok'] = measure(fetch_json, repeat)
+    content = load_fixture('ncst_ok.xml')
+    results['parse_xml'] = measure(lambda: api.parse_observation(content), repeat * 10)
+    return results
+
+
+def bench_forecast(stub, repeat):
+    """단기예보(격자당 870여 항목) 스트리밍 파싱 및 격자 1개 조회"""
+    params = {'base_date': '20250101', 'base_time': '0500', 'nx': '60', 'ny': '127'}
+    origin = forecast.lead_origin(datetime(2025, 1, 1, 5))
+    results = {}
+    for ext in ('json', 'xml'):
+        body = render_forecast('getVilageFcst', params, ext)
+        chunks = [body[i:i + forecast.CHUNK_SIZE] for i in range(0, len(body), forecast.CHUNK_SIZE)]
+        iter_items = forecast.iter_json_items if ext == 'json' else forecast.iter_xml_items
+        results[f'forecast_parse_{ext}'] = measure(
+            lambda: forecast.fill_forecast(iter_items(chunks), forecast.SHORT, origin), repeat)
+
+    def fetch():
+        forecast._fcst_cache.clear()
+        forecast.get_cell_forecast('bench', 60, 127, forecast.SHORT)
+
+    stub.scenario = 'ok'
+    results['forecast_fetch_short'] = measure(fetch, repeat)
+    return results
+
+
+def bench_history(repeat, hours):
+    """전국 격자 hours시간 이력 기록 후 누적 강수량 계산"""
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as path:
+        history = ObservationHistory(path)
+        start = np.datetime64('2025-01-01T00', 'h')
+        rows = rng.gamma(0.3, 3.0, size=(hours, len(history.cells))).astype(np.float32).tolist()
+        begin = time.perf_counter()
+        for i, row in enumerate(rows):
+            history.record(start + np.timedelta64(i, 'h'), dict(zip(history.cells, row)))
+        append_ms = (time.perf_counter() - begin) * 1000 / hours
+        results = {
+            'history_append': {'metric': 'p50_ms', 'value': append_ms, 'better': 'lower', 'hours': hours},
+            'history_accumulations': measure(history.accumulations, repeat * 10),
+            'history_rolling_24h': measure(lambda: history.rolling(24), repeat),
+            'history_disk_mb': {'metric': 'mb', 'value': os.path.getsize(history._data_path) / 2 ** 20,
+                                'better': 'lower', 'hours': hours}
+        }
+        del history
+    return results
+
+
+def bench_alerts(repeat, subscriptions):
+    """전국 격자에 subscriptions개 구독, 매 갱신 전 격자 강수량 변경 (최악) / 일부 격자만 변경"""
+    rng = np.random.default_rng(0)
+    cells = list(api.get_grid_cells())
+    picks = rng.integers(len(cells), size=subscriptions)
+    engine = AlertEngine()
+    engine.subscribe_many(range(subscriptions), [cells[i][0] for i in picks], [cells[i][1] for i in picks],
+                          rng.uniform(0, 50, subscriptions), rng.uniform(0, 2, subscriptions))
+    engine.evaluate(dict.fromkeys(cells, 0.0))
+    refreshes = [dict(zip(cells, rng.gamma(0.5, 10.0, len(cells)).round(1).tolist())) for _ in range(repeat + 1)]
+    updates = iter(refreshes)
+    results = {'alerts_evaluate_all_cells': measure(lambda: engine.evaluate(next(updates)), repeat)}
+
+    partial = dict(refreshes[-1])
+    bumps = iter(range(1, repeat * 10 + 2))
+
+    def evaluate_partial():
+        bump = next(bumps)
+        for cell in cells[:10]:
+            partial[cell] = float(bump)
+        engine.evaluate(partial)
+
+    results['alerts_evaluate_10_cells'] = measure(evaluate_partial, repeat * 10)
+    for result in results.values():
+        result['subscriptions'] = subscriptions
+    return results
+
+
+def _shared_fill_worker(path, keys, log_path):
+    """bench_shared_cache 워커: 모든 키를 get_or_fill, 실제 loader 호출은 log에 1줄씩"""
+    cache = SharedCache(path)
+
+    def load():
+        time.sleep(0.01)  # 상류 호출 대신
+        with open(log_path, 'a') as f:
+            f.write('1\n')
+        return b'x' * 200, time.time() + 3600
+
+    for key in keys:
+        cache.get_or_fill(key, load)
+
+
+def bench_shared_cache(repeat, processes, keys):
+    """호스트 공용 캐시 조회/채우기(크기 상한 적용) + processes개 프로세스 동시 미스 시 키당 loader 호출 수"""
+    with tempfile.TemporaryDirectory() as path:
+        cache = SharedCache(os.path.join(path, 'bounded.sqlite3'), max_bytes=1 << 20)
+        value = os.urandom(50 * 1024)  # 차트 PNG 크기
+        cache.set('hit', value)
+        fills = iter(range(10 ** 9))
+        results = {
+            'shared_cache_hit': measure(lambda: cache.get('hit'), repeat * 100),
+            'shared_cache_fill_evict': measure(
+                lambda: cache.get_or_fill(f'fill:{next(fills)}', lambda: (value, None)), repeat * 10)
+        }
+        if cache.stats()['bytes'] > cache.max_bytes:
+            raise AssertionError("공용 캐시 크기 상한 초과")
+
+        shared_path, log_path = os.path.join(path, 'shared.sqlite3'), os.path.join(path, 'loads.log')
+        SharedCache(shared_path)
+        names = [f'obs:{i}' for i in range(keys)]
+        workers = [multiprocessing.Process(target=_shared_fill_worker, args=(shared_path, names, log_path))
+                   for _ in range(processes)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        with open(log_path) as f:
+            loads = len(f.readlines())
+        results['shared_cache_loads_per_key'] = {'metric': 'ratio', 'value': loads / keys, 'better': 'lower',
+                                                 'processes': processes, 'keys': keys}
+    return results
+
+
+def bench_ranking(repeat, entries):
+    """전국 지역 + entries개 지점 순위: 일부 격자(10개)/전 격자 강수량 변경 갱신, 페이지 조회"""
+    rng = np.random.default_rng(0)
+    cells = list(api.get_grid_cells())
+    ranking = RiskRanking()
+    picks = rng.integers(len(cells), size=entries)
+    ranking.add_entries([f'B{i}' for i in range(entries)], rng.choice(ranking.sidos(), entries),
+                        [cells[i][0] for i in picks], [cells[i][1] for i in picks],
+                        rng.uniform(0, 50, entries), rng.uniform(0, 2, entries))
+    refreshes = [dict(zip(cells, rng.gamma(0.5, 10.0, len(cells)).round(1).tolist())) for _ in range(repeat + 1)]
+    updates = iter(refreshes)
+    results = {'ranking_update_all_cells': measure(lambda: ranking.update(next(updates)), repeat)}
+
+    partial = dict(refreshes[-1])
+    bumps = iter(range(1, repeat * 10 + 2))
+
+    def update_partial():
+        bump = next(bumps)
+        for cell in cells[:10]:
+            partial[cell] = float(bump)
+        ranking.update(partial)
+
+    results['ranking_update_10_cells'] = measure(update_partial, repeat * 10)
+    results['ranking_page'] = measure(lambda: ranking.page(1000, 50), repeat * 100)
+    results['ranking_page_filtered'] = measure(lambda: ranking.page(0, 50, '서울특별시', 4), repeat * 100)
+    for result in results.values():
+        result['entries'] = len(ranking)
+    return results
+
+
+def bench_risk(repeat, rows):
+    rng = np.random.default_rng(0)
+    rainfall = rng.uniform(0, 300, rows).astype(np.float32)
+    elevation = rng.uniform(0, 50, rows).astype(np.float32)
+    depth = rng.uniform(0, 3, rows).astype(np.float32)
+    scalar_rows = 100000
+
+    def scalar():
+        for r, e, d in zip(rainfall[:scalar_rows].tolist(), elevation[:scalar_rows].tolist(), depth[:scalar_rows].tolist()):
+            calculate_risk(r, e, d)
+
+    return {
+        'calculate_risk_scalar': throughput(scalar, scalar_rows, repeat),
+        'calculate_risk_array_f32': throughput(
+            lambda: calculate_risk_array(rainfall, elevation, depth, dtype=np.float32), rows, repeat),
+        'calculate_risk_array_f64': throughput(lambda: calculate_risk_array(rainfall, elevation, depth), rows, repeat),
+        'risk_table_build': measure(RiskTable, repeat, warmup=0),
+        'risk_table_lookup': measure(lambda: get_risk_table().lookup(120, 10, 5), repeat * 1000),
+        'ensemble_exceedance': measure(lambda: get_depth_ensemble().exceedance(120, 10, 5), repeat * 1000)
+    }
+
+
+def bench_raster(repeat, points):
+    """전국 범위 0.002° DEM 타일(3000×3750, 약 45MB)에서 points개 좌표 조회: 전국 무작위 / 서울 범위 집중"""
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as path:
+        dem = rng.uniform(0, 300, size=(3000, 3750)).astype(np.float32)
+        write_tiles(dem, path, 124.5, 39.0, 0.002, 0.002)
+        del dem
+        layer = RasterLayer(path)
+        nation = rng.uniform(33, 39, points), rng.uniform(124.5, 132, points)
+        seoul = rng.uniform(37.43, 37.7, points), rng.uniform(126.76, 127.18, points)
+        results = {
+            'raster_sample_nation': throughput(lambda: layer.sample(*nation), points, repeat),
+            'raster_sample_city': throughput(lambda: layer.sample(*seoul), points, repeat),
+            'raster_sample_point': measure(lambda: layer.sample(37.5, 127.0), repeat * 100)
+        }
+        del layer
+    return results
+
+
+def bench_visualization(repeat):
+    from modules import visualization as vis
+
+    args = (37.5172, 127.0474, 1, '강남구', 55.12, 100, 1.5)
+    results = {
+        'create_map_build': measure(lambda: vis.create_map(*args, korean_cities), repeat),
+        'map_html_render': measure(lambda: vis.create_map(*args, korean_cities)._repr_html_(), repeat),
+        'map_html_cached': measure(lambda: vis.create_map_html(*args, korean_cities), repeat * 10),
+        'rainfall_chart_render': measure(lambda: vis.render_figure(vis.create_rainfall_chart(120)), repeat),
+        'trend_chart_render': measure(lambda: vis.render_figure(vis.create_trend_chart()), repeat),
+        'simulation_chart_render': measure(lambda: vis.get_simulation_chart_png.__wrapped__(5), repeat),
+        'rainfall_chart_cached': measure(lambda: vis.get_rainfall_chart_png(120), repeat * 10)
+    }
+    return results
+
+
+def bench_reports(repeat, reports):
+    """리포트 1장 렌더링 (figure 재사용) + 워밍업 후 reports장 연속 생성 시 RSS 증가량"""
+    from modules.report import ReportTemplate, release_font_cache
+
+    template = ReportTemplate()
+    sites = iter(range(10 ** 9))
+
+    def render(fmt):
+        i = next(sites)
+        template.render(f"B{i}", 35 + i % 30 * 0.1, 127 + i % 17 * 0.1, i % 50, float(50 + i % 150), fmt=fmt)
+
+    results = {
+        'report_render_pdf': measure(lambda: render('pdf'), repeat),
+        'report_render_png': measure(lambda: render('png'), repeat)
+    }
+    for i in range(64):  # 글리프/경로 캐시 워밍업
+        render('pdf')
+    release_font_cache()
+    gc.collect()
+    before = current_rss_mb()
+    for i in range(reports):
+        render('pdf')
+        if i % 32 == 31:  # generate_reports 묶음 단위와 동일
+            release_font_cache()
+    gc.collect()
+    results['report_rss_growth_mb'] = {'metric': 'mb', 'value': current_rss_mb() - before, 'better': 'lower',
+                                       'reports': reports}
+    template.close()
+    return results
+
+
+def bench_memory(diagnoses):
+    """진단 반복 시 RSS 증가량 (차트/지도 캐시 워밍업 이후 기준)"""
+    from modules import visualization as vis
+
+    rng = random.Random(0)
+    gus = [(sido, gu, values) for sido, d in korean_cities.items() for gu, values in d.items()]
+    index = get_district_index()
+
+    def diagnose():
+        sido, gu, (lat, lon, _, _, base_depth) = rng.choice(gus)
+        rainfall = rng.randint(50, 200)
+        risk_score, predicted_risk = calculate_risk(rainfall, rng.randint(0, 50), base_depth)
+        vis.get_rainfall_chart_png(rainfall)
+        vis.get_trend_chart_png()
+        vis.get_simulation_chart_png(index.code_of(sido, gu)[0])
+        vis.create_map_html(lat, lon, predicted_risk, gu, risk_score, rainfall, base_depth, korean_cities)
+
+    warmup = diagnoses // 4
+    for _ in range(warmup):
+        diagnose()
+    gc.collect()
+    before = current_rss_mb()
+    for _ in range(diagnoses):
+        diagnose()
+    gc.collect()
+    return {'rss_growth_mb': {'metric': 'mb', 'value': current_rss_mb() - before, 'better': 'lower',
+                              'diagnoses': diagnoses, 'rss_mb': current_rss_mb()}}
+
+
+def bench_script(repeat):
+    from streamlit.testing.v1 import AppTest
+
+    def rerun(click):
+        at = AppTest.from_file(APP_PATH, default_timeout=120)
+        at.secrets['dev_mode'] = False
+        at.secrets['api_key'] = 'bench'
+        at.run()
+        if click:
+            at.button[0].click().run()
+
+    return {
+        'script_rerun': measure(lambda: rerun(False), repeat),
+        'script_rerun_diagnosis': measure(lambda: rerun(True), repeat)
+    }
+
+
+def compare(report, baseline, threshold):
+    """baseline 대비 threshold 이상 악화된 항목 목록 (RSS는 절대 한도로 따로 검사)"""
+    regressions = []
+    for name, result in report['results'].items():
+        base = baseline.get('results', {}).get(name)
+        if not base or base.get('metric') != result['metric'] or not base['value']:
+            continue
+        if result['metric'] == 'mb' or (result['metric'] == 'p50_ms' and base['value'] < NOISE_FLOOR_MS):
+            continue
+        if result['better'] == 'lower':
+            change = (result['value'] - base['value']) / abs(base['value'])
+        else:
+            change = (base['value'] - result['value']) / abs(base['value'])
+        if change > threshold:
+            regressions.append((name, base['value'], result['value'], change))
+    return regressions
+
+
+def run(quick=False, skip_script=False):
+    repeat = 5 if quick else 30
+    stub = KMAStub().start()
+    api.NCST_URL = stub.url
+    shared_cache.SHARED_CACHE_PATH = 'off'  # 기존 항목은 프로세스 내 경로만 측정 (공용 캐시는 bench_shared_cache)
+    try:
+        results = {}
+        results.update(bench_fetch(stub, repeat))
+        results.update(bench_shared_cache(repeat, 4, 50))
+        results.update(bench_forecast(stub, repeat))
+        results.update(bench_history(repeat, 24 * 30 if quick else 24 * 365))
+        results.update(bench_alerts(repeat, 100000))
+        results.update(bench_ranking(repeat, 1000000))
+        results.update(bench_risk(3, 1000000 if quick else 10000000))
+        results.update(bench_raster(3, 1000000))
+        results.update(bench_visualization(repeat))
+        results.update(bench_reports(3 if quick else 10, 100 if quick else 500))
+        results.update(bench_memory(500 if quick else 3000))
+        if not skip_script:
+            results.update(bench_script(3 if quick else 10))
+    finally:
+        stub.stop()
+    return {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(), 'platform': platform.platform(),
+            'numpy': np.__version__, 'quick': quick
+        },
+        'results': results
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="침수 위험 진단 벤치마크")
+    parser.add_argument('--output', default='bench_output.json', help="JSON 리포트 경로")
+    parser.add_argument('--baseline', help="비교 기준 리포트")
+    parser.add_argument('--threshold', type=float, default=0.2, help="허용 악화 비율 (0.2 = 20%%)")
+    parser.add_argument('--max-rss-growth-mb', type=float, default=20.0, help="진단 반복 시 허용 RSS 증가량")
+    parser.add_argument('--max-report-rss-growth-mb', type=float, default=20.0,
+                        help="리포트 연속 생성 시 허용 RSS 증가량")
+    parser.add_argument('--quick', action='store_true', help="반복 횟수 축소")
+    parser.add_argument('--skip-script', action='store_true', help="Streamlit 스크립트 재실행 측정 생략")
+    args = parser.parse_args(argv)
+
+    report = run(args.quick, args.skip_script)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    for name, result in report['results'].items():
+        print(f"{name:32s} {result['value']:>14,.3f} {result['metric']}")
+
+    failed = False
+    limits = [('rss_growth_mb', "진단 반복", args.max_rss_growth_mb),
+              ('report_rss_growth_mb', "리포트 연속 생성", args.max_report_rss_growth_mb)]
+    for name, label, limit in limits:
+        growth = report['results'][name]['value']
+        if growth > limit:
+            print(f"메모리 회귀: {label} 중 RSS {growth:.1f}MB 증가 (허용 {limit}MB)")
+            failed = True
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        for name, before, after, change in compare(report, baseline, args.threshold):
+            print(f"성능 회귀: {name} {before:,.3f} → {after:,.3f} ({change:+.0%})")
+            failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,148 @@
+"""
+지점별 침수 위험 진단 리포트 일괄 생성 (CLI).
+
+입력 CSV/Parquet (id, lat, lon, elevation)를 청크로 읽어 격자·현재 강수량을 붙인 뒤
+지점 묶음 단위로 프로세스 풀에 분배. 워커는 시작 시 한글 폰트·위험 조회표·리포트 figure를 1회 만들고
+모든 지점에 재사용하며, 리포트는 워커가 직접 파일로 기록 (부모로 bytes를 보내지 않음).
+
+    python generate_reports.py buildings.csv reports/ --format pdf --workers 4 --api-key KEY
+"""
+import argparse
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from modules.district_index import get_district_index
+from score_portfolio import MAX_DISTRICT_KM, RainfallResolver, read_chunks, site_flood_depth, _prepare, peak_memory_mb
+
+FORMATS = ('pdf', 'png')
+BATCH_SIZE = 32  # 워커 작업 단위 (지점 수): 분배 오버헤드와 부하 균형 절충
+
+_template = None  # 워커 프로세스별 ReportTemplate
+
+
+def _init_worker():
+    """프로세스당 1회: 폰트 등록 + 조회표 + 리포트 figure 생성"""
+    global _template
+    if _template is None:
+        from modules.report import ReportTemplate
+        _template = ReportTemplate()
+
+
+class ReportNames:
+    """
+    지점 id → 파일 이름 (경로 구분자 등은 _로 치환). 치환 후 같아진 id("a/b"와 "a_b")나
+    중복 id는 -2, -3 … 접미사를 붙여 앞 리포트를 덮어쓰지 않음 (부모 프로세스에서 이름 배정).
+    """
+
+    def __init__(self):
+        self._used = set()
+        self.renamed = 0
+
+    def __call__(self, site_id):
+        base = re.sub(r'[^0-9A-Za-z가-힣._-]', '_', str(site_id))
+        name, n = base, 1
+        while name in self._used:
+            n += 1
+            name = f"{base}-{n}"
+        self._used.add(name)
+        self.renamed += n > 1
+        return name
+
+
+def report_path(output_dir, name, fmt):
+    return os.path.join(output_dir, f"{name}.{fmt}")
+
+
+def render_batch(sites, output_dir, fmt):
+    """워커 작업 단위: 지점 묶음 리포트를 기록하고 기록 수 반환"""
+    from modules.report import release_font_cache
+
+    _init_worker()
+    for site_id, name, lat, lon, elevation, rainfall, code, flood_depth in sites:
+        data = _template.render(site_id, lat, lon, elevation, rainfall, code=code, fmt=fmt, flood_depth=flood_depth)
+        path = report_path(output_dir, name, fmt)
+        with open(f"{path}.tmp", 'wb') as f:
+            f.write(data)
+        os.replace(f"{path}.tmp", path)
+    release_font_cache()  # 워커 메모리가 리포트 수에 비례해 늘지 않도록 묶음마다
+    return len(sites)
+
+
+def iter_batches(input_path, chunk_size, resolve_rainfall, batch_size, names, counts):
+    """
+    입력 → (id, 파일 이름, lat, lon, elevation, rainfall, 지역 코드, 침수심) 지점 묶음 (강수량은 관측 단위 0.1mm).
+    침수심은 score_portfolio와 같은 조회 (침수심 래스터, 없으면 지역 base_depth)라 CSV 결과와 일치.
+    위경도가 유효하지 않거나 범위 밖이라 뺀 행 수는 counts['skipped']에 누적.
+    """
+    index = get_district_index()
+    for chunk in read_chunks(input_path, chunk_size):
+        chunk, rainfall, skipped = _prepare(chunk, resolve_rainfall)
+        counts['skipped'] += skipped
+        lat, lon = chunk['lat'].to_numpy(), chunk['lon'].to_numpy()
+        codes = chunk['code'].to_numpy()
+        flood_depth = site_flood_depth(lat, lon, index.take(codes)['base_depth'].to_numpy())
+        ids = chunk['id'].tolist()
+        sites = list(zip(ids, [names(site_id) for site_id in ids], lat.tolist(), lon.tolist(),
+                         chunk['elevation'].astype(np.float64).round(1).tolist(),
+                         rainfall.astype(np.float64).round(1).tolist(), codes.tolist(),
+                         np.asarray(flood_depth, dtype=np.float64).tolist()))
+        for start in range(0, len(sites), batch_size):
+            yield sites[start:start + batch_size]
+
+
+def run(input_path, output_dir, fmt='pdf', workers=1, batch_size=BATCH_SIZE, chunk_size=10000, api_key='',
+        default_rainfall=100.0, fetch_workers=16):
+    """리포트 일괄 생성. (리포트 수, 경과 초, 접미사를 붙인 파일 이름 수, 좌표가 유효하지 않거나 범위 밖이라 제외한 지점 수) 반환"""
+    if fmt not in FORMATS:
+        raise ValueError(f"지원하지 않는 형식: {fmt}")
+    os.makedirs(output_dir, exist_ok=True)
+    resolve_rainfall = RainfallResolver(api_key, default_rainfall, fetch_workers)
+    names = ReportNames()
+    counts = {'skipped': 0}
+    batches = iter_batches(input_path, chunk_size, resolve_rainfall, batch_size, names, counts)
+    reports = 0
+    start = time.perf_counter()
+    if workers <= 1:
+        for sites in batches:
+            reports += render_batch(sites, output_dir, fmt)
+    else:
+        # 처리 중 묶음 수를 제한해 입력 크기와 무관하게 부모 메모리 상한 유지
+        pending = []
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+            for sites in batches:
+                pending.append(executor.submit(render_batch, sites, output_dir, fmt))
+                if len(pending) >= workers * 2:
+                    reports += pending.pop(0).result()
+            for future in pending:
+                reports += future.result()
+    return reports, time.perf_counter() - start, names.renamed, counts['skipped']
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="지점별 침수 위험 진단 리포트 일괄 생성")
+    parser.add_argument('input', help="입력 CSV/Parquet (id, lat, lon, 선택 elevation)")
+    parser.add_argument('output_dir', help="리포트 저장 디렉터리 ({id}.pdf 또는 {id}.png)")
+    parser.add_argument('--format', choices=FORMATS, default='pdf', help="리포트 형식")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="렌더링 프로세스 수")
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help="워커 작업 단위 지점 수")
+    parser.add_argument('--api-key', default=os.environ.get('KMA_API_KEY', ''), help="기상청 API 키 (없으면 --rainfall 사용)")
+    parser.add_argument('--rainfall', type=float, default=100.0, help="관측 실패/미사용 시 강수량 (mm)")
+    parser.add_argument('--fetch-workers', type=int, default=16, help="기상청 동시 요청 수")
+    args = parser.parse_args(argv)
+
+    reports, elapsed, renamed, skipped = run(args.input, args.output_dir, args.format, args.workers, args.batch_size,
+                           api_key=args.api_key, default_rainfall=args.rainfall, fetch_workers=args.fetch_workers)
+    print(f"리포트 {reports}건, {elapsed:.2f}초 ({reports / max(elapsed, 1e-9):.1f} reports/sec), "
+          f"최대 메모리 {peak_memory_mb():.1f}MB")
+    if renamed:
+        print(f"파일 이름이 겹친 지점 {renamed}건은 -2, -3 … 접미사를 붙여 저장")
+    if skipped:
+        print(f"위경도가 비었거나 유효하지 않은 지점, 가장 가까운 지역이 {MAX_DISTRICT_KM}km 밖인 지점 {skipped}건은 제외")
+
+
+if __name__ == '__main__':
+    main()
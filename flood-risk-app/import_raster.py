@@ -0,0 +1,56 @@
+"""
+수치표고(DEM)·침수심 래스터를 앱/배치 CLI가 쓰는 타일 디렉터리로 변환 (CLI).
+
+GeoTIFF(EPSG:4326, rasterio 필요)는 타일 크기 창 단위로, .npy는 메모리 맵으로 읽어
+원본 전체를 메모리에 올리지 않음. 결과: data/rasters/{dem,flood_depth}/meta.json + 타일 .npy
+
+    python import_raster.py dem.tif --layer dem
+    python import_raster.py depth.npy --layer flood_depth --west 124.5 --north 39 --pixel 0.001 --nodata -9999
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+from modules.raster import LAYERS, RASTER_DIR, TILE_SIZE, RasterLayer, import_geotiff, write_tiles
+
+
+def run(src, layer, west=None, north=None, pixel=None, nodata=None, tile_size=TILE_SIZE, raster_dir=RASTER_DIR):
+    """변환 후 RasterLayer 반환. .npy는 west/north/pixel(도) 필요"""
+    path = os.path.join(raster_dir, layer)
+    if os.path.splitext(src)[1].lower() == '.npy':
+        if west is None or north is None or pixel is None:
+            raise ValueError(".npy 입력에는 --west, --north, --pixel이 필요합니다")
+        write_tiles(np.load(src, mmap_mode='r'), path, west, north, pixel, pixel, nodata, tile_size)
+    else:
+        import_geotiff(src, path, tile_size)
+    return RasterLayer(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="DEM/침수심 래스터 → 타일 디렉터리 변환")
+    parser.add_argument('input', help="GeoTIFF(EPSG:4326) 또는 2차원 .npy (북쪽이 0행)")
+    parser.add_argument('--layer', choices=LAYERS, required=True, help="dem(고도 m) 또는 flood_depth(침수심 m)")
+    parser.add_argument('--west', type=float, help=".npy 서쪽 경계 경도")
+    parser.add_argument('--north', type=float, help=".npy 북쪽 경계 위도")
+    parser.add_argument('--pixel', type=float, help=".npy 픽셀 크기 (도)")
+    parser.add_argument('--nodata', type=float, help=".npy 값 없음 표시")
+    parser.add_argument('--tile-size', type=int, default=TILE_SIZE, help="타일 한 변 픽셀 수")
+    parser.add_argument('--raster-dir', default=RASTER_DIR, help="출력 상위 디렉터리")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    try:
+        layer = run(args.input, args.layer, args.west, args.north, args.pixel, args.nodata, args.tile_size,
+                    args.raster_dir)
+    except (ImportError, ValueError) as e:
+        sys.exit(str(e))
+    tiles = sum(name.endswith('.npy') for name in os.listdir(layer.path))
+    print(f"{layer.path}: {layer.rows}×{layer.cols} 픽셀, 타일 {tiles}개, 범위 {layer.bounds}, "
+          f"{time.perf_counter() - start:.1f}초")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,186 @@
+"""
+구독 지점 침수 위험 알림 엔진.
+
+구독은 격자 코드 순으로 정렬된 열 배열에 보관 (격자별 구독이 연속 구간).
+관측 갱신마다 강수량이 바뀐 격자의 구간만 모아 한 번에 벡터 계산하고,
+히스테리시스로 상태가 바뀐 구독만 알림 싱크로 전달.
+"""
+import json
+import os
+import threading
+from collections import namedtuple
+from datetime import datetime
+
+import numpy as np
+
+from modules.utils import RISK_THRESHOLD, calculate_risk_array
+
+ALERT_MARGIN = 4.0  # 발령 후 (임계값 - 이 값) 미만으로 내려가야 해제 (경계 부근 반복 발령 방지)
+ALERT_LOG = os.environ.get(
+    'FLOOD_RISK_ALERT_LOG',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'alerts', 'alerts.jsonl'))
+
+# kind: 'raise'(고위험 진입) / 'clear'(해제)
+Alert = namedtuple('Alert', ['subscription_id', 'nx', 'ny', 'kind', 'risk_score', 'rainfall', 'base_time'])
+
+
+class JsonlAlertSink:
+    """알림을 JSON Lines 파일에 추가 기록하는 싱크"""
+
+    def __init__(self, path=ALERT_LOG):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def __call__(self, alerts):
+        lines = ''.join(json.dumps(alert._asdict(), ensure_ascii=False, default=str) + '\n' for alert in alerts)
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(lines)
+
+
+class QueueAlertSink:
+    """알림을 queue.Queue 등에 1건씩 넣는 싱크 (발송 워커가 소비)"""
+
+    def __init__(self, queue):
+        self.queue = queue
+
+    def __call__(self, alerts):
+        for alert in alerts:
+            self.queue.put(alert)
+
+
+class AlertEngine:
+    """
+    격자별 구독 색인 + 전이 시에만 알림.
+    sink는 callable(alerts 목록). 구독 추가/삭제는 다음 evaluate 때 색인에 반영.
+    """
+
+    def __init__(self, sink=None, threshold=RISK_THRESHOLD, margin=ALERT_MARGIN):
+        self.sink = sink
+        self.threshold = threshold
+        self.margin = margin
+        self._subscriptions = {}  # id -> (nx, ny, elevation, flood_depth)
+        self._stale = False  # 구독 변경 후 색인 재구성 필요
+        self._pending_cells = set()  # 새 구독이 생긴 격자 (강수량 변화 없어도 다음 평가에 포함)
+        self._cell_codes = {}  # (nx, ny) -> 격자 코드
+        self._code_cells = []  # 격자 코드 -> (nx, ny)
+        self._cell_rain = np.empty(0)  # 격자 코드별 마지막 강수량 (미관측 NaN)
+        self._index_subscriptions(())
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._subscriptions)
+
+    def subscribe(self, subscription_id, nx, ny, elevation, flood_depth):
+        """지점 구독 추가/수정 (같은 id면 교체, 알림 상태는 유지)"""
+        with self._lock:
+            self._subscriptions[subscription_id] = (int(nx), int(ny), float(elevation), float(flood_depth))
+            self._pending_cells.add((int(nx), int(ny)))
+            self._stale = True
+
+    def subscribe_many(self, subscription_ids, nx, ny, elevation, flood_depth):
+        """열 단위 일괄 구독 (배열/리스트, 길이 동일)"""
+        rows = zip(np.asarray(nx).tolist(), np.asarray(ny).tolist(),
+                   np.asarray(elevation, dtype=np.float64).tolist(), np.asarray(flood_depth, dtype=np.float64).tolist())
+        with self._lock:
+            for subscription_id, row in zip(subscription_ids, rows):
+                self._subscriptions[subscription_id] = row
+                self._pending_cells.add(row[:2])
+            self._stale = True
+
+    def unsubscribe(self, subscription_id):
+        with self._lock:
+            if self._subscriptions.pop(subscription_id, None) is not None:
+                self._stale = True
+
+    def is_active(self, subscription_id):
+        """현재 발령 중인 구독이면 True"""
+        return subscription_id in self._active_ids()
+
+    def _active_ids(self):
+        return set(self._ids[self._state].tolist())
+
+    def _cell_code(self, cell):
+        code = self._cell_codes.get(cell)
+        if code is None:
+            code = self._cell_codes[cell] = len(self._code_cells)
+            self._code_cells.append(cell)
+        return code
+
+    def _index_subscriptions(self, active):
+        """구독 dict → 격자 코드 순 열 배열 + 격자별 [시작, 끝) 오프셋 (active id는 발령 상태 유지)"""
+        ids = list(self._subscriptions)
+        rows = list(self._subscriptions.values())
+        cells = np.fromiter((self._cell_code(row[:2]) for row in rows), dtype=np.int64, count=len(rows))
+        order = np.argsort(cells, kind='stable')
+        columns = np.array([row[2:] for row in rows], dtype=np.float32).reshape(-1, 2)[order]
+
+        self._ids = np.empty(len(ids), dtype=object)
+        self._ids[:] = ids
+        self._ids = self._ids[order]
+        self._cells = cells[order]
+        self._elevation = columns[:, 0].copy()
+        self._flood_depth = columns[:, 1].copy()
+        self._state = np.fromiter((i in active for i in self._ids), dtype=bool, count=len(ids))
+        self._offsets = np.searchsorted(self._cells, np.arange(len(self._cell_codes) + 1))
+        if len(self._cell_rain) < len(self._cell_codes):
+            grown = np.full(len(self._cell_codes), np.nan)
+            grown[:len(self._cell_rain)] = self._cell_rain
+            self._cell_rain = grown
+        self._stale = False
+
+    def _rows_of(self, codes):
+        """격자 코드들의 구독 행 번호 (연속 구간 이어 붙이기)"""
+        starts, ends = self._offsets[codes], self._offsets[codes + 1]
+        lengths = ends - starts
+        if not lengths.sum():
+            return np.empty(0, dtype=np.int64)
+        shift = np.repeat(starts - np.concatenate(([0], np.cumsum(lengths)[:-1])), lengths)
+        return np.arange(lengths.sum()) + shift
+
+    def evaluate(self, rainfall, base_time=None):
+        """
+        {(nx, ny): 강수량}으로 재평가. 강수량이 바뀐 격자(+새 구독 격자)의 구독만 계산하고
+        상태가 바뀐 구독의 Alert 목록을 싱크로 보낸 뒤 반환.
+        """
+        with self._lock:
+            if self._stale:
+                self._index_subscriptions(self._active_ids())
+            cells = [cell for cell in rainfall if cell in self._cell_codes]
+            codes = np.array([self._cell_codes[cell] for cell in cells], dtype=np.int64)
+            values = np.array([rainfall[cell] for cell in cells], dtype=np.float64)
+            changed = codes[values != self._cell_rain[codes]]  # 이전 NaN이면 항상 변경
+            self._cell_rain[codes] = values
+            # 새 구독 격자는 강수량을 한 번이라도 받았으면 평가, 아니면 다음 갱신까지 대기
+            pending = [self._cell_codes[cell] for cell in self._pending_cells
+                       if not np.isnan(self._cell_rain[self._cell_codes[cell]])]
+            self._pending_cells.difference_update(self._code_cells[code] for code in pending)
+
+            rows = self._rows_of(np.union1d(changed, pending).astype(np.int64))
+            if not len(rows):
+                return []
+            risk_score, _ = calculate_risk_array(self._cell_rain[self._cells[rows]], self._elevation[rows],
+                                                 self._flood_depth[rows], dtype=np.float32)
+            previous = self._state[rows]
+            # 미발령은 임계값 초과 시 발령, 발령 중은 (임계값 - margin) 이상이면 유지
+            state = np.where(previous, risk_score >= self.threshold - self.margin, risk_score > self.threshold)
+            flipped = np.flatnonzero(state != previous)
+            self._state[rows[flipped]] = state[flipped]
+
+            base_time = base_time or datetime.now().strftime('%Y%m%d%H%M')
+            flipped_rows = rows[flipped]
+            codes = self._cells[flipped_rows]
+            alerts = [Alert(subscription_id, *self._code_cells[code], 'raise' if raised else 'clear', score, rain,
+                            base_time)
+                      for subscription_id, code, raised, score, rain in zip(
+                          self._ids[flipped_rows].tolist(), codes.tolist(), state[flipped].tolist(),
+                          risk_score[flipped].astype(np.float64).round(2).tolist(), self._cell_rain[codes].tolist())]
+        if alerts and self.sink is not None:
+            self.sink(alerts)
+        return alerts
+
+    def on_snapshot(self, snapshot):
+        """ObservationRefresher 구독자용: 스냅샷 강수량으로 evaluate"""
+        rainfall = {cell: obs['rainfall'] for cell, obs in snapshot.observations.items()}
+        return self.evaluate(rainfall, snapshot.base_time)
@@ -1,6 +1,324 @@
+import json
+import os
+import random
+import threading
+import time
+
+import numpy as np
 import requests
 import xml.etree.ElementTree as ET
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime, timedelta
+from requests.adapters import HTTPAdapter
+
+from modules.cache import TTLCache
+from modules.data import korean_cities
+from modules.grid import latlon_to_grid
+from modules.resilience import CircuitBreaker, RetryBudget
+from modules.shared_cache import FillError, get_shared_cache
+
+# 로컬 스텁 서버 테스트 시 환경 변수로 교체
+NCST_URL = os.environ.get('KMA_NCST_URL', "http://apis.data.go.kr/1360000/VilageFcstInfoService_2.0/getUltraSrtNcst")
+RELEASE_DELAY_MINUTES = 40  # 초단기실황: 매시 정각 관측, 약 40분 후 API 제공
+FALLBACK_TTL = timedelta(minutes=5)  # 이전 발표분으로 대체한 경우 짧게 캐시
+MISSING_VALUES = ['-999', '-998', '-998.9']
+POOL_SIZE = 32  # keep-alive 연결 풀 크기 (bulk 동시성 상한)
+REQUEST_TIMEOUT = (3.05, 5)  # (연결, 읽기) 초
+MAX_RETRIES = 2
+RETRY_BACKOFF = 0.2  # 초, 재시도마다 2배 (±50% 지터)
+HEDGE_WINDOW_MINUTES = 15  # 제공 시각 직후 이 시간 동안은 이전 발표분을 동시에 요청
+HEDGE_DELAY = 0.5  # 그 외에는 최신 발표분 응답이 이만큼 늦을 때 이전 발표분 요청 (초)
+HEDGE_GRACE = 0.3  # 이전 발표분이 먼저 오면 최신 발표분을 이만큼만 더 기다림 (초)
+SHARED_FAILURE_TTL = 5.0  # 초, 공용 캐시 채우기 실패를 다른 프로세스와 공유하는 시간
+
+_obs_cache = TTLCache(maxsize=4096)
+_breaker = CircuitBreaker(failure_threshold=5, reset_timeout=30.0)
+_retry_budget = RetryBudget(ratio=0.1)
+_hedge_executor = ThreadPoolExecutor(max_workers=POOL_SIZE * 2, thread_name_prefix='kma-hedge')
+_last_known = {}  # (nx, ny) -> 마지막 정상 관측 (장애 시 대체값)
+_counters = {'hedged': 0, 'hedge_wins': 0, 'retries': 0, 'stale_served': 0}
+_counter_lock = threading.Lock()
+
+
+def _count(name):
+    with _counter_lock:
+        _counters[name] += 1
+
+
+def _create_session(pool_size=POOL_SIZE):
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+_session = _create_session()
+
+
+class WeatherAPIError(Exception):
+    """
+    기상청 API 오류 (result_code: 응답 코드 또는 HTTP 상태).
+    transient: 네트워크/5xx/차단 등 일시 장애 여부 (재시도 및 마지막 관측값 대체 대상)
+    """
+
+    def __init__(self, message, result_code=None, transient=False):
+        super().__init__(message)
+        self.result_code = result_code
+        self.transient = transient
+
+
+class CircuitOpenError(WeatherAPIError):
+    """상류 장애로 호출 차단 중"""
+
+    def __init__(self):
+        super().__init__("기상청 API 장애 감지 – 호출 일시 차단", 'CIRCUIT_OPEN', transient=True)
+
+
+class QuotaExceededError(WeatherAPIError):
+    """호출 한도(토큰 버킷) 소진으로 요청을 보내지 않음"""
+
+    def __init__(self):
+        super().__init__("기상청 API 호출 한도 소진", 'QUOTA', transient=True)
+
+
+def get_base_datetime(now=None):
+    """현재 시각 기준 조회 가능한 최신 초단기실황 발표 시각"""
+    now = now or datetime.now()
+    base = now.replace(minute=0, second=0, microsecond=0)
+    if now.minute < RELEASE_DELAY_MINUTES:
+        base -= timedelta(hours=1)
+    return base
+
+
+def next_release(base):
+    """base 다음 발표분이 제공되는 시각 (캐시 만료 시각)"""
+    return base + timedelta(hours=1, minutes=RELEASE_DELAY_MINUTES)
+
+
+def parse_observation(content):
+    """
+    getUltraSrtNcst XML 응답 파싱.
+    성공 시 (pty, rainfall) 반환, 실패 시 WeatherAPIError (XML이 아닌 본문은 일시 장애로 취급).
+    """
+    try:
+        root = ET.fromstring(content)
+    except ET.ParseError:
+        raise WeatherAPIError("기상청 응답 파싱 실패 (XML 아님)", 'PARSE', transient=True)
+    result_code = root.find('.//resultCode')
+    code = result_code.text if result_code is not None else None
+    if code != '00':
+        raise WeatherAPIError(f"기상청 응답 오류 (코드: {code})", code)
+
+    pty, rn1 = '0', '0'
+    for item in root.findall('.//item'):
+        category = item.find('category')
+        obsr_value = item.find('obsrValue')
+        if category is not None and obsr_value is not None:
+            value = obsr_value.text or '0'
+            if category.text == 'PTY':
+                pty = '0' if value in MISSING_VALUES else value
+            elif category.text == 'RN1':
+                rn1 = '0' if value in MISSING_VALUES else value
+    try:
+        rainfall = float(rn1)
+    except ValueError:
+        rainfall = 0.0
+    if pty == '0':
+        rainfall = 0.0
+    return pty, rainfall
+
+
+def request_kma(url, params, session=None, timeout=REQUEST_TIMEOUT, stream=False):
+    """
+    기상청 API GET (공용 keep-alive 세션).
+    연결 실패/5xx는 transient WeatherAPIError. stream=True면 호출자가 response.close() 책임.
+    """
+    try:
+        response = (session or _session).get(url, params=params, timeout=timeout, stream=stream)
+    except requests.RequestException as e:
+        raise WeatherAPIError(f"기상청 연결 실패 ({type(e).__name__})", 'NETWORK', transient=True)
+    if response.status_code != 200:
+        response.close()
+        raise WeatherAPIError(f"기상청 HTTP 에러 ({response.status_code})", str(response.status_code),
+                              transient=response.status_code >= 500)
+    return response
+
+
+def _request_observation(api_key, nx, ny, base, session=None, timeout=REQUEST_TIMEOUT, budget=None):
+    """실제 요청 1회 (budget: consume()으로 요청마다 1개 차감하는 호출 한도, 부족하면 QuotaExceededError)"""
+    if budget is not None and not budget.consume():
+        raise QuotaExceededError()
+    params = {
+        'serviceKey': api_key, 'pageNo': '1', 'numOfRows': '10', 'dataType': 'XML',
+        'base_date': base.strftime('%Y%m%d'), 'base_time': base.strftime('%H%M'),
+        'nx': str(nx), 'ny': str(ny)
+    }
+    response = request_kma(NCST_URL, params, session, timeout)
+    pty, rainfall = parse_observation(response.content)
+    return {
+        'rainfall': rainfall,
+        'pty': pty,
+        'base_date': params['base_date'],
+        'base_time': params['base_time'],
+        'fallback': False,
+        'stale': False
+    }
+
+
+def _fetch_with_retry(api_key, nx, ny, base, session=None, budget=None):
+    """일시 장애만 지수 백오프로 재시도 (재시도 예산/회로 차단기 적용)"""
+    delay = RETRY_BACKOFF
+    for attempt in range(MAX_RETRIES + 1):
+        if not _breaker.allow():
+            raise CircuitOpenError()
+        _retry_budget.record_request()
+        outcome = _breaker.record_failure
+        try:
+            obs = _request_observation(api_key, nx, ny, base, session, budget=budget)
+            outcome = _breaker.record_success
+            return obs
+        except QuotaExceededError:
+            outcome = _breaker.release  # 요청을 보내지 않음
+            raise
+        except WeatherAPIError as e:
+            if not e.transient:
+                outcome = _breaker.record_success  # 응답 자체는 정상 (03 등)
+                raise
+            if attempt == MAX_RETRIES or not _retry_budget.try_retry():
+                raise
+        finally:
+            outcome()  # 예상 밖 예외도 실패로 기록 (half-open 시험 호출이 끝나지 않은 채 남지 않도록)
+        _count('retries')
+        time.sleep(delay * random.uniform(0.5, 1.5))
+        delay *= 2
+
+
+def _in_hedge_window(now=None):
+    now = now or datetime.now()
+    return 0 <= now.minute - RELEASE_DELAY_MINUTES < HEDGE_WINDOW_MINUTES
+
+
+def _load_observation(api_key, nx, ny, base, session=None, now=None, hedge=True, budget=None):
+    """
+    최신 발표분과 이전 발표분을 hedged 요청으로 조회해 유효한 것 중 가장 최신 값 반환.
+    제공 직후(발표 전 코드 03 가능성 높음)에는 동시에, 그 외에는 최신 발표분이 HEDGE_DELAY 이상 늦을 때만 이전 발표분 요청.
+    hedge=False면 최신 발표분만 요청 (호출 한도를 아껴야 하는 백그라운드 갱신용).
+    """
+    if not hedge:
+        return _fetch_with_retry(api_key, nx, ny, base, session, budget), next_release(base)
+
+    primary = _hedge_executor.submit(_fetch_with_retry, api_key, nx, ny, base, session, budget)
+    hedge = None
+
+    def launch_hedge():
+        _count('hedged')
+        return _hedge_executor.submit(_fetch_with_retry, api_key, nx, ny, base - timedelta(hours=1), session,
+                                     budget)
+
+    if _in_hedge_window(now):
+        hedge = launch_hedge()
+    else:
+        wait([primary], timeout=HEDGE_DELAY)
+        if primary.done() and primary.exception() is None:
+            return primary.result(), next_release(base)
+        hedge = launch_hedge()
+
+    # 이전 발표분이 먼저 정상 응답하면 최신 발표분은 HEDGE_GRACE만 더 기다리고, 실패했으면 끝까지 기다림
+    wait([primary, hedge], return_when=FIRST_COMPLETED)
+    if not primary.done():
+        wait([primary], timeout=HEDGE_GRACE if hedge.exception() is None else None)
+    if primary.done() and primary.exception() is None:
+        return primary.result(), next_release(base)
+
+    try:
+        obs = hedge.result()
+    except WeatherAPIError:
+        raise primary.exception()
+    _count('hedge_wins')
+    obs['fallback'] = True
+    return obs, datetime.now() + FALLBACK_TTL
+
+
+def _cache_key(nx, ny, base):
+    return (nx, ny, base.strftime('%Y%m%d'), base.strftime('%H%M'))
+
+
+def _shared_key(nx, ny, base):
+    return f"obs:{nx}:{ny}:{base.strftime('%Y%m%d%H%M')}"
+
+
+def _shared_failure_ttl(error):
+    """
+    공용 캐시에 실패를 공유할 시간: 일시 장애만 (다른 프로세스도 transient로 받아 마지막 관측값 대체).
+    이 프로세스의 호출 예산 소진은 다른 프로세스와 무관하므로 공유 안 함.
+    """
+    if isinstance(error, QuotaExceededError) or not getattr(error, 'transient', False):
+        return None
+    return SHARED_FAILURE_TTL
+
+
+def _load_shared(api_key, nx, ny, base, session=None, now=None, hedge=True, budget=None):
+    """
+    호스트 공용 캐시 경유 로드: 다른 프로세스가 이미 받은 발표분이면 그대로 쓰고,
+    아니면 호스트 전체에서 1개 프로세스만 기상청 호출 (나머지는 그 결과를 대기).
+    """
+    shared = get_shared_cache()
+    if shared is None:
+        return _load_observation(api_key, nx, ny, base, session, now, hedge, budget)
+
+    def load():
+        obs, expires_at = _load_observation(api_key, nx, ny, base, session, now, hedge, budget)
+        return json.dumps(obs).encode('utf-8'), expires_at
+
+    try:
+        data, expires = shared.get_or_fill(_shared_key(nx, ny, base), load, now, failure_ttl=_shared_failure_ttl)
+    except FillError as e:  # 다른 프로세스가 방금 실패: 같은 장애에 프로세스마다 다시 호출하지 않음
+        raise WeatherAPIError(f"{e} (다른 프로세스 조회 실패 공유)", 'SHARED_FAILURE', transient=True)
+    return json.loads(data), datetime.fromtimestamp(expires)
+
+
+def peek_observation(nx, ny, now=None, shared=True):
+    """
+    캐시에 있는 관측값만 반환 (프로세스 캐시 → 호스트 공용 캐시, 네트워크 호출 없음, 없으면 None).
+    shared=False면 프로세스 캐시만 (SQLite 조회 없음, 이벤트 루프에서 바로 호출 가능).
+    """
+    base = get_base_datetime(now)
+    key = _cache_key(nx, ny, base)
+    obs = _obs_cache.get(key, now)
+    if obs is None:
+        if not shared:
+            return None
+        shared = get_shared_cache()
+        entry = shared.get(_shared_key(nx, ny, base), now) if shared is not None else None
+        if entry is None:
+            return None
+        obs = json.loads(entry[0])
+        _obs_cache.set(key, obs, datetime.fromtimestamp(entry[1]))
+    return dict(obs)
+
+
+def get_observation(api_key, nx, ny, now=None, session=None, hedge=True, budget=None):
+    """
+    격자 (nx, ny)의 최신 초단기실황 (강수량/강수형태) 조회.
+    (nx, ny, base_date, base_time) 단위로 다음 발표 시각까지 프로세스 캐시 + 호스트 공용 캐시.
+    hedge=False면 이전 발표분 hedged 요청 없음 (캐시 미스 시 격자당 요청 1회).
+    budget을 주면 실제로 보낸 요청(재시도·hedge 포함)만 차감 (캐시 적중은 무료).
+    """
+    base = get_base_datetime(now)
+    try:
+        obs = _obs_cache.get_or_load(_cache_key(nx, ny, base),
+                                     lambda: _load_shared(api_key, nx, ny, base, session, now, hedge, budget))
+    except WeatherAPIError as e:
+        # 상류 장애 시 마지막 정상 관측값으로 대체 (stale=True)
+        last = _last_known.get((nx, ny))
+        if not e.transient or last is None:
+            raise
+        _count('stale_served')
+        return dict(last, stale=True)
+    _last_known[(nx, ny)] = obs
+    return dict(obs)
+
 
 def get_weather_data(api_key, nx, ny, default_rainfall):
     """
@@ -8,35 +326,68 @@ def get_weather_data(api_key, nx, ny, default_rainfall):
     실패 시 기본 슬라이더 값을 반환.
     """
     try:
-        today = datetime.now().strftime('%Y%m%d')
-        now_hour = datetime.now().hour
-        candidate_time = ((now_hour // 3) * 3)
-        base_time = f"{candidate_time:02d}00" if candidate_time >= 2 else "0200"
-        url = "http://apis.data.go.kr/1360000/VilageFcstInfoService_2.0/getUltraSrtNcst"
-        params = {
-            'serviceKey': api_key, 'pageNo': '1', 'numOfRows': '10', 'dataType': 'XML',
-            'base_date': today, 'base_time': base_time, 'nx': str(nx), 'ny': str(ny)
-        }
-        response = requests.get(url, params=params)
-        if response.status_code == 200:
-            root = ET.fromstring(response.content)
-            result_code = root.find('.//resultCode')
-            if result_code is not None and result_code.text == '00':
-                pty, rn1 = '0', '0'
-                for item in root.findall('.//item'):
-                    category = item.find('category')
-                    obsr_value = item.find('obsrValue')
-                    if category is not None and obsr_value is not None:
-                        if category.text == 'PTY':
-                            pty_raw = obsr_value.text
-                            pty = '0' if pty_raw in ['-999', '-998'] else pty_raw
-                        elif category.text == 'RN1':
-                            rn1_raw = obsr_value.text
-                            rn1 = '0' if rn1_raw in ['-999', '-998', '-998.9'] else rn1_raw
-                rainfall = float(rn1) if rn1 and rn1 != 'None' else 0.0
-                if int(pty) == 0:
-                    rainfall = 0.0
-                return rainfall
+        return get_observation(api_key, nx, ny)['rainfall']
+    except Exception:
         return default_rainfall
-    except Exception as e:
-        return default_rainfall
\ No newline at end of file
+
+
+def get_grid_cells(cities=None):
+    """시/도·구 목록을 중복 없는 격자 단위로 묶음: {(nx, ny): [(sido, gu), ...]}"""
+    cells = {}
+    for sido, gus in (cities or korean_cities).items():
+        for gu, (_, _, nx, ny, _) in gus.items():
+            cells.setdefault((nx, ny), []).append((sido, gu))
+    return cells
+
+
+def fetch_cells(api_key, cells, max_workers=16, now=None):
+    """격자 목록 동시 조회 (공용 캐시 경유). 반환: {(nx, ny): 관측 dict 또는 실패 시 None}"""
+    cells = list(dict.fromkeys(cells))
+    max_workers = max(1, min(max_workers, POOL_SIZE, len(cells) or 1))
+
+    def fetch(cell):
+        try:
+            return get_observation(api_key, cell[0], cell[1], now=now)
+        except Exception:
+            return None
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return dict(zip(cells, executor.map(fetch, cells)))
+
+
+def get_observations_bulk(api_key, cities=None, max_workers=16, now=None):
+    """
+    전국(또는 cities) 관측값 일괄 조회.
+    중복 격자는 한 번만 호출하고, keep-alive 연결 풀 위에서 최대 max_workers개 동시 요청.
+    반환: {(sido, gu): 관측 dict 또는 실패 시 None}
+    """
+    cells = get_grid_cells(cities)
+    results = fetch_cells(api_key, cells, max_workers, now)
+
+    observations = {}
+    for cell, districts in cells.items():
+        for district in districts:
+            obs = results[cell]
+            observations[district] = dict(obs) if obs is not None else None
+    return observations
+
+
+def get_observations_at(api_key, lat, lon, max_workers=16, now=None):
+    """임의 좌표 배열의 관측값 (격자 변환 후 중복 격자는 1회 조회). 입력 순서대로 list 반환"""
+    nx, ny = latlon_to_grid(lat, lon)
+    cells = list(zip(np.atleast_1d(nx).tolist(), np.atleast_1d(ny).tolist()))
+    results = fetch_cells(api_key, cells, max_workers, now)
+    return [results[cell] for cell in cells]
+
+
+def get_cache_stats():
+    """관측 캐시 hit/miss/coalesced 카운터 + hedge/재시도/차단기 상태"""
+    stats = _obs_cache.stats()
+    with _counter_lock:
+        stats.update(_counters)
+    stats['circuit'] = _breaker.state
+    stats['retry_tokens'] = round(_retry_budget.tokens, 2)
+    shared = get_shared_cache()
+    if shared is not None:
+        stats['shared'] = shared.stats()
+    return stats
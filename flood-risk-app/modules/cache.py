@@ -0,0 +1,109 @@
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+
+class _InFlight:
+    """진행 중인 로드 1건 (같은 키의 동시 요청이 결과를 공유)"""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class TTLCache:
+    """
+    프로세스 공용 만료 시각 기반 캐시.
+    같은 키에 대한 동시 미스는 single-flight로 묶어 로더를 한 번만 호출함.
+    """
+
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self._data = OrderedDict()  # key -> (value, expires_at)
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'coalesced': 0, 'errors': 0, 'evictions': 0}
+
+    def get(self, key, now=None):
+        """만료되지 않은 값이 있으면 반환, 없으면 None"""
+        now = now or datetime.now()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= now:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            self._stats['hits'] += 1
+            return value
+
+    def set(self, key, value, expires_at):
+        with self._lock:
+            self._store(key, value, expires_at)
+
+    def get_or_load(self, key, loader, now=None):
+        """
+        캐시 조회 후 없으면 loader() 호출.
+        loader는 (value, expires_at)을 반환해야 하며, 예외는 캐시하지 않고 대기자 모두에게 전달함.
+        """
+        now = now or datetime.now()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[1] > now:
+                self._data.move_to_end(key)
+                self._stats['hits'] += 1
+                return entry[0]
+            call = self._inflight.get(key)
+            if call is not None:
+                self._stats['coalesced'] += 1
+                leader = False
+            else:
+                call = _InFlight()
+                self._inflight[key] = call
+                self._stats['misses'] += 1
+                leader = True
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            value, expires_at = loader()
+            call.value = value
+            with self._lock:
+                self._store(key, value, expires_at)
+            return value
+        except Exception as e:
+            call.error = e
+            with self._lock:
+                self._stats['errors'] += 1
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            call.event.set()
+
+    def _store(self, key, value, expires_at):
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self._stats['evictions'] += 1
+
+    def stats(self):
+        """hit/miss/coalesced 카운터와 현재 크기 반환"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['size'] = len(self._data)
+        return stats
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            for key in self._stats:
+                self._stats[key] = 0
@@ -3,276 +3,276 @@ korean_cities = {
     '서울특별시': {
         '강남구': (37.5172, 127.0474, 61, 126, 0.5),
         '강동구': (37.5301, 127.1237, 62, 126, 0.6),
-        '강북구': (37.6398, 127.0255, 61, 129, 0.4),
-        '강서구': (37.5509, 126.8495, 55, 127, 0.7),
+        '강북구': (37.6398, 127.0255, 61, 128, 0.4),
+        '강서구': (37.5509, 126.8495, 58, 126, 0.7),
         '관악구': (37.4784, 126.9515, 59, 125, 0.5),
-        '광진구': (37.5386, 127.0823, 62, 127, 0.6),
-        '구로구': (37.4955, 126.8874, 56, 125, 0.5),
-        '금천구': (37.4519, 126.9020, 57, 124, 0.4),
-        '노원구': (37.6542, 127.0568, 61, 130, 0.7),
-        '도봉구': (37.6688, 127.0471, 61, 131, 0.6),
+        '광진구': (37.5386, 127.0823, 62, 126, 0.6),
+        '구로구': (37.4955, 126.8874, 58, 125, 0.5),
+        '금천구': (37.4519, 126.9020, 59, 124, 0.4),
+        '노원구': (37.6542, 127.0568, 61, 129, 0.7),
+        '도봉구': (37.6688, 127.0471, 61, 129, 0.6),
         '동대문구': (37.5744, 127.0396, 61, 127, 0.5),
         '동작구': (37.5124, 126.9393, 59, 126, 0.5),
         '마포구': (37.5663, 126.9018, 58, 127, 0.6),
         '서대문구': (37.5791, 126.9368, 59, 127, 0.4),
         '서초구': (37.4836, 127.0324, 61, 125, 0.5),
         '성동구': (37.5633, 127.0368, 61, 127, 0.6),
-        '성북구': (37.5894, 127.0167, 61, 128, 0.5),
+        '성북구': (37.5894, 127.0167, 60, 127, 0.5),
         '송파구': (37.5145, 127.1059, 62, 126, 0.7),
-        '양천구': (37.5270, 126.8562, 56, 126, 0.4),
-        '영등포구': (37.5264, 126.8963, 57, 126, 0.5),
+        '양천구': (37.5270, 126.8562, 58, 126, 0.4),
+        '영등포구': (37.5264, 126.8963, 58, 126, 0.5),
         '용산구': (37.5326, 126.9900, 60, 126, 0.6),
-        '은평구': (37.6027, 126.9291, 58, 128, 0.5),
+        '은평구': (37.6027, 126.9291, 59, 127, 0.5),
         '종로구': (37.5730, 126.9794, 60, 127, 0.4),
         '중구': (37.5638, 126.9975, 60, 127, 0.5),
         '중랑구': (37.6066, 127.0926, 62, 128, 0.6)
     },
     '부산광역시': {
-        '강서구': (35.2122, 128.9806, 97, 43, 0.9),
-        '금정구': (35.2429, 129.0922, 101, 44, 1.0),
-        '기장군': (35.2445, 129.2224, 103, 43, 1.2),
-        '남구': (35.1366, 129.0845, 100, 41, 1.0),
-        '동구': (35.1292, 129.0453, 100, 41, 0.8),
-        '동래구': (35.1962, 129.0934, 101, 43, 0.8),
-        '부산진구': (35.1628, 129.0532, 100, 42, 0.9),
-        '북구': (35.1971, 128.9902, 98, 43, 1.1),
-        '사상구': (35.1525, 128.9914, 98, 41, 1.1),
-        '사하구': (35.1044, 128.9749, 97, 40, 1.0),
-        '서구': (35.0978, 129.0243, 99, 40, 0.9),
-        '수영구': (35.1455, 129.1132, 101, 41, 1.0),
-        '연제구': (35.1762, 129.0799, 100, 42, 0.9),
-        '영도구': (35.0911, 129.0672, 100, 40, 1.1),
-        '중구': (35.1065, 129.0324, 99, 40, 0.8),
-        '해운대구': (35.1631, 129.1636, 102, 42, 1.0)
+        '강서구': (35.2122, 128.9806, 96, 76, 0.9),
+        '금정구': (35.2429, 129.0922, 98, 77, 1.0),
+        '기장군': (35.2445, 129.2224, 100, 77, 1.2),
+        '남구': (35.1366, 129.0845, 98, 75, 1.0),
+        '동구': (35.1292, 129.0453, 97, 75, 0.8),
+        '동래구': (35.1962, 129.0934, 98, 76, 0.8),
+        '부산진구': (35.1628, 129.0532, 97, 75, 0.9),
+        '북구': (35.1971, 128.9902, 96, 76, 1.1),
+        '사상구': (35.1525, 128.9914, 96, 75, 1.1),
+        '사하구': (35.1044, 128.9749, 96, 74, 1.0),
+        '서구': (35.0978, 129.0243, 97, 74, 0.9),
+        '수영구': (35.1455, 129.1132, 99, 75, 1.0),
+        '연제구': (35.1762, 129.0799, 98, 76, 0.9),
+        '영도구': (35.0911, 129.0672, 98, 74, 1.1),
+        '중구': (35.1065, 129.0324, 97, 74, 0.8),
+        '해운대구': (35.1631, 129.1636, 99, 75, 1.0)
     },
     '대구광역시': {
-        '남구': (35.8462, 128.5975, 89, 89, 0.7),
-        '달서구': (35.8298, 128.5326, 88, 89, 0.9),
-        '달성군': (35.7747, 128.4314, 87, 88, 0.8),
-        '동구': (35.8860, 128.6355, 90, 90, 0.8),
+        '남구': (35.8462, 128.5975, 89, 90, 0.7),
+        '달서구': (35.8298, 128.5326, 88, 90, 0.9),
+        '달성군': (35.7747, 128.4314, 86, 88, 0.8),
+        '동구': (35.8860, 128.6355, 89, 91, 0.8),
         '북구': (35.8858, 128.5828, 89, 91, 0.9),
-        '서구': (35.8718, 128.5592, 88, 90, 0.7),
-        '수성구': (35.8584, 128.6306, 90, 90, 0.7),
+        '서구': (35.8718, 128.5592, 88, 91, 0.7),
+        '수성구': (35.8584, 128.6306, 89, 90, 0.7),
         '중구': (35.8695, 128.6061, 89, 90, 0.8)
     },
     '인천광역시': {
-        '강화군': (37.7461, 126.4879, 53, 129, 0.4),
-        '계양구': (37.5372, 126.7378, 55, 126, 0.3),
+        '강화군': (37.7461, 126.4879, 51, 131, 0.4),
+        '계양구': (37.5372, 126.7378, 56, 126, 0.3),
         '남동구': (37.4475, 126.7318, 56, 124, 0.3),
-        '동구': (37.4740, 126.6430, 56, 124, 0.4),
-        '미추홀구': (37.4637, 126.6502, 56, 124, 0.3),
+        '동구': (37.4740, 126.6430, 54, 125, 0.4),
+        '미추홀구': (37.4637, 126.6502, 54, 124, 0.3),
         '부평구': (37.5070, 126.7218, 55, 125, 0.4),
-        '서구': (37.5455, 126.6760, 54, 126, 0.3),
-        '연수구': (37.4094, 126.6784, 56, 123, 0.2),
-        '옹진군': (37.4467, 126.6368, 56, 124, 0.3),
-        '중구': (37.4737, 126.6215, 56, 124, 0.4)
+        '서구': (37.5455, 126.6760, 55, 126, 0.3),
+        '연수구': (37.4094, 126.6784, 55, 123, 0.2),
+        '옹진군': (37.4467, 126.6368, 54, 124, 0.3),
+        '중구': (37.4737, 126.6215, 54, 125, 0.4)
     },
     '광주광역시': {
         '광산구': (35.1521, 126.8076, 57, 74, 0.5),
-        '남구': (35.1329, 126.9024, 58, 73, 0.3),
-        '동구': (35.1460, 126.9230, 58, 74, 0.4),
+        '남구': (35.1329, 126.9024, 59, 74, 0.3),
+        '동구': (35.1460, 126.9230, 59, 74, 0.4),
         '북구': (35.1740, 126.9120, 59, 75, 0.4),
-        '서구': (35.1520, 126.8899, 58, 74, 0.5)
+        '서구': (35.1520, 126.8899, 59, 74, 0.5)
     },
     '대전광역시': {
-        '대덕구': (36.3466, 127.4156, 69, 100, 0.6),
-        '동구': (36.3116, 127.4380, 69, 99, 0.8),
-        '서구': (36.3554, 127.3837, 68, 100, 0.6),
+        '대덕구': (36.3466, 127.4156, 68, 100, 0.6),
+        '동구': (36.3116, 127.4380, 68, 100, 0.8),
+        '서구': (36.3554, 127.3837, 67, 101, 0.6),
         '유성구': (36.3622, 127.3563, 67, 101, 0.7),
-        '중구': (36.3252, 127.4215, 68, 99, 0.8)
+        '중구': (36.3252, 127.4215, 68, 100, 0.8)
     },
     '울산광역시': {
-        '남구': (35.5437, 129.3302, 91, 85, 0.8),
-        '동구': (35.5047, 129.4186, 92, 84, 0.9),
-        '북구': (35.5825, 129.3608, 91, 86, 0.9),
-        '울주군': (35.5452, 129.1429, 90, 85, 1.0),
-        '중구': (35.5692, 129.3325, 91, 86, 0.9)
+        '남구': (35.5437, 129.3302, 102, 84, 0.8),
+        '동구': (35.5047, 129.4186, 104, 83, 0.9),
+        '북구': (35.5825, 129.3608, 103, 85, 0.9),
+        '울주군': (35.5452, 129.1429, 99, 84, 1.0),
+        '중구': (35.5692, 129.3325, 102, 84, 0.9)
     },
     '세종특별자치시': {
-        '세종시': (36.4800, 127.2890, 67, 98, 0.5)  # 세종 전체
+        '세종시': (36.4800, 127.2890, 66, 103, 0.5)  # 세종 전체
     },
     '경기도': {
         '고양시_덕양구': (37.6386, 126.8323, 57, 128, 0.6),
         '고양시_일산동구': (37.6777, 126.7489, 56, 129, 0.5),
         '고양시_일산서구': (37.6779, 126.7505, 56, 129, 0.5),
-        '과천시': (37.4292, 126.9875, 59, 123, 0.4),
-        '광명시': (37.4785, 126.8646, 57, 125, 0.5),
-        '광주시': (37.4294, 127.2552, 64, 123, 0.6),
-        '구리시': (37.5943, 127.1296, 61, 128, 0.5),
-        '군포시': (37.3614, 126.9352, 58, 122, 0.5),
-        '김포시': (37.6152, 126.7156, 54, 128, 0.7),
-        '남양주시': (37.6367, 127.2165, 63, 129, 0.6),
-        '동두천시': (37.9036, 127.0604, 60, 134, 0.5),
-        '부천시': (37.5034, 126.7660, 55, 125, 0.4),
-        '성남시_분당구': (37.3827, 127.1189, 61, 122, 0.4),
-        '성남시_중원구': (37.4305, 127.1378, 61, 123, 0.4),
-        '수원시_권선구': (37.2570, 126.9714, 59, 120, 0.6),
+        '과천시': (37.4292, 126.9875, 60, 124, 0.4),
+        '광명시': (37.4785, 126.8646, 58, 125, 0.5),
+        '광주시': (37.4294, 127.2552, 65, 124, 0.6),
+        '구리시': (37.5943, 127.1296, 62, 127, 0.5),
+        '군포시': (37.3614, 126.9352, 59, 122, 0.5),
+        '김포시': (37.6152, 126.7156, 55, 128, 0.7),
+        '남양주시': (37.6367, 127.2165, 64, 128, 0.6),
+        '동두천시': (37.9036, 127.0604, 61, 134, 0.5),
+        '부천시': (37.5034, 126.7660, 56, 125, 0.4),
+        '성남시_분당구': (37.3827, 127.1189, 62, 123, 0.4),
+        '성남시_중원구': (37.4305, 127.1378, 63, 124, 0.4),
+        '수원시_권선구': (37.2570, 126.9714, 60, 120, 0.6),
         '수원시_장안구': (37.3040, 127.0100, 60, 121, 0.6),
-        '시흥시': (37.3802, 126.8030, 55, 123, 0.5),
-        '안산시_단원구': (37.3219, 126.8309, 56, 122, 0.5),
-        '안산시_상록구': (37.3033, 126.8472, 56, 121, 0.5),
-        '안성시': (37.0080, 127.2799, 64, 119, 0.6),
-        '안양시_동안구': (37.3925, 126.9513, 58, 123, 0.5),
-        '양주시': (37.7853, 127.0458, 60, 132, 0.5),
-        '오산시': (37.1522, 127.0706, 61, 119, 0.6),
+        '시흥시': (37.3802, 126.8030, 57, 123, 0.5),
+        '안산시_단원구': (37.3219, 126.8309, 57, 121, 0.5),
+        '안산시_상록구': (37.3033, 126.8472, 58, 121, 0.5),
+        '안성시': (37.0080, 127.2799, 65, 115, 0.6),
+        '안양시_동안구': (37.3925, 126.9513, 59, 123, 0.5),
+        '양주시': (37.7853, 127.0458, 61, 131, 0.5),
+        '오산시': (37.1522, 127.0706, 62, 118, 0.6),
         '용인시_기흥구': (37.2705, 127.1142, 62, 120, 0.5),
-        '용인시_처인구': (37.2343, 127.2012, 62, 119, 0.5),
-        '의왕시': (37.3448, 126.9682, 59, 122, 0.5),
-        '의정부시': (37.7381, 127.0337, 61, 131, 0.5),
-        '이천시': (37.2723, 127.4352, 64, 121, 0.6),
-        '파주시': (37.7599, 126.7802, 56, 130, 0.7),
-        '평택시': (36.9921, 127.1125, 62, 115, 0.6),
-        '포천시': (37.8947, 127.2002, 63, 133, 0.5),
-        '하남시': (37.5394, 127.2149, 63, 125, 0.6),
+        '용인시_처인구': (37.2343, 127.2012, 64, 120, 0.5),
+        '의왕시': (37.3448, 126.9682, 60, 122, 0.5),
+        '의정부시': (37.7381, 127.0337, 61, 130, 0.5),
+        '이천시': (37.2723, 127.4352, 68, 120, 0.6),
+        '파주시': (37.7599, 126.7802, 56, 131, 0.7),
+        '평택시': (36.9921, 127.1125, 62, 114, 0.6),
+        '포천시': (37.8947, 127.2002, 64, 134, 0.5),
+        '하남시': (37.5394, 127.2149, 64, 126, 0.6),
         '화성시': (37.1995, 126.8312, 57, 119, 0.6)
     },
     '강원특별자치도': {
-        '강릉시': (37.7519, 128.8761, 81, 133, 0.8),
-        '고성군': (38.3806, 128.4678, 80, 146, 0.7),
-        '동해시': (37.5240, 129.1143, 84, 130, 0.9),
-        '삼척시': (37.4499, 129.1650, 84, 129, 0.8),
-        '속초시': (38.2070, 128.5919, 80, 142, 0.7),
-        '양구군': (38.1059, 127.9903, 74, 142, 0.6),
-        '양양군': (38.0754, 128.6189, 80, 141, 0.7),
-        '영월군': (37.1836, 128.4617, 79, 121, 0.6),
-        '원주시': (37.3422, 127.9200, 73, 134, 0.5),
-        '인제군': (38.0697, 128.0170, 77, 141, 0.6),
-        '정선군': (37.3806, 128.6608, 80, 124, 0.7),
-        '철원군': (38.1468, 127.3133, 69, 143, 0.5),
-        '춘천시': (37.8802, 127.7298, 73, 136, 0.6),
-        '태백시': (37.1639, 128.9889, 82, 123, 0.8),
-        '평창군': (37.3708, 128.3901, 78, 123, 0.7),
-        '홍천군': (37.6970, 127.8887, 74, 134, 0.6),
-        '화천군': (38.1061, 127.7083, 72, 141, 0.5),
-        '횡성군': (37.4918, 127.9850, 75, 132, 0.6)
+        '강릉시': (37.7519, 128.8761, 92, 132, 0.8),
+        '고성군': (38.3806, 128.4678, 85, 145, 0.7),
+        '동해시': (37.5240, 129.1143, 97, 127, 0.9),
+        '삼척시': (37.4499, 129.1650, 97, 125, 0.8),
+        '속초시': (38.2070, 128.5919, 87, 141, 0.7),
+        '양구군': (38.1059, 127.9903, 77, 139, 0.6),
+        '양양군': (38.0754, 128.6189, 88, 138, 0.7),
+        '영월군': (37.1836, 128.4617, 86, 119, 0.6),
+        '원주시': (37.3422, 127.9200, 76, 122, 0.5),
+        '인제군': (38.0697, 128.0170, 77, 138, 0.6),
+        '정선군': (37.3806, 128.6608, 89, 123, 0.7),
+        '철원군': (38.1468, 127.3133, 65, 139, 0.5),
+        '춘천시': (37.8802, 127.7298, 73, 134, 0.6),
+        '태백시': (37.1639, 128.9889, 95, 119, 0.8),
+        '평창군': (37.3708, 128.3901, 84, 123, 0.7),
+        '홍천군': (37.6970, 127.8887, 75, 130, 0.6),
+        '화천군': (38.1061, 127.7083, 72, 139, 0.5),
+        '횡성군': (37.4918, 127.9850, 77, 125, 0.6)
     },
     '충청북도': {
-        '괴산군': (36.8154, 127.7868, 70, 109, 0.5),
-        '단양군': (36.9845, 128.3655, 76, 111, 0.6),
-        '보은군': (36.4895, 127.7294, 70, 105, 0.5),
-        '영동군': (36.1750, 127.7834, 70, 99, 0.5),
-        '옥천군': (36.3063, 127.5713, 69, 101, 0.6),
-        '음성군': (36.9402, 127.6906, 71, 113, 0.5),
-        '제천시': (37.1325, 128.2110, 76, 118, 0.6),
-        '증평군': (36.7854, 127.5815, 69, 109, 0.5),
+        '괴산군': (36.8154, 127.7868, 74, 111, 0.5),
+        '단양군': (36.9845, 128.3655, 84, 115, 0.6),
+        '보은군': (36.4895, 127.7294, 73, 104, 0.5),
+        '영동군': (36.1750, 127.7834, 74, 97, 0.5),
+        '옥천군': (36.3063, 127.5713, 71, 100, 0.6),
+        '음성군': (36.9402, 127.6906, 72, 113, 0.5),
+        '제천시': (37.1325, 128.2110, 81, 118, 0.6),
+        '증평군': (36.7854, 127.5815, 71, 110, 0.5),
         '진천군': (36.8567, 127.4357, 68, 111, 0.5),
-        '청주시_상당구': (36.5853, 127.4928, 70, 107, 0.5),
-        '청주시_서원구': (36.6378, 127.4695, 69, 106, 0.5),
-        '청주시_흥덕구': (36.6424, 127.4236, 69, 106, 0.5),
-        '청주시_청원구': (36.6938, 127.4753, 70, 107, 0.5),
-        '충주시': (36.9910, 127.9259, 72, 114, 0.6)
+        '청주시_상당구': (36.5853, 127.4928, 69, 106, 0.5),
+        '청주시_서원구': (36.6378, 127.4695, 69, 107, 0.5),
+        '청주시_흥덕구': (36.6424, 127.4236, 68, 107, 0.5),
+        '청주시_청원구': (36.6938, 127.4753, 69, 108, 0.5),
+        '충주시': (36.9910, 127.9259, 76, 115, 0.6)
     },
     '충청남도': {
-        '계룡시': (36.2745, 127.2484, 66, 100, 0.5),
-        '공주시': (36.4465, 127.1191, 66, 103, 0.5),
-        '금산군': (36.1089, 127.4883, 69, 97, 0.6),
-        '논산시': (36.1871, 127.0987, 66, 99, 0.5),
-        '당진시': (36.8895, 126.6297, 61, 111, 0.6),
-        '보령시': (36.3330, 126.6123, 60, 103, 0.5),
-        '부여군': (36.2759, 126.9094, 63, 100, 0.6),
-        '서산시': (36.7817, 126.4522, 59, 110, 0.5),
-        '서천군': (36.0803, 126.6914, 61, 98, 0.6),
-        '아산시': (36.7836, 127.0042, 66, 109, 0.5),
-        '예산군': (36.6808, 126.8455, 62, 107, 0.6),
-        '천안시_동남구': (36.8065, 127.1522, 66, 110, 0.5),
-        '천안시_서북구': (36.9119, 127.1336, 66, 112, 0.5),
-        '청양군': (36.4587, 126.8020, 62, 104, 0.6),
-        '태안군': (36.7456, 126.2980, 58, 110, 0.5),
-        '홍성군': (36.6012, 126.6609, 61, 106, 0.6)
+        '계룡시': (36.2745, 127.2484, 65, 99, 0.5),
+        '공주시': (36.4465, 127.1191, 63, 102, 0.5),
+        '금산군': (36.1089, 127.4883, 69, 95, 0.6),
+        '논산시': (36.1871, 127.0987, 62, 97, 0.5),
+        '당진시': (36.8895, 126.6297, 54, 112, 0.6),
+        '보령시': (36.3330, 126.6123, 54, 100, 0.5),
+        '부여군': (36.2759, 126.9094, 59, 99, 0.6),
+        '서산시': (36.7817, 126.4522, 51, 110, 0.5),
+        '서천군': (36.0803, 126.6914, 55, 94, 0.6),
+        '아산시': (36.7836, 127.0042, 60, 110, 0.5),
+        '예산군': (36.6808, 126.8455, 58, 107, 0.6),
+        '천안시_동남구': (36.8065, 127.1522, 63, 110, 0.5),
+        '천안시_서북구': (36.9119, 127.1336, 63, 113, 0.5),
+        '청양군': (36.4587, 126.8020, 57, 103, 0.6),
+        '태안군': (36.7456, 126.2980, 48, 109, 0.5),
+        '홍성군': (36.6012, 126.6609, 55, 106, 0.6)
     },
     '전라북도': {
-        '고창군': (35.4358, 126.7021, 60, 81, 0.5),
-        '군산시': (35.9818, 126.7114, 60, 86, 0.6),
-        '김제시': (35.8036, 126.8809, 61, 84, 0.5),
+        '고창군': (35.4358, 126.7021, 55, 80, 0.5),
+        '군산시': (35.9818, 126.7114, 56, 92, 0.6),
+        '김제시': (35.8036, 126.8809, 59, 88, 0.5),
         '남원시': (35.4164, 127.3900, 68, 80, 0.6),
-        '무주군': (36.0068, 127.6609, 71, 96, 0.5),
-        '부안군': (35.7317, 126.7330, 60, 83, 0.6),
-        '순창군': (35.3745, 127.1375, 64, 79, 0.5),
-        '완주군': (35.9050, 127.1610, 64, 89, 0.7),
-        '익산시': (35.9439, 126.9544, 63, 86, 0.6),
-        '임실군': (35.6170, 127.2892, 66, 81, 0.5),
-        '장수군': (35.6474, 127.5215, 68, 82, 0.6),
+        '무주군': (36.0068, 127.6609, 72, 93, 0.5),
+        '부안군': (35.7317, 126.7330, 56, 87, 0.6),
+        '순창군': (35.3745, 127.1375, 63, 79, 0.5),
+        '완주군': (35.9050, 127.1610, 63, 91, 0.7),
+        '익산시': (35.9439, 126.9544, 60, 91, 0.6),
+        '임실군': (35.6170, 127.2892, 66, 84, 0.5),
+        '장수군': (35.6474, 127.5215, 70, 85, 0.6),
         '전주시_덕진구': (35.8418, 127.1195, 63, 89, 0.7),
-        '전주시_완산구': (35.8047, 127.1200, 63, 89, 0.7),
-        '정읍시': (35.5699, 126.8560, 61, 83, 0.6),
-        '진안군': (35.7917, 127.4248, 67, 84, 0.5)
+        '전주시_완산구': (35.8047, 127.1200, 63, 88, 0.7),
+        '정읍시': (35.5699, 126.8560, 58, 83, 0.6),
+        '진안군': (35.7917, 127.4248, 68, 88, 0.5)
     },
     '전라남도': {
-        '강진군': (34.6420, 126.7672, 60, 66, 0.5),
-        '고흥군': (34.6044, 127.2756, 66, 65, 0.6),
-        '곡성군': (35.2818, 127.2919, 65, 76, 0.5),
-        '광양시': (34.9407, 127.6959, 69, 70, 0.6),
-        '구례군': (35.2025, 127.4625, 67, 75, 0.5),
-        '나주시': (35.0158, 126.7117, 61, 75, 0.6),
-        '담양군': (35.3212, 126.9882, 62, 78, 0.5),
+        '강진군': (34.6420, 126.7672, 57, 63, 0.5),
+        '고흥군': (34.6044, 127.2756, 66, 62, 0.6),
+        '곡성군': (35.2818, 127.2919, 66, 77, 0.5),
+        '광양시': (34.9407, 127.6959, 73, 70, 0.6),
+        '구례군': (35.2025, 127.4625, 69, 75, 0.5),
+        '나주시': (35.0158, 126.7117, 56, 71, 0.6),
+        '담양군': (35.3212, 126.9882, 61, 78, 0.5),
         '목포시': (34.8118, 126.3922, 50, 67, 0.4),
-        '무안군': (34.9899, 126.4813, 53, 70, 0.5),
-        '보성군': (34.7714, 127.0800, 64, 66, 0.6),
-        '순천시': (34.9506, 127.4872, 67, 69, 0.5),
-        '신안군': (34.8333, 126.3500, 51, 66, 0.4),
-        '여수시': (34.7604, 127.6622, 71, 68, 1.2),
-        '영광군': (35.2781, 126.5118, 54, 80, 0.5),
-        '영암군': (34.8002, 126.6968, 58, 67, 0.6),
-        '완도군': (34.3108, 126.7550, 59, 62, 0.5),
-        '장성군': (35.3019, 126.7849, 59, 79, 0.5),
-        '장흥군': (34.6817, 126.9071, 61, 65, 0.6),
-        '진도군': (34.4868, 126.2634, 53, 63, 0.5),
-        '함평군': (35.0659, 126.5165, 55, 75, 0.6),
-        '해남군': (34.5735, 126.5990, 58, 63, 0.5),
-        '화순군': (35.0644, 127.0260, 64, 76, 0.5)
+        '무안군': (34.9899, 126.4813, 52, 71, 0.5),
+        '보성군': (34.7714, 127.0800, 62, 66, 0.6),
+        '순천시': (34.9506, 127.4872, 70, 70, 0.5),
+        '신안군': (34.8333, 126.3500, 49, 67, 0.4),
+        '여수시': (34.7604, 127.6622, 73, 66, 1.2),
+        '영광군': (35.2781, 126.5118, 52, 77, 0.5),
+        '영암군': (34.8002, 126.6968, 55, 66, 0.6),
+        '완도군': (34.3108, 126.7550, 57, 56, 0.5),
+        '장성군': (35.3019, 126.7849, 57, 77, 0.5),
+        '장흥군': (34.6817, 126.9071, 59, 64, 0.6),
+        '진도군': (34.4868, 126.2634, 48, 60, 0.5),
+        '함평군': (35.0659, 126.5165, 52, 72, 0.6),
+        '해남군': (34.5735, 126.5990, 54, 61, 0.5),
+        '화순군': (35.0644, 127.0260, 61, 72, 0.5)
     },
     '경상북도': {
-        '경산시': (35.8251, 128.7415, 90, 88, 0.6),
-        '경주시': (35.8562, 129.2247, 92, 88, 0.7),
-        '고령군': (35.7260, 128.2629, 85, 87, 0.6),
-        '구미시': (36.1195, 128.3443, 82, 94, 0.5),
-        '군위군': (36.2426, 128.5728, 84, 98, 0.6),
-        '김천시': (36.1218, 128.1221, 81, 95, 0.5),
-        '문경시': (36.6273, 128.1990, 78, 100, 0.6),
-        '봉화군': (36.8930, 128.9147, 81, 105, 0.5),
-        '상주시': (36.4150, 128.1590, 79, 99, 0.6),
-        '성주군': (35.9191, 128.2829, 85, 90, 0.5),
-        '안동시': (36.5684, 128.7294, 82, 102, 0.6),
-        '영덕군': (36.4150, 129.3650, 90, 99, 0.7),
-        '영양군': (36.6667, 129.1167, 88, 102, 0.6),
-        '영주시': (36.8057, 128.6242, 80, 104, 0.5),
-        '영천시': (35.9733, 128.9388, 87, 92, 0.6),
-        '예천군': (36.6467, 128.4375, 80, 101, 0.5),
-        '울릉군': (37.4844, 130.9058, 104, 130, 0.8),
-        '울진군': (36.9930, 129.4002, 91, 109, 0.7),
-        '의성군': (36.3528, 128.6972, 84, 98, 0.6),
-        '청도군': (35.6474, 128.7330, 86, 85, 0.5),
-        '청송군': (36.4335, 129.0571, 87, 100, 0.6),
-        '칠곡군': (36.0121, 128.4015, 83, 93, 0.5),
-        '포항시_남구': (36.0195, 129.3435, 91, 83, 1.0),
-        '포항시_북구': (36.0417, 129.3684, 91, 84, 1.0)
+        '경산시': (35.8251, 128.7415, 91, 90, 0.6),
+        '경주시': (35.8562, 129.2247, 100, 91, 0.7),
+        '고령군': (35.7260, 128.2629, 83, 87, 0.6),
+        '구미시': (36.1195, 128.3443, 84, 96, 0.5),
+        '군위군': (36.2426, 128.5728, 88, 99, 0.6),
+        '김천시': (36.1218, 128.1221, 80, 96, 0.5),
+        '문경시': (36.6273, 128.1990, 81, 107, 0.6),
+        '봉화군': (36.8930, 128.9147, 94, 113, 0.5),
+        '상주시': (36.4150, 128.1590, 81, 102, 0.6),
+        '성주군': (35.9191, 128.2829, 83, 91, 0.5),
+        '안동시': (36.5684, 128.7294, 91, 106, 0.6),
+        '영덕군': (36.4150, 129.3650, 102, 103, 0.7),
+        '영양군': (36.6667, 129.1167, 97, 108, 0.6),
+        '영주시': (36.8057, 128.6242, 89, 111, 0.5),
+        '영천시': (35.9733, 128.9388, 95, 93, 0.6),
+        '예천군': (36.6467, 128.4375, 85, 107, 0.5),
+        '울릉군': (37.4844, 130.9058, 127, 127, 0.8),
+        '울진군': (36.9930, 129.4002, 102, 115, 0.7),
+        '의성군': (36.3528, 128.6972, 90, 101, 0.6),
+        '청도군': (35.6474, 128.7330, 91, 86, 0.5),
+        '청송군': (36.4335, 129.0571, 96, 103, 0.6),
+        '칠곡군': (36.0121, 128.4015, 85, 93, 0.5),
+        '포항시_남구': (36.0195, 129.3435, 102, 94, 1.0),
+        '포항시_북구': (36.0417, 129.3684, 102, 95, 1.0)
     },
     '경상남도': {
-        '거제시': (34.8804, 128.6211, 86, 65, 1.1),
-        '거창군': (35.6866, 127.9094, 73, 84, 0.6),
-        '고성군': (34.9726, 128.3225, 84, 67, 0.7),
-        '김해시': (35.2342, 128.8811, 95, 78, 0.8),
-        '남해군': (34.8376, 127.8928, 73, 64, 0.6),
-        '밀양시': (35.5038, 128.7464, 88, 82, 0.7),
-        '사천시': (35.0038, 128.0636, 82, 72, 0.8),
-        '산청군': (35.4155, 127.8736, 73, 81, 0.6),
-        '양산시': (35.3350, 129.0372, 98, 79, 0.9),
-        '의령군': (35.3222, 128.2618, 84, 79, 0.7),
-        '진주시': (35.1803, 128.1076, 82, 76, 0.8),
-        '창녕군': (35.5445, 128.4921, 86, 82, 0.7),
-        '창원시_마산합포구': (35.1971, 128.5666, 94, 75, 0.5),
-        '창원시_마산회원구': (35.2197, 128.5803, 94, 76, 0.5),
-        '창원시_성산구': (35.2224, 128.6805, 95, 76, 0.5),
-        '창원시_의창구': (35.2580, 128.6384, 95, 76, 0.5),
-        '창원시_진해구': (35.1328, 128.7101, 94, 74, 0.5),
-        '통영시': (34.8544, 128.4332, 84, 66, 1.0),
-        '하동군': (35.0713, 127.7517, 71, 77, 0.6),
-        '함안군': (35.2726, 128.4064, 84, 78, 0.7),
-        '함양군': (35.5205, 127.7252, 70, 82, 0.6),
-        '합천군': (35.5667, 128.1658, 81, 82, 0.7)
+        '거제시': (34.8804, 128.6211, 90, 69, 1.1),
+        '거창군': (35.6866, 127.9094, 77, 86, 0.6),
+        '고성군': (34.9726, 128.3225, 85, 71, 0.7),
+        '김해시': (35.2342, 128.8811, 94, 77, 0.8),
+        '남해군': (34.8376, 127.8928, 77, 68, 0.6),
+        '밀양시': (35.5038, 128.7464, 92, 83, 0.7),
+        '사천시': (35.0038, 128.0636, 80, 71, 0.8),
+        '산청군': (35.4155, 127.8736, 76, 80, 0.6),
+        '양산시': (35.3350, 129.0372, 97, 79, 0.9),
+        '의령군': (35.3222, 128.2618, 83, 78, 0.7),
+        '진주시': (35.1803, 128.1076, 81, 75, 0.8),
+        '창녕군': (35.5445, 128.4921, 87, 83, 0.7),
+        '창원시_마산합포구': (35.1971, 128.5666, 89, 76, 0.5),
+        '창원시_마산회원구': (35.2197, 128.5803, 89, 76, 0.5),
+        '창원시_성산구': (35.2224, 128.6805, 91, 76, 0.5),
+        '창원시_의창구': (35.2580, 128.6384, 90, 77, 0.5),
+        '창원시_진해구': (35.1328, 128.7101, 91, 74, 0.5),
+        '통영시': (34.8544, 128.4332, 87, 68, 1.0),
+        '하동군': (35.0713, 127.7517, 74, 73, 0.6),
+        '함안군': (35.2726, 128.4064, 86, 77, 0.7),
+        '함양군': (35.5205, 127.7252, 74, 82, 0.6),
+        '합천군': (35.5667, 128.1658, 81, 84, 0.7)
     },
     '제주특별자치도': {
-        '서귀포시': (33.2533, 126.5601, 52, 34, 0.3),
-        '제주시': (33.4996, 126.5312, 52, 38, 0.2)
+        '서귀포시': (33.2533, 126.5601, 53, 33, 0.3),
+        '제주시': (33.4996, 126.5312, 53, 38, 0.2)
     }
 }
\ No newline at end of file
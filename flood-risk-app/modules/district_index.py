@@ -0,0 +1,90 @@
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+from scipy.spatial import cKDTree
+
+from modules.data import korean_cities
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def _to_xyz(lat, lon):
+    """위경도 → 단위구 3차원 좌표 (현 거리로 최근접 판정 = 대원 거리 순서와 동일)"""
+    lat = np.radians(np.asarray(lat, dtype=np.float64))
+    lon = np.radians(np.asarray(lon, dtype=np.float64))
+    cos_lat = np.cos(lat)
+    return np.stack([cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)], axis=-1)
+
+
+def _chord_to_km(chord):
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.clip(chord / 2, 0, 1))
+
+
+def _km_to_chord(km):
+    return 2 * np.sin(np.asarray(km, dtype=np.float64) / (2 * EARTH_RADIUS_KM))
+
+
+class DistrictIndex:
+    """
+    korean_cities를 열 단위 테이블로 적재한 지역 인덱스.
+    행 번호가 지역 코드이며, KD-tree로 좌표 → 지역 최근접/반경 질의를 O(log n)에 처리.
+    """
+
+    def __init__(self, cities=None):
+        rows = [(sido, gu) + tuple(values)
+                for sido, gus in (cities or korean_cities).items()
+                for gu, values in gus.items()]
+        sido, gu, lat, lon, nx, ny, depth = zip(*rows)
+        self.table = pd.DataFrame({
+            'sido': pd.Categorical(sido),
+            'gu': pd.Categorical(gu),
+            'lat': np.array(lat, dtype=np.float32),
+            'lon': np.array(lon, dtype=np.float32),
+            'nx': np.array(nx, dtype=np.int16),
+            'ny': np.array(ny, dtype=np.int16),
+            'base_depth': np.array(depth, dtype=np.float32)
+        })
+        self._codes = pd.MultiIndex.from_arrays([self.table['sido'], self.table['gu']])
+        self._code_map = {key: code for code, key in enumerate(zip(sido, gu))}  # 단건 조회용
+        self._tree = cKDTree(_to_xyz(lat, lon))
+
+    def __len__(self):
+        return len(self.table)
+
+    def code_of(self, sido, gu):
+        """(sido, gu) 배열 → 지역 코드 배열 (없으면 -1)"""
+        if isinstance(sido, str) and isinstance(gu, str):
+            return np.array([self._code_map.get((sido, gu), -1)], dtype=np.intp)
+        keys = pd.MultiIndex.from_arrays([np.atleast_1d(sido), np.atleast_1d(gu)])
+        return self._codes.get_indexer(keys)
+
+    def take(self, codes):
+        """지역 코드 배열 → 해당 행 (벡터화 조회)"""
+        return self.table.iloc[np.asarray(codes)]
+
+    def nearest(self, lat, lon, k=1, max_km=None):
+        """
+        좌표(배열)별 최근접 지역 코드와 거리(km).
+        k=1이면 (n,) 배열, k>1이면 (n, k) 배열 반환. max_km 밖이면 코드 -1, 거리 inf.
+        """
+        bound = np.inf if max_km is None else float(_km_to_chord(max_km))
+        chord, codes = self._tree.query(_to_xyz(lat, lon), k=k, distance_upper_bound=bound, workers=-1)
+        if max_km is None:
+            return codes, _chord_to_km(chord)
+        missing = np.isinf(chord)
+        return np.where(missing, -1, codes), np.where(missing, np.inf, _chord_to_km(chord))
+
+    def within(self, lat, lon, radius_km):
+        """좌표 반경 radius_km 이내 지역 코드. 스칼라 좌표면 배열 1개, 배열이면 좌표별 목록"""
+        points = _to_xyz(lat, lon)
+        result = self._tree.query_ball_point(points, _km_to_chord(radius_km))
+        if points.ndim == 1:
+            return np.array(sorted(result), dtype=np.intp)
+        return [np.array(sorted(r), dtype=np.intp) for r in result]
+
+
+@lru_cache(maxsize=1)
+def get_district_index():
+    """기본 korean_cities 인덱스 (프로세스당 1회 생성)"""
+    return DistrictIndex()
@@ -0,0 +1,49 @@
+from functools import lru_cache
+
+import numpy as np
+
+from modules.district_index import get_district_index
+from modules.utils import calculate_risk_array
+
+N_SAMPLES = 10000
+SEED = 42
+DEPTH_SPREAD = 2.0  # base_depth + U(0, 2) m (기존 단일 추출과 같은 분포)
+PERCENTILES = (50, 90, 99)
+
+
+class DepthEnsemble:
+    """
+    지역별 침수심 앙상블 (seed 고정 → 재실행해도 동일).
+    samples: (지역 수, N) float32, 행 순서는 DistrictIndex 지역 코드와 같음.
+    """
+
+    def __init__(self, base_depth, n_samples=N_SAMPLES, seed=SEED):
+        base_depth = np.asarray(base_depth, dtype=np.float32)
+        rng = np.random.default_rng(seed)
+        self.samples = rng.uniform(0, DEPTH_SPREAD, size=(len(base_depth), n_samples)).astype(np.float32)
+        self.samples += base_depth[:, None]
+        # 분위수는 강수량/고도와 무관하므로 생성 시 1회 계산
+        self.depth_percentiles = np.percentile(self.samples, PERCENTILES, axis=1).T.astype(np.float32)
+
+    def risk_samples(self, rainfall, elevation, codes=None):
+        """앙상블 침수심을 위험 공식에 통과시킨 (score, class) 배열 (지역 수 × N)"""
+        samples = self.samples if codes is None else self.samples[np.asarray(codes)]
+        rainfall = np.asarray(rainfall, dtype=np.float32)
+        elevation = np.asarray(elevation, dtype=np.float32)
+        if rainfall.ndim:
+            rainfall = rainfall[:, None]
+        if elevation.ndim:
+            elevation = elevation[:, None]
+        return calculate_risk_array(rainfall, elevation, samples, dtype=np.float32)
+
+    def exceedance(self, rainfall, elevation, codes=None):
+        """지역별 고위험(점수 > 임계값) 확률. codes가 스칼라면 float 반환"""
+        _, predicted_risk = self.risk_samples(rainfall, elevation, codes)
+        probability = predicted_risk.mean(axis=-1)
+        return float(probability) if np.ndim(probability) == 0 else probability
+
+
+@lru_cache(maxsize=1)
+def get_depth_ensemble():
+    """기본 지역 목록의 앙상블 (프로세스당 1회 생성)"""
+    return DepthEnsemble(get_district_index().table['base_depth'].to_numpy())
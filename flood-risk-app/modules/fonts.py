@@ -0,0 +1,57 @@
+import os
+import threading
+import warnings
+
+import matplotlib
+from matplotlib import font_manager as fm
+
+FONT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'fonts')
+FONT_FAMILY = ['NanumGothic', 'Noto Sans CJK KR', 'Liberation Sans', 'sans-serif']
+
+_initialized = False
+_lock = threading.Lock()
+
+
+def _font_cache_path():
+    return os.path.join(matplotlib.get_cachedir(), f"fontlist-v{fm.FontManager.__version__}.json")
+
+
+def setup_fonts():
+    """
+    한글 폰트 등록 + rcParams 설정 (프로세스당 1회).
+    폰트가 캐시에 없을 때만 등록 후 matplotlib 폰트 캐시 파일에 저장해
+    다음 프로세스는 캐시만 읽고 재빌드하지 않음.
+    """
+    global _initialized
+    if _initialized:
+        return
+    with _lock:
+        if _initialized:
+            return
+        registered = {os.path.abspath(f.fname) for f in fm.fontManager.ttflist}
+        added = False
+        for font_file in fm.findSystemFonts(FONT_DIR):
+            if os.path.abspath(font_file) in registered:
+                continue
+            try:
+                fm.fontManager.addfont(font_file)
+                added = True
+            except Exception as e:
+                print(f"Font load warning: {e}")  # 디버깅용 (Cloud 로그에 출력)
+        if added:
+            try:
+                fm.json_dump(fm.fontManager, _font_cache_path())
+            except Exception as e:
+                print(f"Font cache write warning: {e}")
+
+        # 폰트 가족 설정: NanumGothic 우선, Noto CJK / Liberation Sans / sans-serif fallback
+        # 설치되지 않은 가족은 제외 (남겨 두면 텍스트를 그릴 때마다 폰트 탐색 + findfont 경고 로깅)
+        installed = {f.name for f in fm.fontManager.ttflist}
+        matplotlib.rcParams['font.family'] = [f for f in FONT_FAMILY if f in installed or f == 'sans-serif']
+        matplotlib.rcParams['axes.unicode_minus'] = False  # 마이너스 기호 깨짐 방지
+
+        # 워닝 완전 무시 (findfont, Glyph, UserWarning 관련)
+        warnings.filterwarnings("ignore", message="findfont")
+        warnings.filterwarnings("ignore", category=UserWarning, message="Glyph")
+        warnings.filterwarnings("ignore", message="Font family")
+        _initialized = True
@@ -0,0 +1,285 @@
+"""
+기상청 초단기예보(getUltraSrtFcst, 6시간)·단기예보(getVilageFcst, 약 3일) 수집.
+
+격자당 수백~수천 항목인 응답을 ET.fromstring/json.loads로 통째로 만들지 않고,
+XML은 XMLPullParser, JSON은 청크 단위 정규식 스캔으로 읽어
+항목 dict 없이 (격자 × 예보 시간) float32 배열에 바로 기록함.
+"""
+import re
+import xml.etree.ElementTree as ET
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from functools import lru_cache
+from itertools import chain
+
+import numpy as np
+import requests
+
+from modules import api
+from modules.api import WeatherAPIError, request_kma, get_grid_cells, POOL_SIZE, FALLBACK_TTL, MISSING_VALUES
+from modules.cache import TTLCache
+from modules.district_index import get_district_index
+from modules.utils import calculate_risk_array
+
+CHUNK_SIZE = 64 * 1024
+
+# first_base: 자정 기준 첫 발표 시각, release_delay: 발표 후 제공까지 여유,
+# rain: 1시간 강수량 항목, max_leads: 격자당 할당 시간 수 (값 없는 뒤쪽 시간은 조립 시 잘라냄)
+Product = namedtuple('Product', ['name', 'operation', 'categories', 'rain', 'first_base', 'interval',
+                                 'release_delay', 'max_leads', 'num_rows'])
+ULTRA_SHORT = Product('ultra', 'getUltraSrtFcst', ('RN1', 'PTY'), 'RN1', timedelta(minutes=30),
+                      timedelta(hours=1), timedelta(minutes=15), 6, 60)
+SHORT = Product('short', 'getVilageFcst', ('PCP', 'PTY', 'POP'), 'PCP', timedelta(hours=2),
+                timedelta(hours=3), timedelta(minutes=10), 120, 2000)
+
+_fcst_cache = TTLCache(maxsize=2048)
+
+_XML_FIELDS = {'category': 0, 'fcstDate': 1, 'fcstTime': 2, 'fcstValue': 3}
+_JSON_RESULT = re.compile(rb'"resultCode"\s*:\s*"(\w+)"')
+# 기상청 JSON item 필드 순서 고정: baseDate, baseTime, category, fcstDate, fcstTime, fcstValue, nx, ny
+_JSON_ITEM = re.compile(rb'"category"\s*:\s*"(\w+)"\s*,\s*"fcstDate"\s*:\s*"(\d{8})"\s*,'
+                        rb'\s*"fcstTime"\s*:\s*"(\d{4})"\s*,\s*"fcstValue"\s*:\s*"([^"]*)"')
+
+
+def get_forecast_base(product, now=None):
+    """현재 시각 기준 조회 가능한 최신 예보 발표 시각"""
+    now = now or datetime.now()
+    ready = now.replace(second=0, microsecond=0) - product.release_delay
+    midnight = ready.replace(hour=0, minute=0)
+    return ready - (ready - midnight - product.first_base) % product.interval
+
+
+def next_forecast_release(product, base):
+    """base 다음 발표분이 제공되는 시각 (캐시 만료 시각)"""
+    return base + product.interval + product.release_delay
+
+
+def lead_origin(base):
+    """예보 시간 0번 칸의 시각 (발표 시각 다음 정시)"""
+    return base.replace(minute=0) + timedelta(hours=1)
+
+
+@lru_cache(maxsize=4096)
+def parse_value(text):
+    """
+    예보 값 문자열 → float (결측 NaN).
+    강수량: '강수없음' 0, '1mm 미만' 0.5, '30.0~50.0mm' 범위 중간값, '50.0mm 이상' 하한값.
+    """
+    if isinstance(text, bytes):
+        text = text.decode('utf-8')
+    text = (text or '').strip()
+    if not text or text in MISSING_VALUES:
+        return np.nan
+    if text == '강수없음':
+        return 0.0
+    if '미만' in text:
+        return 0.5
+    text = text.replace('mm', '').replace('이상', '').strip()
+    try:
+        if '~' in text:
+            low, high = text.split('~')
+            return (float(low) + float(high)) / 2
+        return float(text)
+    except ValueError:
+        return np.nan
+
+
+def iter_xml_items(chunks):
+    """XML 응답 청크 → (category, fcstDate, fcstTime, fcstValue) 튜플. 읽은 item 요소는 즉시 비움"""
+    parser = ET.XMLPullParser(events=('end',))
+    checked = False
+    for chunk in chunks:
+        parser.feed(chunk)
+        for _, elem in parser.read_events():
+            tag = elem.tag
+            if tag == 'item':
+                fields = [None] * 4
+                for child in elem:
+                    position = _XML_FIELDS.get(child.tag)
+                    if position is not None:
+                        fields[position] = child.text
+                elem.clear()
+                yield tuple(fields)
+            elif tag == 'resultCode':
+                if elem.text != '00':
+                    raise WeatherAPIError(f"기상청 응답 오류 (코드: {elem.text})", elem.text)
+                checked = True
+            elif tag == 'returnReasonCode':  # 게이트웨이 오류 (서비스 키 등)
+                raise WeatherAPIError(f"기상청 응답 오류 (코드: {elem.text})", elem.text)
+    parser.close()
+    if not checked:
+        raise WeatherAPIError("기상청 응답 형식 오류")
+
+
+def iter_json_items(chunks):
+    """JSON 응답 청크 → (category, fcstDate, fcstTime, fcstValue) bytes 튜플. 마지막 '}' 이후 조각만 다음 청크로 넘김"""
+    chunks = iter(chunks)
+    buffer, checked = b'', False
+    for chunk in chunks:
+        buffer += chunk
+        if not checked:
+            if buffer.lstrip()[:1] == b'<':  # 게이트웨이 오류는 dataType과 무관하게 XML
+                yield from iter_xml_items(chain([buffer], chunks))
+                return
+            match = _JSON_RESULT.search(buffer)
+            if match is None:
+                continue
+            code = match.group(1).decode()
+            if code != '00':
+                raise WeatherAPIError(f"기상청 응답 오류 (코드: {code})", code)
+            checked = True
+        end = buffer.rfind(b'}') + 1
+        if end:
+            yield from (m.groups() for m in _JSON_ITEM.finditer(buffer, 0, end))
+            buffer = buffer[end:]
+    if not checked:
+        raise WeatherAPIError("기상청 응답 형식 오류")
+
+
+def fill_forecast(items, product, origin):
+    """항목 튜플 → (len(product.categories), max_leads) float32 배열 (origin 이전·범위 밖 시간은 버림, 빈 칸 NaN)"""
+    out = np.full((len(product.categories), product.max_leads), np.nan, dtype=np.float32)
+    rows = {}
+    for row, category in enumerate(product.categories):
+        rows[category] = rows[category.encode()] = row
+    leads = {}  # (fcstDate, fcstTime) -> 예보 시간 칸 (응답 내 고유 시각 수만큼만 계산)
+    for category, fcst_date, fcst_time, value in items:
+        row = rows.get(category)
+        if row is None:
+            continue
+        key = (fcst_date, fcst_time)
+        lead = leads.get(key)
+        if lead is None:
+            valid = datetime(int(fcst_date[:4]), int(fcst_date[4:6]), int(fcst_date[6:8]), int(fcst_time[:2]))
+            lead = leads[key] = int((valid - origin).total_seconds() // 3600)
+        if 0 <= lead < product.max_leads:
+            out[row, lead] = parse_value(value)
+    return out
+
+
+def _request_forecast(api_key, product, nx, ny, base, origin, data_type='JSON', session=None):
+    params = {
+        'serviceKey': api_key, 'pageNo': '1', 'numOfRows': str(product.num_rows), 'dataType': data_type,
+        'base_date': base.strftime('%Y%m%d'), 'base_time': base.strftime('%H%M'),
+        'nx': str(nx), 'ny': str(ny)
+    }
+    url = api.NCST_URL.rsplit('/', 1)[0] + '/' + product.operation
+    response = request_kma(url, params, session, stream=True)
+    try:
+        chunks = response.iter_content(CHUNK_SIZE)
+        items = iter_json_items(chunks) if data_type == 'JSON' else iter_xml_items(chunks)
+        return fill_forecast(items, product, origin)
+    except requests.RequestException as e:
+        raise WeatherAPIError(f"기상청 연결 실패 ({type(e).__name__})", 'NETWORK', transient=True)
+    finally:
+        response.close()
+
+
+def _load_forecast(api_key, product, nx, ny, base, data_type, session=None):
+    """발표 전(코드 03)이면 이전 발표분으로 대체 (예보 시간 칸은 base 기준으로 맞춤)"""
+    origin = lead_origin(base)
+    try:
+        return _request_forecast(api_key, product, nx, ny, base, origin, data_type, session), \
+            next_forecast_release(product, base)
+    except WeatherAPIError as e:
+        if e.result_code != '03':
+            raise
+    values = _request_forecast(api_key, product, nx, ny, base - product.interval, origin, data_type, session)
+    return values, datetime.now() + FALLBACK_TTL
+
+
+def get_cell_forecast(api_key, nx, ny, product=ULTRA_SHORT, now=None, data_type='JSON', session=None):
+    """
+    격자 (nx, ny) 예보 배열 (항목 수 × max_leads, 읽기 전용).
+    (상품, nx, ny, 발표 시각) 단위로 다음 발표 제공 시각까지 프로세스 공용 캐시.
+    """
+    base = get_forecast_base(product, now)
+
+    def load():
+        values, expires_at = _load_forecast(api_key, product, nx, ny, base, data_type, session)
+        values.flags.writeable = False
+        return values, expires_at
+
+    return _fcst_cache.get_or_load((product.name, nx, ny, base.strftime('%Y%m%d%H%M')), load)
+
+
+class ForecastGrid:
+    """
+    (격자 × 예보 시간) 예보. values[category]: float32 (len(cells), len(valid_times)), 결측 NaN.
+    조회 실패 격자는 failed에 남고 값은 전부 NaN.
+    """
+
+    def __init__(self, product, base, cells, values, failed=()):
+        self.product = product
+        self.base = base
+        self.cells = cells
+        self.values = values
+        self.failed = list(failed)
+        n_leads = values[product.rain].shape[1]
+        self.valid_times = np.datetime64(lead_origin(base), 'h') + np.arange(n_leads)
+        self._rows = {cell: row for row, cell in enumerate(cells)}
+
+    @property
+    def rainfall(self):
+        """1시간 강수량 (mm)"""
+        return self.values[self.product.rain]
+
+    def rows_of(self, nx, ny):
+        """격자 배열 → 행 번호 배열 (없으면 -1)"""
+        return np.array([self._rows.get(cell, -1) for cell in zip(np.atleast_1d(nx).tolist(),
+                                                                 np.atleast_1d(ny).tolist())], dtype=np.intp)
+
+
+def get_forecast(api_key, product=ULTRA_SHORT, cells=None, now=None, max_workers=16, data_type='JSON'):
+    """
+    격자 목록(기본 전국) 예보를 동시 조회해 ForecastGrid로 조립.
+    모든 격자에서 값이 없는 뒤쪽 예보 시간은 잘라냄.
+    """
+    cells = list(dict.fromkeys(cells if cells is not None else get_grid_cells()))
+    base = get_forecast_base(product, now)
+    max_workers = max(1, min(max_workers, POOL_SIZE, len(cells) or 1))
+
+    def fetch(cell):
+        try:
+            return get_cell_forecast(api_key, cell[0], cell[1], product, now, data_type)
+        except Exception:
+            return None
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(fetch, cells))
+
+    stacked = np.full((len(product.categories), len(cells), product.max_leads), np.nan, dtype=np.float32)
+    for row, values in enumerate(results):
+        if values is not None:
+            stacked[:, row] = values
+    filled = np.flatnonzero(~np.isnan(stacked).all(axis=(0, 1)))
+    stacked = stacked[:, :, :filled[-1] + 1 if len(filled) else 0]
+    failed = [cell for cell, values in zip(cells, results) if values is None]
+    return ForecastGrid(product, base, cells, dict(zip(product.categories, stacked)), failed)
+
+
+def score_forecast(forecast, elevation, codes=None, flood_depth=None):
+    """
+    예보 시간별 위험 (risk_score, predicted_risk[int8]) 배열 (지역 × 예보 시간).
+    codes: DistrictIndex 지역 코드 (기본 전체), flood_depth 기본 base_depth. 예보 없는 칸은 점수 NaN·class 0.
+    """
+    index = get_district_index()
+    table = index.table if codes is None else index.take(codes)
+    rows = forecast.rows_of(table['nx'].to_numpy(), table['ny'].to_numpy())
+    rainfall = forecast.rainfall[rows]
+    rainfall[rows < 0] = np.nan
+
+    elevation = np.asarray(elevation, dtype=np.float32)
+    depth = np.asarray(table['base_depth'].to_numpy() if flood_depth is None else flood_depth, dtype=np.float32)
+    if elevation.ndim:
+        elevation = elevation[:, None]
+    if depth.ndim:
+        depth = depth[:, None]
+    return calculate_risk_array(rainfall, elevation, depth, dtype=np.float32)
+
+
+def hours_to_risk(predicted_risk):
+    """지역별 첫 고위험 예보 시간 칸 (없으면 -1)"""
+    predicted_risk = np.asarray(predicted_risk, dtype=bool)
+    return np.where(predicted_risk.any(axis=-1), predicted_risk.argmax(axis=-1), -1)
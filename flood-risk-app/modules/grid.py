@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+
+from modules.data import korean_cities
+
+# 기상청 동네예보 격자 (Lambert Conformal Conic) 파라미터
+RE = 6371.00877  # 지구 반경 (km)
+GRID = 5.0  # 격자 간격 (km)
+SLAT1, SLAT2 = 30.0, 60.0  # 표준 위도
+OLON, OLAT = 126.0, 38.0  # 기준점 경위도
+XO, YO = 43, 136  # 기준점 격자 좌표
+
+_DEGRAD = np.pi / 180.0
+_re = RE / GRID
+_slat1, _slat2 = SLAT1 * _DEGRAD, SLAT2 * _DEGRAD
+_olon, _olat = OLON * _DEGRAD, OLAT * _DEGRAD
+_sn = np.log(np.cos(_slat1) / np.cos(_slat2)) / np.log(
+    np.tan(np.pi * 0.25 + _slat2 * 0.5) / np.tan(np.pi * 0.25 + _slat1 * 0.5))
+_sf = np.tan(np.pi * 0.25 + _slat1 * 0.5) ** _sn * np.cos(_slat1) / _sn
+_ro = _re * _sf / np.tan(np.pi * 0.25 + _olat * 0.5) ** _sn
+
+
+def latlon_to_grid(lat, lon):
+    """
+    위경도(스칼라/배열) → 기상청 격자 (nx, ny) int 배열.
+    배열 전체를 NumPy 한 번에 변환.
+    """
+    lat = np.asarray(lat, dtype=np.float64)
+    lon = np.asarray(lon, dtype=np.float64)
+    ra = _re * _sf / np.tan(np.pi * 0.25 + lat * (_DEGRAD * 0.5)) ** _sn
+    theta = lon * _DEGRAD - _olon
+    theta = (theta + np.pi) % (2 * np.pi) - np.pi
+    theta *= _sn
+    nx = np.floor(ra * np.sin(theta) + XO + 0.5).astype(np.int16)
+    ny = np.floor(_ro - ra * np.cos(theta) + YO + 0.5).astype(np.int16)
+    return nx, ny
+
+
+def grid_to_latlon(nx, ny):
+    """기상청 격자 (nx, ny) → 격자 중심 위경도 (latlon_to_grid의 역변환)"""
+    xn = np.asarray(nx, dtype=np.float64) - XO
+    yn = _ro - np.asarray(ny, dtype=np.float64) + YO
+    ra = np.hypot(xn, yn)
+    if _sn < 0:
+        ra = -ra
+    lat = 2.0 * np.arctan((_re * _sf / ra) ** (1.0 / _sn)) - np.pi * 0.5
+    theta = np.arctan2(xn, yn)
+    lon = theta / _sn + _olon
+    return lat / _DEGRAD, lon / _DEGRAD
+
+
+def validate_grid_table(cities=None):
+    """
+    data.py에 수기로 입력된 (nx, ny)를 좌표 변환값과 비교.
+    불일치 행만 DataFrame으로 반환 (빈 DataFrame이면 전부 일치).
+    """
+    rows = [(sido, gu, lat, lon, nx, ny)
+            for sido, gus in (cities or korean_cities).items()
+            for gu, (lat, lon, nx, ny, _) in gus.items()]
+    table = pd.DataFrame(rows, columns=['sido', 'gu', 'lat', 'lon', 'nx', 'ny'])
+    table['calc_nx'], table['calc_ny'] = latlon_to_grid(table['lat'].to_numpy(), table['lon'].to_numpy())
+    mismatch = (table['nx'] != table['calc_nx']) | (table['ny'] != table['calc_ny'])
+    return table[mismatch].reset_index(drop=True)
@@ -0,0 +1,208 @@
+"""
+격자별 시간 강수량 관측 이력 (append-only, 메모리 맵).
+
+rainfall.f32: (시간 × 격자) float32 행 우선 배열 → 1시간 추가는 연속된 행 1개 쓰기,
+시간 구간 조회는 복사 없는 slice. 결측은 NaN.
+격자 213개 기준 1년(8760시간) 약 7.5MB.
+여러 프로세스가 같은 디렉터리에 기록해도 되도록 기록은 .lock 파일 잠금(fcntl) 안에서
+다른 프로세스가 늘린 길이·파일 크기를 다시 읽은 뒤 수행.
+"""
+import json
+import os
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+
+try:
+    import fcntl  # 프로세스 간 파일 잠금 (POSIX)
+except ImportError:  # Windows: 프로세스 내 잠금만
+    fcntl = None
+
+from modules.api import get_grid_cells
+
+HISTORY_DIR = os.environ.get(
+    'FLOOD_RISK_HISTORY_DIR',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'history'))
+GROW_HOURS = 24 * 30  # 파일 확장 단위 (30일)
+WINDOWS = (3, 6, 24, 72)  # 누적 강수량 기본 구간 (시간)
+HOUR = np.timedelta64(1, 'h')
+
+
+def observation_hour(obs):
+    """관측 dict의 발표 시각 (정시, datetime64[h])"""
+    base = obs['base_date'] + obs['base_time'][:2]
+    return np.datetime64(f"{base[:4]}-{base[4:6]}-{base[6:8]}T{base[8:10]}", 'h')
+
+
+class ObservationHistory:
+    """
+    격자 × 시간 강수량 이력 저장소.
+    격자 목록과 시작 시각은 meta.json에 고정 (생성 후 새 격자는 기록하지 않음).
+    """
+
+    def __init__(self, path=HISTORY_DIR, cells=None):
+        self.path = path
+        self._meta_path = os.path.join(path, 'meta.json')
+        self._data_path = os.path.join(path, 'rainfall.f32')
+        self._lock_path = os.path.join(path, '.lock')
+        os.makedirs(path, exist_ok=True)
+        if os.path.exists(self._meta_path):
+            with open(self._meta_path, encoding='utf-8') as f:
+                meta = json.load(f)
+            self.cells = [tuple(cell) for cell in meta['cells']]
+            self.start = np.datetime64(meta['start'], 'h') if meta['start'] else None
+            self.length = meta['length']
+        else:
+            self.cells = list(cells if cells is not None else get_grid_cells())
+            self.start = None
+            self.length = 0
+        self._cell_index = {cell: i for i, cell in enumerate(self.cells)}
+        self._row_bytes = 4 * len(self.cells)
+        self._data = None
+        self._capacity = 0
+        self._lock = threading.Lock()
+        if os.path.exists(self._data_path) and os.path.getsize(self._data_path):
+            self._map(os.path.getsize(self._data_path) // self._row_bytes)
+
+    def _map(self, capacity):
+        self._data = np.memmap(self._data_path, dtype=np.float32, mode='r+', shape=(capacity, len(self.cells)))
+        self._capacity = capacity
+
+    @contextmanager
+    def _file_lock(self):
+        """다른 프로세스와 파일 확장·meta 기록 직렬화"""
+        if fcntl is None:
+            yield
+            return
+        with open(self._lock_path, 'a') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _reload(self):
+        """(파일 잠금 안에서) 다른 프로세스가 기록한 시작 시각·길이와 늘린 파일 크기 반영"""
+        if os.path.exists(self._meta_path):
+            with open(self._meta_path, encoding='utf-8') as f:
+                meta = json.load(f)
+            if meta['start']:
+                self.start = np.datetime64(meta['start'], 'h')
+            self.length = max(self.length, meta['length'])
+        if os.path.exists(self._data_path):
+            capacity = os.path.getsize(self._data_path) // self._row_bytes
+            if capacity > self._capacity:
+                self._map(capacity)
+
+    def _ensure_capacity(self, rows):
+        """rows행까지 쓸 수 있게 GROW_HOURS 단위로 파일 확장 (새 행은 NaN)"""
+        if rows <= self._capacity:
+            return
+        old = self._capacity
+        capacity = -(-rows // GROW_HOURS) * GROW_HOURS
+        with open(self._data_path, 'ab') as f:
+            f.truncate(capacity * self._row_bytes)
+        self._map(capacity)  # 이전 view는 같은 파일 페이지를 계속 가리킴
+        self._data[old:] = np.nan
+
+    def _save_meta(self):
+        tmp = self._meta_path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'start': str(self.start) if self.start is not None else None,
+                       'length': self.length, 'cells': self.cells}, f)
+        os.replace(tmp, self._meta_path)
+
+    def record(self, hour, rainfall):
+        """
+        hour 행에 {(nx, ny): 강수량} 기록 (같은 시각 재기록은 덮어씀). O(1), 기록하면 True.
+        시작 시각 이전은 append-only이므로 무시.
+        """
+        hour = np.datetime64(hour, 'h')
+        columns = [self._cell_index[cell] for cell in rainfall if cell in self._cell_index]
+        values = [value for cell, value in rainfall.items() if cell in self._cell_index]
+        with self._lock, self._file_lock():
+            self._reload()
+            if self.start is None:
+                self.start = hour
+            row = int((hour - self.start) // HOUR)
+            if row < 0:
+                return False
+            self._ensure_capacity(row + 1)
+            self._data[row, columns] = values
+            if row >= self.length:
+                self.length = row + 1
+                self._save_meta()
+        return True
+
+    def record_snapshot(self, snapshot):
+        """ObservationRefresher 스냅샷의 관측을 각자 발표 시각 행에 기록 (갱신 구독자용)"""
+        by_hour = {}
+        for cell, obs in snapshot.observations.items():
+            by_hour.setdefault(observation_hour(obs), {})[cell] = obs['rainfall']
+        for hour, rainfall in sorted(by_hour.items()):
+            self.record(hour, rainfall)
+
+    @property
+    def end(self):
+        """기록된 마지막 시각 (없으면 None)"""
+        return None if not self.length else self.start + (self.length - 1) * HOUR
+
+    def _row_range(self, start, end):
+        i0 = 0 if start is None else max(0, int((np.datetime64(start, 'h') - self.start) // HOUR))
+        i1 = self.length if end is None else min(self.length, int((np.datetime64(end, 'h') - self.start) // HOUR) + 1)
+        return i0, max(i0, i1)
+
+    def series(self, start=None, end=None):
+        """
+        [start, end] 구간 (격자 × 시간) 강수량 view와 시각 배열.
+        메모리 맵 slice의 전치라 복사 없음 (수정하지 말 것).
+        """
+        if not self.length:
+            return np.empty((len(self.cells), 0), dtype=np.float32), np.array([], dtype='datetime64[h]')
+        i0, i1 = self._row_range(start, end)
+        return self._data[i0:i1].T, self.start + np.arange(i0, i1) * HOUR
+
+    def rolling(self, window, start=None, end=None):
+        """
+        시간별 window시간 누적 강수량 (격자 × 시간), 결측은 0으로 간주.
+        구간 앞쪽 window-1시간도 이력이 있으면 포함해 계산.
+        """
+        if not self.length:
+            return np.empty((len(self.cells), 0), dtype=np.float32)
+        i0, i1 = self._row_range(start, end)
+        lead = min(i0, window - 1)
+        cumulative = np.zeros((i1 - i0 + lead + 1, len(self.cells)), dtype=np.float64)
+        np.cumsum(np.nan_to_num(self._data[i0 - lead:i1]), axis=0, out=cumulative[1:])
+        totals = cumulative[lead + 1:] - cumulative[np.maximum(np.arange(1, i1 - i0 + 1) + lead - window, 0)]
+        return totals.T.astype(np.float32)
+
+    def accumulations(self, end=None, windows=WINDOWS):
+        """end(기본 마지막 기록) 시각까지 {window: 격자별 누적 강수량}, 결측은 0으로 간주"""
+        if not self.length:
+            return {window: np.zeros(len(self.cells), dtype=np.float32) for window in windows}
+        _, i1 = self._row_range(None, end)
+        return {window: np.nansum(self._data[max(0, i1 - window):i1], axis=0, dtype=np.float64).astype(np.float32)
+                for window in windows}
+
+    def cell_accumulations(self, nx, ny, end=None, windows=WINDOWS):
+        """격자 1개의 {window: 누적 강수량}. 이력에 없는 격자면 None"""
+        column = self._cell_index.get((nx, ny))
+        if column is None or not self.length:
+            return None
+        _, i1 = self._row_range(None, end)
+        return {window: float(np.nansum(self._data[max(0, i1 - window):i1, column], dtype=np.float64))
+                for window in windows}
+
+    def cell_recent(self, nx, ny, hours=72, window=24):
+        """격자 1개의 최근 hours시간 (시각, 시간 강수량, window시간 누적). 이력이 없으면 None"""
+        column = self._cell_index.get((nx, ny))
+        if column is None or not self.length:
+            return None
+        start = self.end - (hours - 1) * HOUR
+        hourly, times = self.series(start)
+        return times, hourly[column], self.rolling(window, start)[column]
+
+    def flush(self):
+        if self._data is not None:
+            self._data.flush()
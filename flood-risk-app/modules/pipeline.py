@@ -0,0 +1,25 @@
+"""
+재실행 단계별 메모이제이션.
+
+Streamlit은 위젯 하나만 바뀌어도 스크립트 전체를 다시 실행하므로,
+각 단계는 입력 키가 지난 실행과 같으면 세션 상태에 보관한 결과를 그대로 씀.
+"""
+from modules.profiling import span
+
+STATE_KEY = '_pipeline_stages'
+
+
+def memo(state, stage, inputs, compute):
+    """
+    state(st.session_state 등 dict 유사 객체)에 stage별 (inputs, 결과) 1건 보관.
+    inputs가 같으면 compute 없이 이전 결과, 다르면 compute() 실행 후 교체 (소요 시간은 stage 히스토그램에 기록).
+    """
+    stages = state.setdefault(STATE_KEY, {})
+    cached = stages.get(stage)
+    if cached is not None and cached[0] == inputs:
+        return cached[1]
+    with span(stage):
+        value = compute()
+    stages[stage] = (inputs, value)
+    return value
+
@@ -0,0 +1,100 @@
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import threading
+import time
+from bisect import bisect_left
+
+# 단계별 소요 시간 히스토그램 버킷 (초, Prometheus le 경계)
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+LOG_SPANS = os.environ.get('FLOOD_RISK_SPAN_LOG') == '1'  # 단계별 구조화 로그 출력
+METRIC_NAME = 'flood_risk_stage_seconds'
+
+logger = logging.getLogger('flood_risk.timing')
+
+_histograms = {}  # stage -> [bucket counts..., +Inf count, sum]
+_lock = threading.Lock()
+
+
+def observe(stage, seconds):
+    """단계 소요 시간 1건 기록"""
+    idx = bisect_left(BUCKETS, seconds)
+    with _lock:
+        hist = _histograms.get(stage)
+        if hist is None:
+            hist = _histograms[stage] = [0] * (len(BUCKETS) + 1) + [0.0]
+        hist[idx] += 1
+        hist[-1] += seconds
+    if LOG_SPANS:
+        logger.info(json.dumps({'stage': stage, 'seconds': round(seconds, 6)}))
+
+
+class span:
+    """with span('weather_fetch'): ... 블록 소요 시간을 단계 히스토그램에 기록"""
+
+    __slots__ = ('stage', 'start')
+
+    def __init__(self, stage):
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        observe(self.stage, time.perf_counter() - self.start)
+        return False
+
+
+def get_histograms():
+    """{stage: {'buckets': {le: 누적 건수}, 'count': n, 'sum': 초}} 스냅샷"""
+    with _lock:
+        snapshot = {stage: list(hist) for stage, hist in _histograms.items()}
+    result = {}
+    for stage, hist in snapshot.items():
+        cumulative, buckets = 0, {}
+        for le, count in zip(BUCKETS + (float('inf'),), hist[:-1]):
+            cumulative += count
+            buckets[le] = cumulative
+        result[stage] = {'buckets': buckets, 'count': cumulative, 'sum': hist[-1]}
+    return result
+
+
+def prometheus_text():
+    """단계 히스토그램을 Prometheus text exposition 형식으로"""
+    lines = [f"# HELP {METRIC_NAME} 진단 파이프라인 단계별 소요 시간",
+             f"# TYPE {METRIC_NAME} histogram"]
+    for stage, hist in sorted(get_histograms().items()):
+        for le, count in hist['buckets'].items():
+            le_text = '+Inf' if le == float('inf') else repr(le)
+            lines.append(f'{METRIC_NAME}_bucket{{stage="{stage}",le="{le_text}"}} {count}')
+        lines.append(f'{METRIC_NAME}_sum{{stage="{stage}"}} {hist["sum"]:.6f}')
+        lines.append(f'{METRIC_NAME}_count{{stage="{stage}"}} {hist["count"]}')
+    return '\n'.join(lines) + '\n'
+
+
+def reset():
+    with _lock:
+        _histograms.clear()
+
+
+def start_profile(enabled=False):
+    """enabled일 때만 cProfile 시작 (비활성 시 None 반환, 오버헤드 없음)"""
+    if not enabled:
+        return None
+    profiler = cProfile.Profile()
+    profiler.enable()
+    return profiler
+
+
+def stop_profile(profiler, sort='cumulative', limit=30):
+    """start_profile 결과를 멈추고 상위 limit개 함수 통계 텍스트 반환"""
+    if profiler is None:
+        return None
+    profiler.disable()
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).sort_stats(sort).print_stats(limit)
+    return out.getvalue()
@@ -0,0 +1,258 @@
+"""
+전국 실시간 침수 위험 순위 (지역 + 선택적으로 건물 등 추가 지점).
+
+관측 갱신마다 강수량이 바뀐 격자의 항목만 재채점하고, 순위 키나 등급이 바뀐 항목만
+정렬 색인에서 빼고 병합 삽입 (전체 재정렬 없음). 색인은 전국 / 시·도별 / 위험 등급별 / 시·도×등급별로
+미리 유지해 필터·페이지 조회는 정렬된 배열 slice.
+점수는 위험도 타일·진단(앱, /score, 알림)과 같은 기준: 건물 고도 ELEVATION,
+지역 침수심은 앙상블 중앙값 (risk_table.flood_depth, base_depth보다 약 1m 깊음).
+"""
+import threading
+from collections import namedtuple
+from datetime import datetime
+from functools import lru_cache
+
+import numpy as np
+
+from modules.district_index import get_district_index
+from modules.risk_table import get_risk_table
+from modules.tiles import ELEVATION, risk_levels
+from modules.utils import calculate_risk_array
+
+CLASS_LABELS = ('관측 없음', '매우 낮음', '낮음', '보통', '높음', '매우 높음')  # tiles.risk_levels 등급 0..5
+CODE_BITS = 24  # 순위 키 하위 비트 = 항목 코드 (최대 약 1,670만 항목)
+MAX_ENTRIES = 1 << CODE_BITS
+SCORE_SCALE = 100  # 순위 비교 해상도 (점수 0.01 단위, 같으면 코드 순)
+SCORE_LIMIT = 10 ** 6
+_NAN_RANK = 2 * SCORE_LIMIT * SCORE_SCALE + 1  # 관측 없는 항목은 맨 뒤
+REBUILD_FRACTION = 0.25  # 갱신으로 움직인 항목이 이 비율을 넘으면 병합 대신 색인 전체 재구성 (정렬 1회가 더 빠름)
+
+# rank: 필터 안 순위, national_rank: 전국 순위
+Ranked = namedtuple('Ranked', ['rank', 'national_rank', 'sido', 'name', 'nx', 'ny', 'rainfall', 'risk_score',
+                               'risk_class'])
+
+
+def rank_keys(risk_score, codes):
+    """(점수 내림차순, 코드 오름차순) 정렬용 int64 키 (코드가 하위 비트라 항목마다 유일)"""
+    score = np.asarray(risk_score, dtype=np.float64)
+    quantized = np.rint(-np.clip(score, -SCORE_LIMIT, SCORE_LIMIT) * SCORE_SCALE) + SCORE_LIMIT * SCORE_SCALE
+    quantized = np.where(np.isnan(score), _NAN_RANK, quantized).astype(np.int64)
+    return (quantized << CODE_BITS) | np.asarray(codes, dtype=np.int64)
+
+
+class _SortedIndex:
+    """순위 키 오름차순 배열 (키에 코드가 들어 있어 코드 배열을 따로 두지 않음)"""
+
+    def __init__(self, keys=None):
+        self.keys = np.empty(0, dtype=np.int64) if keys is None else keys
+
+    def __len__(self):
+        return len(self.keys)
+
+    def remove(self, keys):
+        """키 m개 삭제: 이분 탐색 위치 삭제 O(n + m log n)"""
+        self.keys = np.delete(self.keys, np.searchsorted(self.keys, np.sort(keys)))
+
+    def insert(self, keys):
+        """키 m개 병합 삽입 O(n + m log m)"""
+        keys = np.sort(keys)
+        self.keys = np.insert(self.keys, np.searchsorted(self.keys, keys), keys)
+
+    def codes(self, start, stop):
+        return self.keys[start:stop] & (MAX_ENTRIES - 1)
+
+
+class RiskRanking:
+    """
+    항목(지역/지점)별 현재 위험 점수와 순위 색인.
+    지역은 생성 시 등록되고, add_entries로 건물 등 지점을 더 넣을 수 있음 (격자 강수량 공유).
+    """
+
+    def __init__(self, elevation=ELEVATION):
+        self.elevation = elevation
+        self.updated_at = None
+        self.base_time = None
+        self._lock = threading.Lock()
+        self._names = []
+        self._sido_names = []
+        self._sido_codes = {}
+        self._sido = np.empty(0, dtype=np.int16)
+        self._cells = np.empty(0, dtype=np.int64)  # 항목 → 격자 코드
+        self._elevation = np.empty(0, dtype=np.float32)
+        self._flood_depth = np.empty(0, dtype=np.float32)
+        self._score = np.empty(0, dtype=np.float32)
+        self._class = np.empty(0, dtype=np.uint8)
+        self._keys = np.empty(0, dtype=np.int64)
+        self._cell_codes = {}  # (nx, ny) -> 격자 코드
+        self._code_cells = []
+        self._cell_rain = np.empty(0)  # 격자 코드별 마지막 강수량 (미관측 NaN)
+        self._indexes = {}  # (시·도 코드 또는 None, 등급 또는 None) -> _SortedIndex
+
+        table = get_district_index().table
+        self.add_entries(table['gu'].astype(str).tolist(), table['sido'].astype(str).to_numpy(),
+                         table['nx'].to_numpy(), table['ny'].to_numpy(), np.full(len(table), elevation),
+                         get_risk_table().flood_depth)
+
+    def __len__(self):
+        return len(self._names)
+
+    def _code_of(self, mapping, names, key):
+        code = mapping.get(key)
+        if code is None:
+            code = mapping[key] = len(names)
+            names.append(key)
+        return code
+
+    def add_entries(self, names, sido, nx, ny, elevation, flood_depth):
+        """지점 일괄 등록 (열 배열, 길이 동일). 등록한 항목 코드 배열 반환, 강수량을 아는 격자면 바로 순위 반영"""
+        sido_values, sido_inverse = np.unique(np.asarray(sido, dtype=object).astype(str), return_inverse=True)
+        cell_values, cell_inverse = np.unique(np.stack([np.asarray(nx, dtype=np.int64), np.asarray(ny, dtype=np.int64)],
+                                                       axis=1), axis=0, return_inverse=True)
+        with self._lock:
+            start = len(self._names)
+            if start + len(names) > MAX_ENTRIES:
+                raise ValueError(f"순위 항목은 최대 {MAX_ENTRIES}개")
+            sido_codes = np.array([self._code_of(self._sido_codes, self._sido_names, s) for s in sido_values.tolist()],
+                                  dtype=np.int16)
+            cell_codes = np.array([self._code_of(self._cell_codes, self._code_cells, tuple(c))
+                                   for c in cell_values.tolist()], dtype=np.int64)
+            if len(self._cell_rain) < len(self._code_cells):
+                self._cell_rain = np.concatenate([self._cell_rain,
+                                                  np.full(len(self._code_cells) - len(self._cell_rain), np.nan)])
+
+            codes = np.arange(start, start + len(names))
+            self._names.extend(list(names))
+            self._sido = np.concatenate([self._sido, sido_codes[sido_inverse.reshape(-1)]])
+            self._cells = np.concatenate([self._cells, cell_codes[cell_inverse.reshape(-1)]])
+            self._elevation = np.concatenate([self._elevation, np.asarray(elevation, dtype=np.float32)])
+            self._flood_depth = np.concatenate([self._flood_depth, np.asarray(flood_depth, dtype=np.float32)])
+            self._score = np.concatenate([self._score, np.full(len(codes), np.nan, dtype=np.float32)])
+            self._class = np.concatenate([self._class, np.zeros(len(codes), dtype=np.uint8)])
+            self._keys = np.concatenate([self._keys, np.zeros(len(codes), dtype=np.int64)])
+            self._order = np.argsort(self._cells, kind='stable')  # 격자 코드 순 항목 (격자별 연속 구간)
+            self._offsets = np.searchsorted(self._cells[self._order], np.arange(len(self._code_cells) + 1))
+            self._rescore(codes)
+            self._insert(codes)
+        return codes
+
+    def _rescore(self, codes):
+        self._score[codes], _ = calculate_risk_array(self._cell_rain[self._cells[codes]], self._elevation[codes],
+                                                     self._flood_depth[codes], dtype=np.float32)
+        self._class[codes] = risk_levels(self._score[codes])
+        self._keys[codes] = rank_keys(self._score[codes], codes)
+
+    def _index_groups(self, sido, risk_class):
+        """항목들이 속한 색인 (키, 항목 mask): 전국, 시·도, 등급, 시·도×등급"""
+        groups = [((None, None), slice(None))]
+        for s in np.unique(sido).tolist():
+            groups.append(((s, None), sido == s))
+        for c in np.unique(risk_class).tolist():
+            groups.append(((None, c), risk_class == c))
+        pairs = sido.astype(np.int64) * len(CLASS_LABELS) + risk_class
+        for pair in np.unique(pairs).tolist():
+            groups.append((divmod(pair, len(CLASS_LABELS)), pairs == pair))
+        return groups
+
+    def _remove(self, codes, keys, risk_class):
+        """항목들을 (갱신 전) 키·등급 기준 색인에서 삭제"""
+        for group, mask in self._index_groups(self._sido[codes], risk_class):
+            self._indexes[group].remove(keys[mask])
+
+    def _insert(self, codes):
+        for group, mask in self._index_groups(self._sido[codes], self._class[codes]):
+            self._indexes.setdefault(group, _SortedIndex()).insert(self._keys[codes[mask]])
+
+    def _rebuild(self):
+        """전 항목 색인 재구성: 전국 키 정렬 1회 + 그룹별 stable 분할 (그룹 안 순서 유지)"""
+        keys = np.sort(self._keys)
+        codes = keys & (MAX_ENTRIES - 1)
+        sido, risk_class = self._sido[codes].astype(np.int64), self._class[codes].astype(np.int64)
+        indexes = {(None, None): _SortedIndex(keys)}
+        n_classes = len(CLASS_LABELS)
+        for kind, groups in (('sido', sido), ('class', risk_class), ('pair', sido * n_classes + risk_class)):
+            order = np.argsort(groups, kind='stable')
+            values, starts = np.unique(groups[order], return_index=True)
+            for value, chunk in zip(values.tolist(), np.split(keys[order], starts[1:])):
+                group = (value, None) if kind == 'sido' else (None, value) if kind == 'class' else divmod(value, n_classes)
+                indexes[group] = _SortedIndex(chunk)
+        self._indexes = indexes
+
+    def _rows_of(self, cell_codes):
+        """격자 코드들의 항목 코드 (격자 코드 순 정렬의 연속 구간 이어 붙이기)"""
+        starts, ends = self._offsets[cell_codes], self._offsets[cell_codes + 1]
+        lengths = ends - starts
+        if not lengths.sum():
+            return np.empty(0, dtype=np.int64)
+        shift = np.repeat(starts - np.concatenate(([0], np.cumsum(lengths)[:-1])), lengths)
+        return self._order[np.arange(lengths.sum()) + shift]
+
+    def update(self, rainfall, base_time=None):
+        """
+        {(nx, ny): 강수량}으로 갱신. 강수량이 바뀐 격자의 항목만 재채점하고
+        순위 키·등급이 바뀐 항목만 색인에서 이동. 이동한 항목 수 반환.
+        """
+        with self._lock:
+            cells = [cell for cell in rainfall if cell in self._cell_codes]
+            cell_codes = np.array([self._cell_codes[cell] for cell in cells], dtype=np.int64)
+            values = np.array([rainfall[cell] for cell in cells], dtype=np.float64)
+            changed = cell_codes[values != self._cell_rain[cell_codes]]
+            self._cell_rain[cell_codes] = values
+
+            codes = self._rows_of(changed)
+            old_keys, old_class = self._keys[codes], self._class[codes]
+            self._rescore(codes)
+            moved = (self._keys[codes] != old_keys) | (self._class[codes] != old_class)
+            if moved.sum() > len(self._keys) * REBUILD_FRACTION:
+                self._rebuild()
+            elif moved.any():
+                self._remove(codes[moved], old_keys[moved], old_class[moved])
+                self._insert(codes[moved])
+            self.updated_at = datetime.now()
+            self.base_time = base_time or self.base_time
+            return int(moved.sum())
+
+    def on_snapshot(self, snapshot):
+        """ObservationRefresher 구독자용: 스냅샷 강수량으로 update"""
+        rainfall = {cell: obs['rainfall'] for cell, obs in snapshot.observations.items()}
+        return self.update(rainfall, snapshot.base_time)
+
+    def page(self, offset=0, limit=50, sido=None, risk_class=None):
+        """
+        (필터 항목 수, Ranked 목록). sido: 시·도 이름, risk_class: 등급 0..5 (CLASS_LABELS 순).
+        미리 정렬된 색인의 slice라 전체 항목 수와 무관하게 limit개만 읽음.
+        """
+        with self._lock:
+            sido_code = None if sido is None else self._sido_codes.get(sido, -1)
+            index = self._indexes.get((sido_code, None if risk_class is None else int(risk_class)))
+            if index is None:
+                return 0, []
+            codes = index.codes(offset, offset + limit)
+            national = np.searchsorted(self._indexes[(None, None)].keys, self._keys[codes]) + 1
+            rows = []
+            for rank, code, national_rank in zip(range(offset + 1, offset + len(codes) + 1), codes.tolist(),
+                                                 national.tolist()):
+                nx, ny = self._code_cells[self._cells[code]]
+                score = float(self._score[code])
+                rows.append(Ranked(rank, national_rank, self._sido_names[self._sido[code]], self._names[code], nx, ny,
+                                   float(self._cell_rain[self._cells[code]]), round(score, 2),
+                                   int(self._class[code])))
+            return len(index), rows
+
+    def top(self, k=10):
+        return self.page(0, k)[1]
+
+    def class_counts(self, sido=None):
+        """등급별 항목 수 (CLASS_LABELS 순)"""
+        with self._lock:
+            sido_code = None if sido is None else self._sido_codes.get(sido, -1)
+            return [len(self._indexes.get((sido_code, c), ())) for c in range(len(CLASS_LABELS))]
+
+    def sidos(self):
+        """등록된 시·도 이름 (등록 순)"""
+        return list(self._sido_names)
+
+
+@lru_cache(maxsize=1)
+def get_ranking():
+    """프로세스 공용 전국 순위 (관측 갱신기 구독으로 갱신)"""
+    return RiskRanking()
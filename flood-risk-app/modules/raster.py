@@ -0,0 +1,213 @@
+"""
+수치표고(DEM)·침수심 래스터 조회 (타일 단위 메모리 맵).
+
+래스터 1개 = 디렉터리 1개: meta.json (위경도 격자 범위·해상도·타일 크기) + {타일행}_{타일열}.npy.
+조회 시 좌표 배열을 타일별로 묶어 필요한 타일만 np.load(mmap_mode='r')로 열고 (최근 TILE_CACHE_SIZE개 유지)
+해당 픽셀만 인덱싱 → 전국 래스터를 메모리에 올리지 않고 OS 페이지 캐시만 사용.
+값이 없는 타일(바다 등)은 파일을 만들지 않으며 조회 결과는 NaN.
+
+GeoTIFF는 import_geotiff로 같은 타일 구조로 변환해 사용 (rasterio 필요, EPSG:4326만).
+"""
+import json
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
+import numpy as np
+
+RASTER_DIR = os.environ.get(
+    'FLOOD_RISK_RASTER_DIR',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'rasters'))
+LAYERS = ('dem', 'flood_depth')  # RASTER_DIR 아래 디렉터리 이름
+TILE_SIZE = 1024  # 픽셀, float32 타일 1개 4MB
+TILE_CACHE_SIZE = 64  # 열어 둔 타일 메모리 맵 수 (주소 공간만 차지, 실제 메모리는 읽은 페이지만)
+DEFAULT_ELEVATION = 10.0  # m, DEM·입력 모두 없을 때 (앱 슬라이더 기본값)
+
+
+class RasterLayer:
+    """
+    타일 디렉터리 래스터 1개. 픽셀 (row, col)은 북서 모서리 (west, north)에서
+    남쪽으로 pixel_lat, 동쪽으로 pixel_lon 도 간격 (위경도 정방 격자).
+    """
+
+    def __init__(self, path, max_tiles=TILE_CACHE_SIZE):
+        self.path = path
+        with open(os.path.join(path, 'meta.json'), encoding='utf-8') as f:
+            meta = json.load(f)
+        self.west, self.north = float(meta['west']), float(meta['north'])
+        self.pixel_lon, self.pixel_lat = float(meta['pixel_lon']), float(meta['pixel_lat'])
+        self.rows, self.cols = int(meta['rows']), int(meta['cols'])
+        self.tile_size = int(meta['tile_size'])
+        self.nodata = meta.get('nodata')
+        self.tile_cols = -(-self.cols // self.tile_size)
+        self.max_tiles = max_tiles
+        self._tiles = OrderedDict()  # 타일 번호 -> ndarray(memmap view) 또는 None(빈 타일)
+        self._lock = threading.Lock()
+        self._stats = {'tile_hits': 0, 'tile_opens': 0}
+
+    @classmethod
+    def open(cls, path, max_tiles=TILE_CACHE_SIZE):
+        """meta.json이 있으면 RasterLayer, 없으면 None"""
+        if not os.path.exists(os.path.join(path, 'meta.json')):
+            return None
+        return cls(path, max_tiles)
+
+    @property
+    def bounds(self):
+        """(west, south, east, north)"""
+        return (self.west, self.north - self.rows * self.pixel_lat,
+                self.west + self.cols * self.pixel_lon, self.north)
+
+    def _tile(self, tile):
+        with self._lock:
+            if tile in self._tiles:
+                self._tiles.move_to_end(tile)
+                self._stats['tile_hits'] += 1
+                return self._tiles[tile]
+        file = os.path.join(self.path, '%d_%d.npy' % divmod(tile, self.tile_cols))
+        data = np.asarray(np.load(file, mmap_mode='r')) if os.path.exists(file) else None
+        with self._lock:
+            self._stats['tile_opens'] += 1
+            self._tiles[tile] = data
+            while len(self._tiles) > self.max_tiles:
+                self._tiles.popitem(last=False)
+        return data
+
+    def sample(self, lat, lon):
+        """
+        좌표 배열의 픽셀 값 (최근접 픽셀, float32). 범위 밖·빈 타일·nodata는 NaN.
+        좌표는 타일 번호로 정렬해 타일마다 한 번만 열고 모아서 인덱싱.
+        """
+        lat, lon = np.broadcast_arrays(np.asarray(lat, dtype=np.float64), np.asarray(lon, dtype=np.float64))
+        out = np.full(lat.shape, np.nan, dtype=np.float32)
+        row = np.floor((self.north - lat.ravel()) / self.pixel_lat)
+        col = np.floor((lon.ravel() - self.west) / self.pixel_lon)
+        points = np.flatnonzero((row >= 0) & (row < self.rows) & (col >= 0) & (col < self.cols))
+        if not len(points):
+            return out
+        row, col = row[points].astype(np.int64), col[points].astype(np.int64)
+        tiles = (row // self.tile_size) * self.tile_cols + col // self.tile_size
+
+        if tiles.min() == tiles.max():  # 한 타일 안 (도시 단위 조회 등): 정렬 생략
+            groups = [(int(tiles[0]), slice(None))]
+        else:
+            order = np.argsort(tiles, kind='stable')
+            starts = np.flatnonzero(np.diff(tiles[order])) + 1
+            groups = [(int(tiles[chunk[0]]), chunk) for chunk in np.split(order, starts)]
+
+        flat = out.reshape(-1)
+        for tile, chunk in groups:
+            data = self._tile(tile)
+            if data is None:
+                continue
+            tile_row, tile_col = divmod(tile, self.tile_cols)
+            values = data[row[chunk] - tile_row * self.tile_size, col[chunk] - tile_col * self.tile_size]
+            flat[points[chunk]] = values
+        if self.nodata is not None:
+            out[out == np.float32(self.nodata)] = np.nan
+        return out
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, open_tiles=len(self._tiles))
+
+
+def _write_layer(path, read_window, rows, cols, west, north, pixel_lon, pixel_lat, nodata=None,
+                 tile_size=TILE_SIZE, dtype=np.float32):
+    """
+    read_window(row, col, height, width) → 2차원 배열을 타일로 나눠 저장 (전부 nodata/NaN인 타일은 생략).
+    같은 상위 디렉터리의 임시 디렉터리에 다 쓴 뒤 기존 디렉터리와 통째로 교체
+    (다시 변환해도 새 래스터에서 비어 있는 자리에 이전 타일이 남지 않음).
+    """
+    parent = os.path.dirname(os.path.abspath(path))
+    os.makedirs(parent, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=f'.{os.path.basename(path)}-', dir=parent)
+    try:
+        os.chmod(staging, 0o755)  # mkdtemp 기본 0700 → 다른 사용자로 실행하는 앱도 읽을 수 있게
+        for row in range(0, rows, tile_size):
+            for col in range(0, cols, tile_size):
+                data = np.asarray(read_window(row, col, min(tile_size, rows - row), min(tile_size, cols - col)),
+                                  dtype=dtype)
+                empty = np.isnan(data) if np.issubdtype(data.dtype, np.floating) else np.zeros(data.shape, bool)
+                if nodata is not None:
+                    empty |= data == nodata
+                if empty.all():
+                    continue
+                np.save(os.path.join(staging, f'{row // tile_size}_{col // tile_size}.npy'), data)
+        meta = {'west': west, 'north': north, 'pixel_lon': pixel_lon, 'pixel_lat': pixel_lat, 'rows': rows,
+                'cols': cols, 'tile_size': tile_size, 'nodata': nodata, 'dtype': np.dtype(dtype).name}
+        with open(os.path.join(staging, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    if os.path.exists(path):
+        retired = staging + '.old'
+        os.rename(path, retired)
+        os.rename(staging, path)
+        shutil.rmtree(retired, ignore_errors=True)  # 이미 열린 메모리 맵은 삭제 후에도 유효
+    else:
+        os.rename(staging, path)
+
+
+def write_tiles(array, path, west, north, pixel_lon, pixel_lat, nodata=None, tile_size=TILE_SIZE):
+    """2차원 배열(np.load(mmap_mode='r')로 연 .npy 가능) → 타일 디렉터리"""
+    rows, cols = array.shape
+    _write_layer(path, lambda r, c, h, w: array[r:r + h, c:c + w], rows, cols, west, north, pixel_lon, pixel_lat,
+                 nodata, tile_size)
+
+
+def import_geotiff(src, path, tile_size=TILE_SIZE):
+    """
+    GeoTIFF 1밴드 → 타일 디렉터리. 타일 크기 창 단위로 읽어 원본 전체를 메모리에 올리지 않음.
+    위경도(EPSG:4326) 북쪽 위 격자만 지원 (투영 좌표계는 gdalwarp -t_srs EPSG:4326 등으로 변환 후).
+    """
+    try:
+        import rasterio
+        from rasterio.windows import Window
+    except ImportError:
+        raise ImportError("GeoTIFF 변환에는 rasterio가 필요합니다 (pip install rasterio).")
+    with rasterio.open(src) as dataset:
+        if dataset.crs is not None and dataset.crs.to_epsg() != 4326:
+            raise ValueError(f"EPSG:4326 래스터만 지원 (입력: {dataset.crs})")
+        transform = dataset.transform
+        if transform.b or transform.d or transform.e >= 0:
+            raise ValueError("회전되었거나 남쪽이 위인 래스터는 지원하지 않음")
+        _write_layer(path, lambda r, c, h, w: dataset.read(1, window=Window(c, r, w, h)),
+                     dataset.height, dataset.width, transform.c, transform.f, transform.a, -transform.e,
+                     dataset.nodata, tile_size)
+
+
+class Terrain:
+    """DEM(고도 m)과 침수심(m) 래스터 묶음. 없는 층은 None이고 조회 결과는 NaN"""
+
+    def __init__(self, path=RASTER_DIR):
+        self.path = path
+        self.elevation = RasterLayer.open(os.path.join(path, 'dem'))
+        self.flood_depth = RasterLayer.open(os.path.join(path, 'flood_depth'))
+
+    def __bool__(self):
+        return self.elevation is not None or self.flood_depth is not None
+
+    def sample(self, lat, lon):
+        """좌표 배열 → (고도, 침수심) float32 배열 (값 없음 NaN)"""
+        shape = np.broadcast(np.asarray(lat), np.asarray(lon)).shape
+        missing = np.full(shape, np.nan, dtype=np.float32)
+        return tuple(layer.sample(lat, lon) if layer is not None else missing.copy()
+                     for layer in (self.elevation, self.flood_depth))
+
+    def elevation_at(self, lat, lon, default=None):
+        """지점 1곳 DEM 고도 (소수 첫째 자리), 없으면 default"""
+        if self.elevation is None:
+            return default
+        value = float(self.elevation.sample(lat, lon))
+        return default if np.isnan(value) else round(value, 1)
+
+
+@lru_cache(maxsize=1)
+def get_terrain():
+    """RASTER_DIR 래스터 (프로세스당 1회 열기, 타일은 조회 시점에)"""
+    return Terrain()
@@ -0,0 +1,163 @@
+"""
+지점별 침수 위험 진단 리포트 (A4 1장, PDF/PNG).
+
+matplotlib figure 생성·축 배치·표·정적 곡선은 ReportTemplate 생성 시 1회만 만들고,
+리포트마다 텍스트·선 위치·판정 경계 면·지도 범위만 바꿔 savefig.
+배치 생성 시 프로세스마다 템플릿 1개를 재사용하므로 리포트 수와 무관하게 메모리 일정.
+"""
+import io
+from datetime import datetime
+
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+from matplotlib import font_manager
+
+from modules.district_index import get_district_index
+from modules.fonts import setup_fonts
+from modules.risk_table import get_risk_table
+from modules.utils import RISK_THRESHOLD, calculate_risk, get_recommendations
+
+A4_INCHES = (8.27, 11.69)
+REPORT_DPI = 100  # PNG 출력 해상도 (PDF는 벡터)
+MAP_SPAN_DEG = 1.2  # 지도 스냅샷 위경도 반경
+RISK_COLORS = {0: '#2b8cbe', 1: '#d7301f'}
+TABLE_HIGHLIGHT = '#fee0d2'
+
+
+def release_font_cache():
+    """
+    matplotlib 폰트 객체 캐시 비우기. PDF 저장마다 캐시된 폰트에 글리프가 누적되어
+    비우지 않으면 리포트 100건당 약 30MB씩 증가 (다음 사용 시 폰트 파일만 다시 읽음).
+    """
+    cache_clear = getattr(getattr(font_manager, '_get_font', None), 'cache_clear', None)
+    if cache_clear is not None:
+        cache_clear()
+
+
+class ReportTemplate:
+    """
+    리포트 figure 1개를 재사용하는 렌더러 (스레드 안전하지 않음: 프로세스/스레드당 1개).
+    render(...)는 지점 1곳의 리포트 bytes 반환.
+    """
+
+    def __init__(self):
+        setup_fonts()
+        self.index = get_district_index()
+        self.table = get_risk_table()
+        self.fig = plt.figure(figsize=A4_INCHES)
+        grid = self.fig.add_gridspec(4, 2, height_ratios=[0.6, 0.8, 1.6, 1.6], hspace=0.45, wspace=0.3,
+                                     left=0.08, right=0.95, top=0.93, bottom=0.05)
+
+        self.title = self.fig.text(0.5, 0.97, '', ha='center', va='top', fontsize=16)
+        self.subtitle = self.fig.text(0.5, 0.945, '', ha='center', va='top', fontsize=9, color='dimgray')
+
+        # 진단 요약
+        summary_ax = self.fig.add_subplot(grid[0, :])
+        summary_ax.axis('off')
+        self.verdict = summary_ax.text(0.0, 0.85, '', fontsize=15, va='top')
+        self.metrics = summary_ax.text(0.0, 0.4, '', fontsize=10, va='top', linespacing=1.6)
+
+        # 추천 설치 옵션 (행 강조만 리포트마다 변경)
+        table_ax = self.fig.add_subplot(grid[1, :])
+        table_ax.axis('off')
+        table_ax.set_title('추천 설치 옵션', loc='left', fontsize=11)
+        recommendations = get_recommendations()
+        self.recommendations = table_ax.table(cellText=recommendations.values.tolist(),
+                                              colLabels=[c.replace('㎡', 'm²') for c in recommendations.columns],
+                                              loc='center', cellLoc='center')
+        self.recommendations.auto_set_font_size(False)
+        self.recommendations.set_fontsize(9)
+        self.recommendations.scale(1, 1.4)
+        self._levels = recommendations['위험 수준'].tolist()
+        self._columns = len(recommendations.columns)
+
+        # 강수량 vs 침수 확률 (visualization.create_rainfall_chart와 같은 곡선)
+        rain_ax = self.fig.add_subplot(grid[2, 0])
+        x = np.linspace(0, 500, 100)
+        rain_ax.plot(x, (1 - np.exp(-x / 200)) * 100, color='red', linewidth=2)
+        self.rain_line = rain_ax.axvline(0, color='orange', linestyle='--')
+        rain_ax.set_xlabel('강수량 (mm)')
+        rain_ax.set_ylabel('침수 확률 (%)')
+        rain_ax.set_title('강수량 vs 침수 확률', fontsize=11)
+        rain_ax.grid(True, alpha=0.3)
+
+        # 지역 판정 경계 (조회표 고위험 확률 면 + 침수심 중앙값 경계 + 지점 위치)
+        sim_ax = self.fig.add_subplot(grid[2, 1])
+        self.surface = sim_ax.pcolormesh(self.table.rainfall_axis, self.table.elevation_axis,
+                                         self.table.surface(0).T, cmap='coolwarm', vmin=0, vmax=100,
+                                         shading='nearest', rasterized=True)  # PDF에 사각형 1.5만 개 대신 이미지 1장
+        self.fig.colorbar(self.surface, ax=sim_ax, label='고위험 확률 (%)')
+        self.boundary, = sim_ax.plot(self.table.boundary[0], self.table.elevation_axis, color='black', linewidth=2)
+        self.site_point, = sim_ax.plot([], [], marker='*', color='yellow', markeredgecolor='black', markersize=14)
+        sim_ax.set_xlabel('강수량 (mm)')
+        sim_ax.set_ylabel('고도 (m)')
+        sim_ax.set_title('지역 판정 경계 (강수량 × 고도)', fontsize=11)
+        self.sim_ax = sim_ax
+
+        # 지도 스냅샷: 전국 지역 중심 (기본 침수심 색) + 지점 위치, 범위만 지점 중심으로 이동
+        map_ax = self.fig.add_subplot(grid[3, :])
+        districts = self.index.table
+        points = map_ax.scatter(districts['lon'], districts['lat'], c=districts['base_depth'], cmap='YlOrRd',
+                                s=40, edgecolors='gray', linewidths=0.5)
+        self.fig.colorbar(points, ax=map_ax, label='기본 침수심 (m)')
+        self.site_marker, = map_ax.plot([], [], marker='*', color='red', markeredgecolor='black', markersize=18)
+        self.site_label = map_ax.text(0, 0, '', fontsize=9, ha='left', va='bottom')
+        map_ax.set_xlabel('경도')
+        map_ax.set_ylabel('위도')
+        map_ax.set_title('위치 (구 중심 기본 침수심)', fontsize=11)
+        map_ax.grid(True, alpha=0.3)
+        self.map_ax = map_ax
+
+    def _highlight(self, level):
+        for row, name in enumerate(self._levels, start=1):
+            for col in range(self._columns):
+                self.recommendations[row, col].set_facecolor(TABLE_HIGHLIGHT if name == level else 'white')
+
+    def render(self, site_id, lat, lon, elevation, rainfall, code=None, fmt='pdf', base_time=None, flood_depth=None):
+        """
+        지점 1곳 리포트 bytes. code가 없으면 위경도 최근접 지역.
+        침수심은 flood_depth(지점 값, 배치 CLI는 score_portfolio와 같은 래스터 조회)가 없으면
+        앱과 같은 앙상블 중앙값. 고위험 확률은 조회표.
+        """
+        if code is None:
+            code, _ = self.index.nearest(lat, lon)
+        code = int(code)
+        district = self.index.table.iloc[code]
+        if flood_depth is None:
+            flood_depth, depth_source = float(self.table.flood_depth[code]), '앙상블 중앙값'
+        else:
+            flood_depth, depth_source = float(flood_depth), '지점 침수심'
+        risk_score, predicted_risk = calculate_risk(rainfall, elevation, flood_depth)
+        exceedance = self.table.lookup(rainfall, elevation, code)
+
+        self.title.set_text(f"침수 위험 진단 리포트 – {site_id}")
+        self.subtitle.set_text(
+            f"{district['sido']} {district['gu']} (격자 nx={district['nx']}, ny={district['ny']}) · "
+            f"위도 {lat:.4f}, 경도 {lon:.4f} · 기준 {base_time or datetime.now().strftime('%Y-%m-%d %H:%M')}")
+        self.verdict.set_text("고위험: 강화형 차수판 설치 추천" if predicted_risk else "저위험: 기본형으로 충분")
+        self.verdict.set_color(RISK_COLORS[predicted_risk])
+        self.metrics.set_text(
+            f"위험 점수 {risk_score:.2f} (고위험 기준 {RISK_THRESHOLD} 초과)   ·   고위험 확률 {exceedance:.0%}\n"
+            f"강수량 {rainfall}mm   ·   건물 고도 {elevation}m   ·   예상 침수심 {flood_depth:.1f}m ({depth_source})")
+        self._highlight('고위험' if predicted_risk else '저위험')
+
+        self.rain_line.set_xdata([rainfall, rainfall])
+        self.surface.set_array(self.table.surface(code).T)
+        self.boundary.set_xdata(self.table.boundary[code])
+        self.site_point.set_data([rainfall], [elevation])
+        self.sim_ax.set_xlim(0, min(max(float(rainfall) * 1.3, 100.0), float(self.table.rainfall_axis[-1])))
+
+        self.site_marker.set_data([lon], [lat])
+        self.site_label.set_position((lon + 0.05, lat + 0.05))
+        self.site_label.set_text(str(site_id))
+        self.map_ax.set_xlim(lon - MAP_SPAN_DEG * 1.5, lon + MAP_SPAN_DEG * 1.5)
+        self.map_ax.set_ylim(lat - MAP_SPAN_DEG, lat + MAP_SPAN_DEG)
+
+        buf = io.BytesIO()
+        self.fig.savefig(buf, format=fmt, dpi=REPORT_DPI)
+        return buf.getvalue()
+
+    def close(self):
+        plt.close(self.fig)
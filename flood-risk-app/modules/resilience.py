@@ -0,0 +1,83 @@
+import threading
+import time
+
+
+class CircuitBreaker:
+    """
+    연속 실패가 failure_threshold회 이상이면 reset_timeout초 동안 차단(open).
+    이후 1건만 시험 호출(half-open)해 성공하면 복구(closed).
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._opened_at is None:
+                return 'closed'
+            if self._clock() - self._opened_at >= self.reset_timeout:
+                return 'half-open'
+            return 'open'
+
+    def allow(self):
+        """호출 허용 여부 (half-open에서는 시험 호출 1건만 허용)"""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._clock() - self._opened_at < self.reset_timeout or self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def release(self):
+        """호출을 보내지 않고 끝남 (half-open 시험 호출 권한만 반납, 실패 횟수 변화 없음)"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_flight or self._failures >= self.failure_threshold:
+                self._opened_at = self._clock()
+            self._trial_in_flight = False
+
+
+class RetryBudget:
+    """
+    재시도를 전체 요청의 ratio 비율 이내로 제한 (요청마다 ratio 적립, 재시도마다 1 차감).
+    장애 시 재시도 폭주로 상류 부하를 키우지 않기 위함.
+    """
+
+    def __init__(self, ratio=0.1, initial=3.0, max_tokens=10.0):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self._tokens = initial
+        self._lock = threading.Lock()
+
+    @property
+    def tokens(self):
+        return self._tokens
+
+    def record_request(self):
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def try_retry(self):
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
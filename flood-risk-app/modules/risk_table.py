@@ -0,0 +1,88 @@
+"""
+지역 × 강수량 × 고도 위험 조회표.
+
+앱 슬라이더 범위(강수량 1mm, 고도 1m 단위)의 고위험 확률을 시작 시 1회 계산해
+uint8 백분율로 보관 (지역 241개 기준 약 3.7MB) → what-if 조회는 배열 인덱싱.
+고위험 판정 경계(침수심 중앙값 기준 임계 강수량)는 고도별 float32로 보관.
+"""
+from functools import lru_cache
+
+import numpy as np
+
+from modules.ensemble import get_depth_ensemble
+from modules.utils import RISK_THRESHOLD
+
+RAINFALL_AXIS = np.arange(0, 301, dtype=np.float32)  # mm (슬라이더 50–200 + 누적 강수량 여유)
+ELEVATION_AXIS = np.arange(0, 51, dtype=np.float32)  # m (고도 슬라이더 0–50)
+
+
+def depth_threshold(rainfall, elevation):
+    """calculate_risk가 고위험이 되는 최소 침수심 (이보다 깊으면 점수 > RISK_THRESHOLD)"""
+    return (RISK_THRESHOLD - rainfall / (elevation + 1) * 10) / 20
+
+
+def rainfall_threshold(flood_depth, elevation):
+    """calculate_risk가 고위험이 되는 최소 강수량 (이보다 많으면 점수 > RISK_THRESHOLD)"""
+    return np.maximum((RISK_THRESHOLD - np.asarray(flood_depth) * 20) * (np.asarray(elevation) + 1) / 10, 0)
+
+
+def _percent(count, n_samples):
+    """고위험 표본 수 → 백분율 (0.5%는 올림, 표와 직접 계산 경로가 같은 값을 내도록 정수 연산)"""
+    return (np.asarray(count, dtype=np.int64) * 200 + n_samples) // (2 * n_samples)
+
+
+class RiskTable:
+    """
+    exceedance: (지역 수, 강수량 축, 고도 축) uint8, 앙상블 고위험 확률(%) 반올림.
+    boundary: (지역 수, 고도 축) float32, 침수심 중앙값(flood_depth, 소수 첫째 자리)에서의 임계 강수량.
+    축 밖이거나 정수 격자가 아닌 값은 앙상블에서 직접 계산.
+    """
+
+    def __init__(self, ensemble=None, rainfall_axis=RAINFALL_AXIS, elevation_axis=ELEVATION_AXIS):
+        self.ensemble = ensemble or get_depth_ensemble()
+        self.rainfall_axis = rainfall_axis
+        self.elevation_axis = elevation_axis
+
+        # 고위험 ⇔ 침수심 > 임계 침수심: 정렬된 앙상블에서 이분 탐색 (표본별 점수 계산 없음)
+        thresholds = depth_threshold(rainfall_axis[:, None].astype(np.float64), elevation_axis[None, :])
+        n_samples = self.ensemble.samples.shape[1]
+        self.exceedance = np.empty((len(self.ensemble.samples), len(rainfall_axis), len(elevation_axis)),
+                                   dtype=np.uint8)
+        for code, samples in enumerate(self.ensemble.samples):
+            below = np.searchsorted(np.sort(samples), thresholds, side='right')
+            self.exceedance[code] = _percent(n_samples - below, n_samples)
+
+        self.flood_depth = np.round(self.ensemble.depth_percentiles[:, 0].astype(np.float64), 1)  # 앱 표시값과 동일
+        self.boundary = rainfall_threshold(self.flood_depth[:, None], elevation_axis[None, :]).astype(np.float32)
+
+    def _index(self, value, axis):
+        """정수 격자 위의 값이면 축 인덱스, 아니면 None"""
+        i = int(round(float(value) - float(axis[0])))
+        if 0 <= i < len(axis) and axis[i] == value:
+            return i
+        return None
+
+    def lookup(self, rainfall, elevation, codes=None):
+        """
+        지역별 고위험 확률 (0–1, 1% 단위). DepthEnsemble.exceedance와 같은 인자,
+        codes가 스칼라면 float 반환.
+        """
+        i, j = self._index(rainfall, self.rainfall_axis), self._index(elevation, self.elevation_axis)
+        if i is None or j is None:
+            n_samples = self.ensemble.samples.shape[1]
+            count = np.rint(np.asarray(self.ensemble.exceedance(rainfall, elevation, codes)) * n_samples)
+            probability = _percent(count, n_samples) / 100
+        else:
+            table = self.exceedance if codes is None else self.exceedance[np.asarray(codes)]
+            probability = table[..., i, j] / 100
+        return float(probability) if np.ndim(probability) == 0 else probability
+
+    def surface(self, code):
+        """지역 1개의 (강수량 축 × 고도 축) 고위험 확률(%) view"""
+        return self.exceedance[code]
+
+
+@lru_cache(maxsize=1)
+def get_risk_table():
+    """기본 지역 앙상블의 조회표 (프로세스당 1회 생성)"""
+    return RiskTable()
@@ -0,0 +1,177 @@
+import logging
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from modules.api import get_observation, get_base_datetime, next_release, get_grid_cells, WeatherAPIError
+
+DAILY_QUOTA = 10000  # 공공데이터포털 개발계정 일일 호출 한도
+REFRESH_DELAY = timedelta(minutes=2)  # 발표 제공 시각 이후 여유
+RESERVE_RATIO = 0.2  # 잔여 한도가 이 비율 미만이면 우선 격자만 갱신
+VIEW_TTL = timedelta(minutes=30)  # 최근 조회 격자로 간주하는 시간
+
+logger = logging.getLogger('flood_risk.scheduler')
+
+# observations: {(nx, ny): 관측 dict}, updated_at: 마지막 성공 갱신 시각
+Snapshot = namedtuple('Snapshot', ['observations', 'updated_at', 'base_time', 'last_error'])
+
+
+class TokenBucket:
+    """일일 호출 한도를 초당 균등 충전하는 토큰 버킷"""
+
+    def __init__(self, capacity=DAILY_QUOTA, period=86400.0, clock=time.monotonic):
+        self.capacity = float(capacity)
+        self.rate = self.capacity / period
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    @property
+    def tokens(self):
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+    def consume(self, n=1):
+        """n개 소비 가능하면 차감 후 True"""
+        with self._lock:
+            self._refill()
+            if self._tokens < n:
+                return False
+            self._tokens -= n
+            return True
+
+
+class ObservationRefresher:
+    """
+    초단기실황 발표 주기에 맞춰 전체 격자 관측값을 백그라운드로 갱신.
+    UI는 get_snapshot()으로 마지막 정상 스냅샷을 원자적으로 읽음.
+    """
+
+    def __init__(self, api_key, cities=None, quota=DAILY_QUOTA, max_workers=16):
+        self.api_key = api_key
+        self.cells = list(get_grid_cells(cities))
+        self.budget = TokenBucket(quota)
+        self.max_workers = max_workers
+        self._snapshot = Snapshot({}, None, None, None)
+        self._viewed = {}  # (nx, ny) -> 마지막 조회 시각
+        self._listeners = []
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='obs-refresher', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def add_listener(self, callback):
+        """새 스냅샷이 만들어질 때마다 callback(snapshot) 호출 (갱신 스레드에서 실행)"""
+        self._listeners.append(callback)
+        return self
+
+    def mark_viewed(self, nx, ny):
+        """사용자가 보고 있는 격자 기록 (갱신 우선순위 상향)"""
+        self._viewed[(nx, ny)] = datetime.now()
+
+    def get_snapshot(self):
+        return self._snapshot
+
+    def get_observation(self, nx, ny):
+        """스냅샷 내 격자 관측값과 경과 시간(초). 없으면 (None, None)"""
+        snapshot = self._snapshot
+        obs = snapshot.observations.get((nx, ny))
+        if obs is None:
+            return None, None
+        return obs, (datetime.now() - snapshot.updated_at).total_seconds()
+
+    def _priority_cells(self, now):
+        viewed = {cell for cell, t in list(self._viewed.items()) if now - t < VIEW_TTL}
+        raining = {cell for cell, obs in self._snapshot.observations.items()
+                   if obs['pty'] != '0' or obs['rainfall'] > 0}
+        return viewed | raining
+
+    def plan(self, now=None):
+        """
+        이번 회차에 갱신할 격자: 이번 발표분을 아직 못 받은 격자만 (실패 격자 재시도 포함).
+        우선 격자 먼저, 한도 여유가 있을 때만 나머지. 토큰은 여기서 차감하지 않고
+        실제 요청 시점에 차감하므로 격자당 요청 1회로 어림해 선택.
+        """
+        now = now or datetime.now()
+        current = get_base_datetime(now).strftime('%Y%m%d%H%M')
+        observations = self._snapshot.observations
+        pending = [c for c in self.cells
+                   if c not in observations or observations[c]['base_date'] + observations[c]['base_time'] != current]
+        priority = self._priority_cells(now)
+        ordered = [c for c in pending if c in priority] + [c for c in pending if c not in priority]
+        reserve = self.budget.capacity * RESERVE_RATIO
+        tokens = self.budget.tokens
+        selected = []
+        for cell in ordered:
+            if tokens < 1 or (cell not in priority and tokens - 1 < reserve):
+                break
+            tokens -= 1
+            selected.append(cell)
+        return selected
+
+    def refresh(self, now=None):
+        """1회 갱신. 성공한 격자만 새 스냅샷에 반영하고 실패 시 이전 스냅샷 유지"""
+        cells = self.plan(now)
+        if not cells:
+            return self._snapshot
+
+        def fetch(cell):
+            try:
+                # 갱신 시각(제공 +2분)은 hedge 구간 안이라 hedge를 켜면 격자마다 2회 호출 → 일일 한도 초과
+                obs = get_observation(self.api_key, cell[0], cell[1], now=now, hedge=False, budget=self.budget)
+            except Exception as e:
+                return e
+            if obs.get('stale'):  # 장애 대체값은 스냅샷 갱신으로 보지 않음
+                return WeatherAPIError("기상청 장애 – 갱신 실패", 'STALE', transient=True)
+            return obs
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = list(executor.map(fetch, cells))
+
+        previous = self._snapshot
+        observations = dict(previous.observations)
+        errors = [r for r in results if isinstance(r, Exception)]
+        for cell, result in zip(cells, results):
+            if not isinstance(result, Exception):
+                observations[cell] = result
+
+        last_error = str(errors[0]) if errors else None
+        if len(errors) == len(results):
+            self._snapshot = previous._replace(last_error=last_error)
+        else:
+            base = get_base_datetime(now).strftime('%Y%m%d%H%M')
+            self._snapshot = Snapshot(observations, datetime.now(), base, last_error)
+            for callback in self._listeners:
+                try:
+                    callback(self._snapshot)
+                except Exception:  # 구독자 오류가 관측 갱신을 막지 않도록
+                    logger.exception("스냅샷 구독자 실행 실패")
+        return self._snapshot
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                self._snapshot = self._snapshot._replace(last_error=str(e))
+            wake = next_release(get_base_datetime()) + REFRESH_DELAY
+            if self._snapshot.last_error:
+                wake = min(wake, datetime.now() + timedelta(minutes=5))  # 실패 시 조기 재시도 (plan이 실패 격자만 선택)
+            self._stop.wait(max(1.0, (wake - datetime.now()).total_seconds()))
@@ -0,0 +1,267 @@
+"""
+호스트 공용 캐시 (SQLite WAL, 프로세스 간 공유).
+
+여러 워커 프로세스(Streamlit 레플리카, server.py --workers, 배치 CLI)가 같은 파일을 열어
+관측값·렌더링 결과를 한 번만 채우고 나눠 씀. 프로세스 내 캐시(TTLCache, lru_cache) 아래 2단계로 사용.
+
+- 채우기 1회: 미스 시 fills 테이블에 임대(lease) 행을 INSERT한 프로세스만 loader 호출,
+  나머지는 값이 기록되거나 임대가 끝날 때까지 읽기만으로 대기 (쓰기 잠금은 임대가 없거나 만료됐을 때만,
+  임대 보유 프로세스가 죽어도 LEASE_SECONDS 후 회수).
+- 실패 공유: failure_ttl을 주면 loader 예외 메시지를 그 시간 동안 failures 테이블에 남겨, 대기 중이거나
+  새로 조회한 프로세스가 각자 loader(상류 호출)를 다시 부르지 않고 FillError를 받음.
+- 크기 상한: 값 bytes 합이 max_bytes를 넘으면 만료 항목, 이어서 오래 안 쓴 항목부터 삭제.
+- 파일 잠금/손상 등 SQLite 오류 시 공용 캐시 없이 loader를 직접 호출 (앱 동작에는 영향 없음).
+"""
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+from functools import lru_cache
+
+SHARED_CACHE_PATH = os.environ.get(
+    'FLOOD_RISK_SHARED_CACHE',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'cache', 'shared.sqlite3'))
+SHARED_CACHE_MB = float(os.environ.get('FLOOD_RISK_SHARED_CACHE_MB', 256))
+BUSY_TIMEOUT = 5.0  # 초, 쓰기 잠금 대기
+LEASE_SECONDS = 30.0  # 채우기 임대 기간 (loader 최대 소요 시간보다 길게)
+POLL_INTERVAL = 0.02  # 초, 다른 프로세스의 채우기 대기 간격
+TOUCH_INTERVAL = 60.0  # 초, 조회 시 마지막 사용 시각 갱신 최소 간격 (읽기마다 쓰기 방지)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, expires REAL, accessed REAL NOT NULL);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+CREATE TABLE IF NOT EXISTS fills (key TEXT PRIMARY KEY, owner TEXT NOT NULL, lease REAL NOT NULL);
+CREATE TABLE IF NOT EXISTS failures (key TEXT PRIMARY KEY, message TEXT NOT NULL, expires REAL NOT NULL);
+"""
+
+
+class FillError(Exception):
+    """다른 프로세스(또는 직전 채우기)의 loader 실패 (failure_ttl 동안 기록된 메시지)"""
+
+
+def _timestamp(value):
+    """datetime/epoch 초/None → epoch 초 또는 None"""
+    if value is None:
+        return None
+    return value.timestamp() if isinstance(value, datetime) else float(value)
+
+
+class SharedCache:
+    """
+    문자열 키 → (bytes, 만료 시각) 공용 캐시. 연결은 스레드·프로세스별로 따로 열어 fork 후에도 안전.
+    값 직렬화는 호출자 책임 (관측값 JSON, 차트 PNG 등).
+    """
+
+    def __init__(self, path=SHARED_CACHE_PATH, max_bytes=int(SHARED_CACHE_MB * 1024 * 1024)):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._owner = uuid.uuid4().hex
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'fills': 0, 'waits': 0, 'failures': 0, 'evictions': 0, 'errors': 0}
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._connect().executescript(_SCHEMA)
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')  # WAL에서는 전원 장애 시 마지막 커밋만 유실 가능
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def _count(self, name, n=1):
+        with self._lock:
+            self._stats[name] += n
+
+    def _lookup(self, conn, key, now):
+        row = conn.execute('SELECT value, expires, accessed FROM entries WHERE key = ?', (key,)).fetchone()
+        if row is None or (row[1] is not None and row[1] <= now):
+            return None
+        if time.time() - row[2] > TOUCH_INTERVAL:
+            conn.execute('UPDATE entries SET accessed = ? WHERE key = ?', (time.time(), key))
+        return row[0], row[1]
+
+    def get(self, key, now=None):
+        """만료되지 않은 (bytes, 만료 epoch 초 또는 None), 없으면 None"""
+        try:
+            entry = self._lookup(self._connect(), key, _timestamp(now) or time.time())
+        except sqlite3.Error:
+            self._count('errors')
+            return None
+        if entry is not None:
+            self._count('hits')
+        return entry
+
+    def set(self, key, value, expires_at=None):
+        """값 기록 (expires_at: datetime/epoch 초, None이면 크기 상한으로만 삭제)"""
+        try:
+            self._store(self._connect(), key, value, _timestamp(expires_at))
+        except sqlite3.Error:
+            self._count('errors')
+
+    def _store(self, conn, key, value, expires):
+        now = time.time()
+        conn.execute('BEGIN IMMEDIATE')  # 잠금 대기 실패 시 트랜잭션 없음 (ROLLBACK 불필요)
+        try:
+            conn.execute('INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)',
+                         (key, sqlite3.Binary(value), len(value), expires, now))
+            conn.execute('DELETE FROM fills WHERE key = ?', (key,))
+            conn.execute('DELETE FROM failures WHERE key = ? OR expires <= ?', (key, now))
+            evicted = self._evict(conn, now)
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        if evicted:
+            self._count('evictions', evicted)
+
+    def _evict(self, conn, now):
+        """(쓰기 트랜잭션 안에서) 합계가 max_bytes 이하가 될 때까지 만료 → 오래 안 쓴 순 삭제"""
+        total = conn.execute('SELECT total(size) FROM entries').fetchone()[0]
+        if total <= self.max_bytes:
+            return 0
+        evicted = conn.execute('DELETE FROM entries WHERE expires IS NOT NULL AND expires <= ?', (now,)).rowcount
+        total = conn.execute('SELECT total(size) FROM entries').fetchone()[0]
+        victims = []
+        for key, size in conn.execute('SELECT key, size FROM entries ORDER BY accessed'):
+            if total <= self.max_bytes:
+                break
+            victims.append((key,))
+            total -= size
+        conn.executemany('DELETE FROM entries WHERE key = ?', victims)
+        return evicted + len(victims)
+
+    def _failure(self, conn, key):
+        """기록된 지 failure_ttl이 안 지난 loader 실패 메시지, 없으면 None"""
+        row = conn.execute('SELECT message FROM failures WHERE key = ? AND expires > ?', (key, time.time())).fetchone()
+        return row[0] if row is not None else None
+
+    def _state(self, conn, key, now):
+        """(값, 실패 메시지, 다른 프로세스가 임대 보유 중 여부) — 읽기만"""
+        entry = self._lookup(conn, key, now)
+        if entry is not None:
+            return entry, None, False
+        failure = self._failure(conn, key)
+        if failure is not None:
+            return None, failure, False
+        lease = conn.execute('SELECT lease FROM fills WHERE key = ?', (key,)).fetchone()
+        return None, None, lease is not None and lease[0] > time.time()
+
+    def _claim(self, conn, key, now):
+        """
+        (쓰기 트랜잭션) 값·실패 기록이 여전히 없고 임대가 없거나 만료됐으면 임대 획득.
+        반환: (값, 실패 메시지, 임대 획득 여부)
+        """
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            entry, failure, _ = self._state(conn, key, now)
+            claimed = False
+            if entry is None and failure is None:
+                conn.execute('DELETE FROM fills WHERE key = ? AND lease <= ?', (key, time.time()))
+                claimed = conn.execute('INSERT OR IGNORE INTO fills VALUES (?, ?, ?)',
+                                       (key, self._owner, time.time() + LEASE_SECONDS)).rowcount == 1
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        return entry, failure, claimed
+
+    def get_or_fill(self, key, loader, now=None, failure_ttl=None):
+        """
+        조회 후 없으면 호스트 전체에서 1개 프로세스만 loader() 호출.
+        loader는 (bytes, expires_at)을 반환. 반환: (bytes, 만료 epoch 초 또는 None).
+        다른 프로세스가 채우는 중이면 읽기 전용 조회로 대기 (쓰기 잠금 경쟁 없음).
+        loader 예외는 그대로 올리고 임대를 풀며, failure_ttl(초, 또는 예외 → 초/None 함수)을 주면 그동안
+        같은 키 조회는 loader를 다시 부르지 않고 FillError. 없으면 대기 중인 다른 프로세스가 이어서 채움.
+        """
+        now = _timestamp(now) or time.time()
+        try:
+            conn = self._connect()
+            waited = False
+            while True:
+                entry, failure, leased = self._state(conn, key, now)
+                if entry is None and failure is None and not leased:
+                    entry, failure, claimed = self._claim(conn, key, now)
+                    if claimed:
+                        break
+                if entry is not None or failure is not None:
+                    break
+                waited = True
+                time.sleep(POLL_INTERVAL)
+        except sqlite3.Error:
+            self._count('errors')
+            value, expires_at = loader()
+            return value, _timestamp(expires_at)
+        if failure is not None:
+            self._count('failures')
+            raise FillError(failure)
+        if entry is not None:
+            self._count('waits' if waited else 'hits')
+            return entry
+
+        self._count('fills')
+        try:
+            value, expires_at = loader()
+        except Exception as e:
+            self._release(conn, key, str(e) or type(e).__name__, failure_ttl(e) if callable(failure_ttl) else failure_ttl)
+            raise
+        except BaseException:
+            self._release(conn, key)
+            raise
+        expires = _timestamp(expires_at)
+        try:
+            self._store(conn, key, value, expires)
+        except sqlite3.Error:
+            self._count('errors')
+            self._release(conn, key)
+        return value, expires
+
+    def _release(self, conn, key, message=None, failure_ttl=None):
+        """임대 반납 (failure_ttl이 있으면 실패 메시지를 같은 트랜잭션에 기록)"""
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                conn.execute('DELETE FROM fills WHERE key = ? AND owner = ?', (key, self._owner))
+                if message is not None and failure_ttl:
+                    conn.execute('INSERT OR REPLACE INTO failures VALUES (?, ?, ?)',
+                                 (key, message, time.time() + failure_ttl))
+                conn.execute('COMMIT')
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+        except sqlite3.Error:
+            self._count('errors')  # 임대는 LEASE_SECONDS 후 자동 회수
+
+    def stats(self):
+        """이 프로세스의 hit/fill/wait 카운터 + 공용 항목 수·bytes"""
+        with self._lock:
+            stats = dict(self._stats)
+        try:
+            stats['entries'], stats['bytes'] = self._connect().execute(
+                'SELECT count(*), total(size) FROM entries').fetchone()
+            stats['bytes'] = int(stats['bytes'])
+        except sqlite3.Error:
+            pass
+        return stats
+
+    def clear(self):
+        conn = self._connect()
+        conn.execute('DELETE FROM entries')
+        conn.execute('DELETE FROM fills')
+        conn.execute('DELETE FROM failures')
+
+
+@lru_cache(maxsize=1)
+def get_shared_cache():
+    """프로세스 공용 인스턴스. FLOOD_RISK_SHARED_CACHE=off면 None (프로세스 내 캐시만 사용)"""
+    if SHARED_CACHE_PATH.lower() == 'off':
+        return None
+    try:
+        return SharedCache()
+    except (OSError, sqlite3.Error):
+        return None
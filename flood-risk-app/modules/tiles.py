@@ -0,0 +1,195 @@
+"""
+전국 실시간 위험도 타일 피라미드 (z/x/y PNG, Web Mercator).
+
+각 픽셀을 INFLUENCE_KM 이내 최근접 지역의 위험 등급으로 칠하고,
+관측 갱신 후 등급이 바뀐 지역이 걸친 타일만 다시 그림.
+브라우저는 지역/건물 수와 무관하게 화면에 보이는 타일만 받음.
+"""
+import io
+import os
+import threading
+
+import numpy as np
+from PIL import Image
+
+from modules.district_index import get_district_index
+from modules.risk_table import get_risk_table
+from modules.utils import calculate_risk_array
+
+TILE_SIZE = 256
+MIN_ZOOM, MAX_ZOOM = 6, 10  # 그 이상 줌은 Leaflet이 MAX_ZOOM 타일을 확대
+INFLUENCE_KM = 12.0  # 지역 중심에서 이 거리 밖 픽셀은 투명
+ELEVATION = 10.0  # 공용 타일 점수 계산용 건물 고도 (앱 슬라이더 기본값)
+TILE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'static', 'tiles')
+TILE_URL = os.environ.get('FLOOD_RISK_TILE_URL', 'app/static/tiles/{z}/{x}/{y}.png')  # Streamlit 정적 경로
+
+# 위험 점수 구간 하한 → 팔레트 인덱스 1..5 (0은 관측 없음/범위 밖, 투명)
+LEVEL_BOUNDS = (10, 20, 40, 80)
+PALETTE = (
+    (0, 0, 0, 0),
+    (49, 130, 189, 90),
+    (255, 237, 160, 140),
+    (254, 178, 76, 170),
+    (240, 59, 32, 190),
+    (189, 0, 38, 210)
+)
+
+
+def risk_levels(risk_score):
+    """위험 점수 배열 → uint8 등급 (NaN 0, 그 외 1..5)"""
+    risk_score = np.asarray(risk_score, dtype=np.float32)
+    levels = np.digitize(risk_score, LEVEL_BOUNDS).astype(np.uint8) + 1
+    levels[np.isnan(risk_score)] = 0
+    return levels
+
+
+def tile_range(zoom, south, west, north, east):
+    """경위도 범위를 덮는 타일 x, y 범위 (양끝 포함)"""
+    n = 2 ** zoom
+    x0, y0 = _lonlat_to_tile(west, north, n)
+    x1, y1 = _lonlat_to_tile(east, south, n)
+    return range(x0, x1 + 1), range(y0, y1 + 1)
+
+
+def _lonlat_to_tile(lon, lat, n):
+    lat_rad = np.radians(lat)
+    x = int((lon + 180.0) / 360.0 * n)
+    y = int((1.0 - np.arcsinh(np.tan(lat_rad)) / np.pi) / 2.0 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+def tile_pixel_centers(zoom, x, y):
+    """타일 픽셀 중심 위경도 (행별 위도 (256,), 열별 경도 (256,))"""
+    n = 2 ** zoom
+    offsets = (np.arange(TILE_SIZE) + 0.5) / TILE_SIZE
+    lon = (x + offsets) / n * 360.0 - 180.0
+    lat = np.degrees(np.arctan(np.sinh(np.pi * (1 - 2 * (y + offsets) / n))))
+    return lat, lon
+
+
+def encode_tile(levels):
+    """(256, 256) uint8 팔레트 인덱스 → 투명도 포함 팔레트 PNG bytes"""
+    image = Image.fromarray(levels, mode='P')
+    image.putpalette([c for rgba in PALETTE for c in rgba[:3]])
+    buf = io.BytesIO()
+    image.save(buf, format='PNG', transparency=bytes(rgba[3] for rgba in PALETTE), compress_level=1)
+    return buf.getvalue()
+
+
+class RiskTileRenderer:
+    """
+    지역별 위험 등급을 타일 피라미드로 디스크에 기록.
+    픽셀 → 최근접 지역 코드 맵은 강수량과 무관하므로 타일별 1회만 계산해 두고(지역 255개 미만이면 타일당 64KB),
+    등급이 바뀐 지역이 걸친 타일만 팔레트 조회 + PNG 인코딩으로 재생성.
+    """
+
+    def __init__(self, tile_dir=TILE_DIR, zooms=range(MIN_ZOOM, MAX_ZOOM + 1), elevation=ELEVATION,
+                 index=None):
+        self.tile_dir = tile_dir
+        self.zooms = list(zooms)
+        self.elevation = elevation
+        self.index = index or get_district_index()
+        # 진단(앱·/score·알림)과 같은 침수심 기준: 앙상블 중앙값 (색인을 지정하면 그 색인의 base_depth)
+        self.flood_depth = get_risk_table().flood_depth if index is None else self.index.table['base_depth'].to_numpy()
+        self.version = 0  # 타일이 바뀔 때마다 증가 (브라우저 캐시 무효화용)
+        self._levels = None  # 지역별 마지막 등급
+        self._owners = {}  # (z, x, y) -> 픽셀별 지역 코드 (범위 밖은 _none), 빈 타일은 None
+        self._tile_codes = {}  # (z, x, y) -> 타일에 걸친 지역 코드 (빈 타일 제외)
+        self._owner_dtype = np.uint8 if len(self.index) < 255 else np.uint16
+        self._none = np.iinfo(self._owner_dtype).max
+        self._lock = threading.Lock()
+
+    def tiles(self):
+        """지역 범위(+INFLUENCE_KM)를 덮는 모든 (z, x, y)"""
+        table = self.index.table
+        margin = INFLUENCE_KM / 111.0 * 1.5
+        bounds = (float(table['lat'].min()) - margin, float(table['lon'].min()) - margin,
+                  float(table['lat'].max()) + margin, float(table['lon'].max()) + margin)
+        for zoom in self.zooms:
+            xs, ys = tile_range(zoom, *bounds)
+            for x in xs:
+                for y in ys:
+                    yield zoom, x, y
+
+    def tile_path(self, zoom, x, y):
+        return os.path.join(self.tile_dir, str(zoom), str(x), f"{y}.png")
+
+    def tile_url(self, url=TILE_URL):
+        """버전 쿼리를 붙인 folium TileLayer URL 템플릿"""
+        return f"{url}?v={self.version}"
+
+    def _owner_map(self, zoom, x, y):
+        """픽셀별 최근접 지역 코드 (256, 256). 타일 반경 안에 지역이 없으면 픽셀 질의 없이 None"""
+        tile = (zoom, x, y)
+        if tile in self._owners:
+            return self._owners[tile]
+        lat, lon = tile_pixel_centers(zoom, x, y)
+        center_lat, center_lon = float(lat.mean()), float(lon.mean())
+        half_diagonal_km = np.hypot((lat[0] - lat[-1]) * 111.0,
+                                    (lon[-1] - lon[0]) * 111.0 * np.cos(np.radians(center_lat))) / 2
+        owners = None
+        if len(self.index.within(center_lat, center_lon, half_diagonal_km + INFLUENCE_KM)):
+            lat_grid, lon_grid = np.meshgrid(lat, lon, indexing='ij')
+            codes, _ = self.index.nearest(lat_grid.ravel(), lon_grid.ravel(), max_km=INFLUENCE_KM)
+            covered = np.unique(codes[codes >= 0])
+            if len(covered):
+                owners = np.where(codes >= 0, codes, self._none).astype(self._owner_dtype)
+                owners = owners.reshape(TILE_SIZE, TILE_SIZE)
+                self._tile_codes[tile] = covered
+        self._owners[tile] = owners
+        return owners
+
+    def _render_tile(self, zoom, x, y, palette_index):
+        """타일 1장 PNG. 걸친 지역이 없으면 None"""
+        owners = self._owner_map(zoom, x, y)
+        if owners is None:
+            return None
+        return encode_tile(palette_index[owners])
+
+    def _write(self, zoom, x, y, png):
+        path = self.tile_path(zoom, x, y)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, 'wb') as f:
+            f.write(png)
+        os.replace(tmp, path)  # 읽는 쪽이 반쯤 쓴 파일을 보지 않도록
+
+    def update(self, rainfall):
+        """
+        지역 코드 순 강수량 배열(결측 NaN)로 타일 갱신. 재생성한 타일 수 반환.
+        최초 호출은 전체 피라미드, 이후에는 등급이 바뀐 지역이 걸친 타일만 그림.
+        """
+        risk_score, _ = calculate_risk_array(rainfall, self.elevation, self.flood_depth, dtype=np.float32)
+        levels = risk_levels(risk_score)
+
+        # 지역 코드 → 팔레트 인덱스 (마지막 칸은 범위 밖 픽셀용 투명)
+        palette_index = np.zeros(int(self._none) + 1, dtype=np.uint8)
+        palette_index[:len(levels)] = levels
+
+        with self._lock:
+            if self._levels is None:
+                targets = list(self.tiles())
+            else:
+                changed = levels != self._levels
+                if not changed.any():
+                    return 0
+                targets = [tile for tile, codes in self._tile_codes.items() if changed[codes].any()]
+
+            written = 0
+            for tile in targets:
+                png = self._render_tile(*tile, palette_index)
+                if png is not None:
+                    self._write(*tile, png)
+                    written += 1
+            self._levels = levels
+            if written:
+                self.version += 1
+            return written
+
+    def update_from_snapshot(self, snapshot):
+        """ObservationRefresher 스냅샷 ({(nx, ny): 관측}) → 지역별 강수량으로 update"""
+        table = self.index.table
+        observations = snapshot.observations
+        rainfall = np.array([observations[cell]['rainfall'] if cell in observations else np.nan
+                             for cell in zip(table['nx'].tolist(), table['ny'].tolist())], dtype=np.float32)
+        return self.update(rainfall)
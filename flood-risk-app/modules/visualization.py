@@ -1,36 +1,113 @@
+import html
+import io
+import threading
+from functools import lru_cache
+
 import numpy as np
-import pandas as pd
+import matplotlib
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import folium
 from folium.plugins import HeatMap
 
-def create_map(lat, lon, predicted_risk, selected_gu, risk_score, rainfall, flood_depth, korean_cities):
+from modules.data import korean_cities as _default_cities
+from modules.fonts import setup_fonts
+from modules.tiles import MIN_ZOOM, MAX_ZOOM
+from modules.risk_table import ELEVATION_AXIS, get_risk_table, rainfall_threshold
+from modules.shared_cache import get_shared_cache
+
+setup_fonts()
+
+MAP_CACHE_SIZE = 256  # 렌더링된 지도 HTML LRU 크기
+CHART_CACHE_SIZE = 512  # 강수량별 차트 이미지 LRU 크기
+CHART_DPI = 150
+POPUP_TOKEN = '__FLOOD_RISK_POPUP__'  # 지도 템플릿의 팝업 자리표시자
+ARTIFACT_VERSION = 1  # 차트/지도 모양을 바꾸면 올림 (호스트 공용 캐시의 이전 렌더링 무시)
+
+_render_lock = threading.Lock()  # pyplot 전역 상태는 스레드 안전하지 않음
+
+def _shared_artifact(key, render):
+    """render() bytes를 호스트 공용 캐시 경유로 (워커 프로세스 수와 무관하게 키당 1회 렌더링)"""
+    shared = get_shared_cache()
+    if shared is None:
+        return render()
+    return shared.get_or_fill(f'artifact:{ARTIFACT_VERSION}:{key}', lambda: (render(), None))[0]
+
+def build_heat_data(korean_cities):
+    """구 단위 히트맵 데이터 생성 (base_depth를 가중치로 사용)"""
+    heat_data = []
+    for sido, gus in korean_cities.items():
+        for gu, (lat_g, lon_g, _, _, depth) in gus.items():
+            # base_depth를 가중치로, 침수심에 비례해 강도 조정
+            weight = depth * 10  # base_depth를 10배로 스케일링 (조정 가능)
+            heat_data.append([lat_g, lon_g, weight])
+    return heat_data
+
+# 정적 base_depth만 사용하므로 기본 도시 목록의 히트맵은 시작 시 1회 생성
+HEAT_DATA = build_heat_data(_default_cities)
+
+def marker_popup(selected_gu, predicted_risk, risk_score, rainfall, flood_depth):
+    """선택 지역 마커 팝업 HTML"""
+    return f"지역: {selected_gu}<br>위험도: {'고위험' if predicted_risk == 1 else '저위험'}<br>점수: {risk_score:.2f}<br>강수량: {rainfall}mm<br>침수심: {flood_depth}m"
+
+def create_map(lat, lon, predicted_risk, selected_gu, risk_score, rainfall, flood_depth, korean_cities, tile_url=None,
+               popup=None):
     """
     GIS 지도 생성 (구 단위 히트맵 오버레이 포함)
+    tile_url이 있으면 히트맵 대신 실시간 위험도 타일 레이어 사용 (지역 수와 무관하게 보이는 타일만 전송)
     """
     m = folium.Map(location=[lat, lon], zoom_start=12)  # 줌 레벨 조정 (구 단위 표시용)
     color = 'red' if predicted_risk == 1 else 'blue'
-    
+    if popup is None:
+        popup = marker_popup(selected_gu, predicted_risk, risk_score, rainfall, flood_depth)
+
     # 현재 선택된 지역 마커
     folium.Marker(
         [lat, lon],
-        popup=f"지역: {selected_gu}<br>위험도: {'고위험' if predicted_risk == 1 else '저위험'}<br>점수: {risk_score:.2f}<br>강수량: {rainfall}mm<br>침수심: {flood_depth}m",
+        popup=popup,
         icon=folium.Icon(color=color)
     ).add_to(m)
 
-    # 구 단위 히트맵 데이터 생성 (base_depth를 가중치로 사용)
-    heat_data = []
-    for sido, gus in korean_cities.items():
-        for gu, (lat_g, lon_g, _, _, depth) in gus.items():
-            # base_depth를 가중치로, 침수심에 비례해 강도 조정
-            weight = depth * 10  # base_depth를 10배로 스케일링 (조정 가능)
-            heat_data.append([lat_g, lon_g, weight])
+    if tile_url:
+        folium.TileLayer(tiles=tile_url, attr='기상청 초단기실황 기반 침수 위험도', name='실시간 위험도',
+                         overlay=True, min_zoom=MIN_ZOOM, max_native_zoom=MAX_ZOOM, max_zoom=18).add_to(m)
+        return m
+
+    heat_data = HEAT_DATA if korean_cities is _default_cities else build_heat_data(korean_cities)
 
     # HeatMap 오버레이 추가
     HeatMap(heat_data, radius=15, blur=10, max_zoom=13).add_to(m)
 
     return m
 
+@lru_cache(maxsize=MAP_CACHE_SIZE)
+def _map_template(lat, lon, predicted_risk, tile_url):
+    """
+    팝업만 비워 둔 지도 HTML. 고도 슬라이더처럼 점수/침수심만 바뀌면 folium 재렌더링 없이 팝업 치환.
+    _repr_html_은 문서 전체를 html.escape해 iframe srcdoc에 넣으므로 팝업도 escape해서 치환해야 함.
+    """
+    def render():
+        m = create_map(lat, lon, predicted_risk, None, 0, 0, 0, _default_cities, tile_url, popup=POPUP_TOKEN)
+        return m._repr_html_().encode('utf-8')
+
+    return _shared_artifact(f'map:{lat}:{lon}:{predicted_risk}:{tile_url}', render).decode('utf-8')
+
+@lru_cache(maxsize=MAP_CACHE_SIZE)
+def _render_map_html(lat, lon, predicted_risk, selected_gu, risk_score, rainfall, flood_depth, tile_url):
+    popup = marker_popup(selected_gu, predicted_risk, risk_score, rainfall, flood_depth)
+    return _map_template(lat, lon, predicted_risk, tile_url).replace(POPUP_TOKEN, html.escape(popup))
+
+def create_map_html(lat, lon, predicted_risk, selected_gu, risk_score, rainfall, flood_depth, korean_cities, tile_url=None):
+    """
+    create_map 결과의 HTML.
+    기본 도시 목록이면 (지역, 위험도, 점수(소수 둘째 자리), 강수량, 침수심, 타일 버전) 단위로 LRU 캐시.
+    """
+    if korean_cities is not _default_cities:
+        return create_map(lat, lon, predicted_risk, selected_gu, risk_score, rainfall, flood_depth, korean_cities,
+                          tile_url)._repr_html_()
+    return _render_map_html(lat, lon, int(predicted_risk), selected_gu, round(float(risk_score), 2),
+                            rainfall, flood_depth, tile_url)
+
 def create_rainfall_chart(rainfall):
     fig, ax = plt.subplots(figsize=(8, 6))
     x = np.linspace(0, 500, 100)
@@ -57,19 +134,103 @@ def create_trend_chart():
     ax.legend()
     return fig
 
-def create_simulation_chart():
+def create_simulation_chart(boundary, elevation_axis, flood_depth, surface=None, rainfall_axis=None):
+    """
+    위험 공식의 실제 판정 경계 (침수심 flood_depth에서 고도별 임계 강수량 선, 오른쪽이 고위험).
+    surface(강수량 × 고도 고위험 확률 %)가 있으면 배경 색으로 표시.
+    """
     fig, ax = plt.subplots(figsize=(8, 6))
-    np.random.seed(42)
-    sim_data = pd.DataFrame({
-        'rainfall': np.random.uniform(50, 200, 50),
-        'elevation': np.random.uniform(0, 50, 50),
-        'risk': np.random.choice([0, 1], 50, p=[0.7, 0.3])
-    })
-    sim_data['sim_risk'] = (sim_data['rainfall'] / (sim_data['elevation'] + 1)) * 10 > 20
-    scatter = ax.scatter(sim_data['rainfall'], sim_data['elevation'], c=sim_data['risk'], cmap='coolwarm', s=50)
-    plt.colorbar(scatter, ax=ax, label='예측 위험도 (0: 저위험, 1: 고위험)')
+    x_max = max(float(boundary.max()), 50.0) * 1.2
+    if surface is not None:
+        mesh = ax.pcolormesh(rainfall_axis, elevation_axis, surface.T, cmap='coolwarm', vmin=0, vmax=100,
+                             shading='nearest')
+        plt.colorbar(mesh, ax=ax, label='고위험 확률 (%, 침수심 앙상블)')
+        saturated = np.flatnonzero((surface == 100).all(axis=1))  # 모든 고도에서 100%가 되는 강수량부터는 생략
+        if len(saturated):
+            x_max = max(x_max, float(rainfall_axis[saturated[0]]) * 1.2)
+        x_max = min(x_max, float(rainfall_axis[-1]))
+    else:
+        ax.fill_betweenx(elevation_axis, boundary, x_max, color='red', alpha=0.2, label='고위험 영역')
+    ax.plot(boundary, elevation_axis, color='black', linewidth=2, label=f'판정 경계 (침수심 {flood_depth}m)')
+    ax.set_xlim(0, x_max)
     ax.set_xlabel('강수량 (mm)')
     ax.set_ylabel('고도 (m)')
-    ax.set_title('침수 위험 예측 시각화 (GIS 히트맵 시뮬레이션)')
+    ax.set_title('침수 위험 판정 경계 (강수량 × 고도)')
+    ax.legend(loc='upper left')
+    ax.grid(True, alpha=0.3)
+    return fig
+
+def create_accumulation_chart(hours, hourly, accumulated, window=24):
+    """최근 시간별 관측 강수량(막대)과 window시간 누적 강수량(선)"""
+    fig, ax = plt.subplots(figsize=(8, 6))
+    x = np.arange(len(hours))
+    ax.bar(x, np.nan_to_num(hourly), color='steelblue', alpha=0.6, label='시간 강수량 (mm)')
+    ax.set_xlabel('관측 시각')
+    ax.set_ylabel('시간 강수량 (mm)')
+    ax2 = ax.twinx()
+    ax2.plot(x, accumulated, color='red', linewidth=2, label=f'{window}시간 누적 (mm)')
+    ax2.set_ylabel('누적 강수량 (mm)')
+    step = max(1, len(hours) // 6)
+    ax.set_xticks(x[::step])
+    ax.set_xticklabels(hours[::step], rotation=30)
+    ax.set_title(f'최근 {len(hours)}시간 관측 강수량 및 {window}시간 누적')
     ax.grid(True, alpha=0.3)
-    return fig
\ No newline at end of file
+    fig.legend(loc='upper left', bbox_to_anchor=(0.1, 0.9))
+    return fig
+
+def render_figure(fig, fmt='png'):
+    """figure를 이미지 bytes로 렌더링하고 즉시 닫음 (서버 메모리 누적 방지)"""
+    try:
+        buf = io.BytesIO()
+        fig.savefig(buf, format=fmt, dpi=CHART_DPI, bbox_inches='tight')
+        return buf.getvalue()
+    finally:
+        plt.close(fig)
+
+@lru_cache(maxsize=CHART_CACHE_SIZE)
+def _rainfall_chart_png(rainfall):
+    def render():
+        with _render_lock:
+            return render_figure(create_rainfall_chart(rainfall))
+
+    return _shared_artifact(f'rainfall:{rainfall}', render)
+
+def get_rainfall_chart_png(rainfall):
+    """강수량 차트 PNG (기상청 관측 단위인 0.1mm로 버킷팅해 캐시)"""
+    return _rainfall_chart_png(round(float(rainfall), 1))
+
+@lru_cache(maxsize=1)
+def get_trend_chart_png():
+    """고정 데이터 차트: 호스트당 1회 렌더링"""
+    def render():
+        with _render_lock:
+            return render_figure(create_trend_chart())
+
+    return _shared_artifact('trend', render)
+
+@lru_cache(maxsize=CHART_CACHE_SIZE)
+def get_simulation_chart_png(code=None):
+    """지역 조회표 기반 판정 경계 차트 PNG (지역별 1회 렌더링, 강수량/고도 슬라이더와 무관)"""
+    if code is None:  # 침수심 연동 없음: 침수심 0 기준 경계만
+        args = (rainfall_threshold(0.0, ELEVATION_AXIS), ELEVATION_AXIS, 0.0)
+    else:
+        table = get_risk_table()
+        args = (table.boundary[code], table.elevation_axis, table.flood_depth[code], table.surface(code),
+                table.rainfall_axis)
+
+    def render():
+        with _render_lock:
+            return render_figure(create_simulation_chart(*args))
+
+    return _shared_artifact(f'simulation:{code}', render)
+
+@lru_cache(maxsize=CHART_CACHE_SIZE)
+def _accumulation_chart_png(hours, hourly, accumulated, window):
+    with _render_lock:
+        return render_figure(create_accumulation_chart(hours, hourly, accumulated, window))
+
+def get_accumulation_chart_png(times, hourly, accumulated, window=24):
+    """누적 강수량 차트 PNG (격자·시각·값 단위 캐시: 같은 관측 시각이면 재사용)"""
+    hours = tuple(str(t)[5:13].replace('T', ' ') + '시' for t in times)
+    return _accumulation_chart_png(hours, tuple(np.round(hourly, 1).tolist()),
+                                   tuple(np.round(accumulated, 1).tolist()), window)
@@ -0,0 +1,60 @@
+import time
+
+import pandas as pd
+import streamlit as st
+
+st.set_page_config(layout="wide", page_title="전국 침수 위험 순위")
+
+from modules.api import get_base_datetime, get_grid_cells, peek_observation
+from modules.profiling import observe, span
+from modules.ranking import CLASS_LABELS, get_ranking
+from modules.tiles import ELEVATION
+
+PAGE_SIZE = 50
+
+page_start = time.perf_counter()
+st.title("전국 실시간 침수 위험 순위")
+st.caption(f"기상청 초단기실황 강수량 + 구별 예상 침수심(앙상블 중앙값), 건물 고도 {ELEVATION:g}m 기준 "
+           "(위험 진단·위험도 지도 타일과 같은 점수)")
+
+# 순위는 메인 페이지의 관측 갱신기가 발표마다 바뀐 격자만 갱신. 아직 한 번도 못 받았으면
+# 이 프로세스 캐시에 있는 관측값만으로 채움 (네트워크 호출 없음)
+ranking = get_ranking()
+if ranking.base_time is None:
+    with span('ranking_seed'):
+        cached = {cell: peek_observation(*cell) for cell in get_grid_cells()}
+        rainfall = {cell: obs['rainfall'] for cell, obs in cached.items() if obs is not None}
+        if rainfall:
+            ranking.update(rainfall, get_base_datetime().strftime('%Y%m%d%H%M'))
+
+if ranking.base_time is None:
+    st.info("아직 관측값이 없습니다. 메인 페이지에서 기상청 연동을 시작하면 순위가 채워집니다.")
+else:
+    st.write(f"기준 발표 시각: {ranking.base_time[:8]} {ranking.base_time[8:10]}시 · "
+             f"갱신: {ranking.updated_at:%H:%M:%S}")
+
+col1, col2 = st.columns(2)
+sido = col1.selectbox("시/도", ["전국"] + ranking.sidos())
+risk_class = col2.selectbox("위험 등급", ["전체"] + list(CLASS_LABELS[::-1]))
+sido = None if sido == "전국" else sido
+risk_class = None if risk_class == "전체" else CLASS_LABELS.index(risk_class)
+
+with span('ranking_read'):
+    counts = ranking.class_counts(sido)
+    total = sum(counts) if risk_class is None else counts[risk_class]
+    pages = max(1, -(-total // PAGE_SIZE))
+    page = st.number_input(f"페이지 (1–{pages})", min_value=1, max_value=pages, value=1)
+    total, rows = ranking.page((page - 1) * PAGE_SIZE, PAGE_SIZE, sido, risk_class)
+
+for column, label, count in zip(st.columns(len(CLASS_LABELS)), CLASS_LABELS[::-1], counts[::-1]):
+    column.metric(label, f"{count:,}")
+
+if rows:
+    table = pd.DataFrame(rows, columns=rows[0]._fields)
+    table['risk_class'] = [CLASS_LABELS[c] for c in table['risk_class']]
+    table = table.rename(columns={'rank': '순위', 'national_rank': '전국 순위', 'sido': '시/도', 'name': '지역',
+                                  'rainfall': '강수량 (mm)', 'risk_score': '위험 점수', 'risk_class': '등급'})
+    st.dataframe(table, hide_index=True, use_container_width=True)
+else:
+    st.write("해당 조건의 지역이 없습니다.")
+observe('ranking_page', time.perf_counter() - page_start)
@@ -0,0 +1,251 @@
+"""
+건물 포트폴리오 일괄 침수 위험 진단 (CLI).
+
+입력 CSV/Parquet (id, lat, lon, elevation)를 고정 크기 청크로 스트리밍하며
+지역/격자 매핑 → 현재 강수량·base_depth 결합 → calculate_risk_array 벡터화 → 결과를 청크 단위로 기록.
+elevation 열이 없거나 빈 행은 수치표고(DEM) 래스터에서, 침수심은 침수심 래스터가 있으면 지점 값을
+(없는 곳은 base_depth) 사용 (modules/raster.py, data/rasters).
+
+    python score_portfolio.py buildings.csv scored.csv --api-key KEY --workers 4
+"""
+import argparse
+import os
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from modules.api import fetch_cells
+from modules.district_index import get_district_index
+from modules.grid import latlon_to_grid
+from modules.raster import DEFAULT_ELEVATION, get_terrain
+from modules.utils import calculate_risk_array
+
+INPUT_COLUMNS = ['id', 'lat', 'lon', 'elevation']  # elevation은 선택
+MAX_DISTRICT_KM = 200  # 최근접 지역 중심이 이보다 멀면 국외·기상청 격자 밖으로 보고 제외 (백령도 약 160km)
+OUTPUT_COLUMNS = ['id', 'sido', 'gu', 'district_km', 'nx', 'ny', 'rainfall', 'elevation', 'flood_depth',
+                  'risk_score', 'predicted_risk']
+
+
+def _is_parquet(path):
+    return os.path.splitext(path)[1].lower() in ('.parquet', '.pq')
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        sys.exit("Parquet 입출력에는 pyarrow가 필요합니다 (pip install pyarrow).")
+    return pq
+
+
+def read_chunks(path, chunk_size):
+    """입력 파일을 chunk_size 행 단위 DataFrame으로 스트리밍 (elevation 열이 없으면 NaN)"""
+    if _is_parquet(path):
+        pq = _require_pyarrow()
+        parquet = pq.ParquetFile(path)
+        columns = [c for c in INPUT_COLUMNS if c in parquet.schema_arrow.names]
+        chunks = (batch.to_pandas() for batch in parquet.iter_batches(batch_size=chunk_size, columns=columns))
+    else:
+        chunks = pd.read_csv(path, usecols=lambda c: c in INPUT_COLUMNS, chunksize=chunk_size,
+                             dtype={'lat': np.float64, 'lon': np.float64, 'elevation': np.float32})
+    for chunk in chunks:
+        if 'elevation' not in chunk:
+            chunk['elevation'] = np.float32(np.nan)
+        yield chunk
+
+
+class ResultWriter:
+    """결과 청크를 CSV 또는 Parquet로 순차 기록"""
+
+    def __init__(self, path):
+        self.path = path
+        self._parquet_writer = None
+        self._header = True
+
+    def write(self, chunk):
+        """chunk: DataFrame 또는 워커에서 미리 인코딩한 CSV 본문(str, 헤더 제외)"""
+        if isinstance(chunk, str):
+            with open(self.path, 'w' if self._header else 'a', encoding='utf-8', newline='') as f:
+                if self._header:
+                    f.write(','.join(OUTPUT_COLUMNS) + '\n')
+                f.write(chunk)
+            self._header = False
+        elif _is_parquet(self.path):
+            import pyarrow as pa
+            pq = _require_pyarrow()
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if self._parquet_writer is None:
+                self._parquet_writer = pq.ParquetWriter(self.path, table.schema)
+            self._parquet_writer.write_table(table)
+        else:
+            chunk.to_csv(self.path, mode='w' if self._header else 'a', header=self._header, index=False)
+            self._header = False
+
+    def close(self):
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+
+
+def site_flood_depth(lat, lon, base_depth):
+    """지점 침수심: 침수심 래스터 값, 래스터가 없거나 값이 없는 곳은 지역 base_depth (리포트 CLI와 공용)"""
+    depth_layer = get_terrain().flood_depth
+    if depth_layer is None:
+        return base_depth
+    raster_depth = depth_layer.sample(lat, lon)
+    return np.where(np.isnan(raster_depth), base_depth, raster_depth)
+
+
+def score_chunk(chunk, rainfall):
+    """청크 1개 진단 (_prepare 결과): 지역 base_depth·침수심 결합 + 위험 점수"""
+    districts = get_district_index().take(chunk['code'].to_numpy())
+    flood_depth = site_flood_depth(chunk['lat'].to_numpy(), chunk['lon'].to_numpy(),
+                                   districts['base_depth'].to_numpy())
+    risk_score, predicted_risk = calculate_risk_array(
+        rainfall, chunk['elevation'].to_numpy(), flood_depth, dtype=np.float32)
+    return pd.DataFrame({
+        'id': chunk['id'].to_numpy(),
+        'sido': districts['sido'].to_numpy(),
+        'gu': districts['gu'].to_numpy(),
+        'district_km': chunk['district_km'].to_numpy(),
+        'nx': chunk['nx'].to_numpy(),
+        'ny': chunk['ny'].to_numpy(),
+        'rainfall': rainfall,
+        'elevation': chunk['elevation'].to_numpy(),
+        'flood_depth': flood_depth,
+        'risk_score': risk_score,
+        'predicted_risk': predicted_risk
+    }, columns=OUTPUT_COLUMNS)
+
+
+def process_chunk(chunk, rainfall, encode_csv):
+    """워커 프로세스 작업 단위: CSV 출력이면 문자열 인코딩까지 워커에서 처리"""
+    result = score_chunk(chunk, rainfall)
+    if encode_csv:
+        return result.to_csv(header=False, index=False), len(result)
+    return result, len(result)
+
+
+class RainfallResolver:
+    """격자별 현재 강수량 (API 키가 없거나 조회 실패 시 default_rainfall)"""
+
+    def __init__(self, api_key, default_rainfall, max_workers):
+        self.api_key = api_key
+        self.default_rainfall = default_rainfall
+        self.max_workers = max_workers
+        self._rainfall = {}
+
+    def __call__(self, nx, ny):
+        unique, inverse = np.unique(np.stack([nx, ny], axis=1), axis=0, return_inverse=True)
+        cells = [tuple(cell) for cell in unique.tolist()]
+        new_cells = [cell for cell in cells if cell not in self._rainfall]
+        if new_cells:
+            observations = fetch_cells(self.api_key, new_cells, self.max_workers) if self.api_key else {}
+            for cell in new_cells:
+                obs = observations.get(cell)
+                self._rainfall[cell] = obs['rainfall'] if obs is not None else self.default_rainfall
+        values = np.array([self._rainfall[cell] for cell in cells], dtype=np.float32)
+        return values[inverse.reshape(-1)]
+
+
+def fill_elevation(lat, lon, elevation):
+    """빈(NaN) 고도만 DEM 값으로, DEM도 없으면 DEFAULT_ELEVATION (float32)"""
+    elevation = np.asarray(elevation, dtype=np.float32).copy()
+    missing = np.flatnonzero(np.isnan(elevation))
+    if len(missing):
+        dem = get_terrain().elevation
+        values = dem.sample(lat[missing], lon[missing]) if dem is not None else np.nan
+        elevation[missing] = np.where(np.isnan(values), DEFAULT_ELEVATION, values)
+    return elevation
+
+
+def _prepare(chunk, resolve_rainfall):
+    """
+    위경도가 비었거나 유한하지 않은 행, 최근접 지역이 MAX_DISTRICT_KM 밖인 행을 빼고
+    최근접 지역·격자·고도·강수량 결합. (chunk, rainfall, 제외한 행 수) 반환
+    (행 1개 때문에 전체 실행이 멈추거나 국외 지점이 엉뚱한 지역으로 진단되지 않도록).
+    """
+    lat, lon = chunk['lat'].to_numpy(), chunk['lon'].to_numpy()
+    codes = np.full(len(chunk), -1, dtype=np.intp)
+    distance_km = np.full(len(chunk), np.inf)
+    finite = np.isfinite(lat) & np.isfinite(lon)
+    codes[finite], distance_km[finite] = get_district_index().nearest(lat[finite], lon[finite],
+                                                                       max_km=MAX_DISTRICT_KM)
+    valid = codes >= 0
+    skipped = len(chunk) - int(valid.sum())
+    if skipped:
+        chunk, lat, lon, codes, distance_km = chunk[valid], lat[valid], lon[valid], codes[valid], distance_km[valid]
+    nx, ny = latlon_to_grid(lat, lon)
+    chunk = chunk.assign(code=codes, district_km=distance_km.astype(np.float32), nx=nx, ny=ny,
+                         elevation=fill_elevation(lat, lon, chunk['elevation'].to_numpy()))
+    return chunk, resolve_rainfall(nx, ny), skipped
+
+
+def run(input_path, output_path, chunk_size=100000, workers=1, api_key='', default_rainfall=100.0,
+        fetch_workers=16):
+    """포트폴리오 진단 실행. (처리 행 수, 경과 초, 좌표가 유효하지 않거나 범위 밖이라 제외한 행 수) 반환"""
+    resolve_rainfall = RainfallResolver(api_key, default_rainfall, fetch_workers)
+    writer = ResultWriter(output_path)
+    encode_csv = workers > 1 and not _is_parquet(output_path)
+    rows = skipped = 0
+    start = time.perf_counter()
+    try:
+        if workers <= 1:
+            for chunk in read_chunks(input_path, chunk_size):
+                chunk, rainfall, n = _prepare(chunk, resolve_rainfall)
+                skipped += n
+                result = score_chunk(chunk, rainfall)
+                writer.write(result)
+                rows += len(result)
+        else:
+            # 처리 중 청크 수를 제한해 메모리 상한 유지, 결과는 입력 순서대로 기록
+            pending = []
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                for chunk in read_chunks(input_path, chunk_size):
+                    chunk, rainfall, n = _prepare(chunk, resolve_rainfall)
+                    skipped += n
+                    pending.append(executor.submit(process_chunk, chunk, rainfall, encode_csv))
+                    if len(pending) >= workers * 2:
+                        result, n = pending.pop(0).result()
+                        writer.write(result)
+                        rows += n
+                for future in pending:
+                    result, n = future.result()
+                    writer.write(result)
+                    rows += n
+    finally:
+        writer.close()
+    return rows, time.perf_counter() - start, skipped
+
+
+def peak_memory_mb():
+    """현재 프로세스와 종료된 자식 프로세스 중 최대 RSS (MB, Linux 기준 KB 단위)"""
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return max(own, children) / 1024
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="건물 포트폴리오 침수 위험 일괄 진단")
+    parser.add_argument('input', help="입력 CSV/Parquet (id, lat, lon, 선택 elevation)")
+    parser.add_argument('output', help="결과 CSV/Parquet")
+    parser.add_argument('--chunk-size', type=int, default=100000, help="청크 행 수")
+    parser.add_argument('--workers', type=int, default=1, help="청크 처리 프로세스 수")
+    parser.add_argument('--api-key', default=os.environ.get('KMA_API_KEY', ''), help="기상청 API 키 (없으면 --rainfall 사용)")
+    parser.add_argument('--rainfall', type=float, default=100.0, help="관측 실패/미사용 시 강수량 (mm)")
+    parser.add_argument('--fetch-workers', type=int, default=16, help="기상청 동시 요청 수")
+    args = parser.parse_args(argv)
+
+    rows, elapsed, skipped = run(args.input, args.output, args.chunk_size, args.workers, args.api_key,
+                        args.rainfall, args.fetch_workers)
+    print(f"{rows}행 처리, {elapsed:.2f}초 ({rows / max(elapsed, 1e-9):,.0f} rows/sec), "
+          f"최대 메모리 {peak_memory_mb():.1f}MB")
+    if skipped:
+        print(f"위경도가 비었거나 유효하지 않은 행, 가장 가까운 지역이 {MAX_DISTRICT_KM}km 밖인 행 {skipped}개는 제외")
+
+
+if __name__ == '__main__':
+    main()
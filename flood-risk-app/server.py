@@ -0,0 +1,345 @@
+"""
+침수 위험 JSON 진단 서비스 (Streamlit UI와 별도로 실행하는 asyncio HTTP 서버).
+
+    KMA_API_KEY=... python server.py --port 8080 [--workers 4]
+
+--workers N: 같은 포트(SO_REUSEPORT)를 여는 워커 프로세스 N개. 관측값은 호스트 공용 캐시
+(modules/shared_cache.py)로 공유되어 워커를 늘려도 기상청 호출 수는 늘지 않음.
+
+GET  /score?sido=서울특별시&gu=강남구&elevation=10   (또는 lat=..&lon=.., 선택 rainfall=..)
+     lat/lon 요청에 elevation이 없으면 수치표고(DEM) 래스터 고도 (없으면 10m),
+     침수심은 침수심 래스터 값 (없는 곳·sido/gu 요청은 지역 앙상블 중앙값)
+POST /score/batch   {"items": [{"sido": ..., "gu": ..., "elevation": ...}, ...]}
+GET  /ranking?offset=0&limit=50&sido=부산광역시&class=4   전국 위험 순위 (sido·class 선택, 발표 시각마다 갱신)
+GET  /stats         관측/응답 캐시 통계
+GET  /metrics       단계별 소요 시간 (Prometheus text)
+GET  /health
+"""
+import argparse
+import asyncio
+import json
+import logging
+import math
+import multiprocessing
+import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, parse_qsl
+
+from modules.api import get_observation, peek_observation, get_cache_stats, get_base_datetime, get_grid_cells
+from modules.district_index import get_district_index
+from modules.ensemble import get_depth_ensemble
+from modules.profiling import span, prometheus_text
+from modules.ranking import CLASS_LABELS, get_ranking
+from modules.raster import DEFAULT_ELEVATION, get_terrain
+from modules.utils import calculate_risk
+from score_portfolio import site_flood_depth
+
+RESPONSE_CACHE_SIZE = 65536
+MAX_BATCH = 1000
+MAX_PAGE = 500  # /ranking limit 상한
+MAX_BODY = 1 << 20
+JSON_TYPE = 'application/json; charset=utf-8'
+
+_STATUS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 413: 'Payload Too Large',
+           500: 'Internal Server Error', 502: 'Bad Gateway'}
+
+logger = logging.getLogger('flood_risk.server')
+
+
+class RequestError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class ScoringService:
+    """관측 조회(비동기 + 격자별 요청 병합)와 진단 결과 캐시"""
+
+    def __init__(self, api_key, fetch_workers=16):
+        self.api_key = api_key
+        self.index = get_district_index()
+        self.ensemble = get_depth_ensemble()
+        self.terrain = get_terrain()
+        self.ranking = get_ranking()
+        self._ranking_base = None  # 순위에 반영한 발표 시각
+        self._ranking_lock = None  # 첫 갱신 때 실행 중 루프에서 생성
+        table = self.index.table
+        self._rows = list(zip(table['sido'].astype(str), table['gu'].astype(str),
+                              table['nx'].astype(int), table['ny'].astype(int)))
+        self._executor = ThreadPoolExecutor(max_workers=fetch_workers, thread_name_prefix='kma-fetch')
+        self._inflight = {}  # (nx, ny) -> asyncio.Future
+        self._responses = OrderedDict()
+        self.stats = {'requests': 0, 'response_hits': 0, 'fetch_coalesced': 0}
+
+    async def observation(self, nx, ny):
+        """
+        프로세스 캐시 적중이면 즉시, 아니면 같은 격자 동시 요청을 1건의 스레드 조회로 병합
+        (호스트 공용 캐시(SQLite) 조회도 스레드에서 get_observation이 수행 → 이벤트 루프 블로킹 없음)
+        """
+        obs = peek_observation(nx, ny, shared=False)
+        if obs is not None:
+            return obs
+        future = self._inflight.get((nx, ny))
+        if future is not None:
+            self.stats['fetch_coalesced'] += 1
+            return await asyncio.shield(future)
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._executor, get_observation, self.api_key, nx, ny)
+        self._inflight[(nx, ny)] = future
+        try:
+            return await future
+        finally:
+            self._inflight.pop((nx, ny), None)
+
+    def resolve(self, item):
+        """요청 항목 → 지역 코드 (sido/gu 우선, 없으면 lat/lon 최근접)"""
+        if item.get('sido') and item.get('gu'):
+            code = int(self.index.code_of(item['sido'], item['gu'])[0])
+            if code < 0:
+                raise RequestError(404, f"지역 없음: {item['sido']} {item['gu']}")
+            return code
+        try:
+            code, _ = self.index.nearest(float(item['lat']), float(item['lon']))
+        except (KeyError, TypeError, ValueError):
+            raise RequestError(400, "sido/gu 또는 lat/lon 필요")
+        return int(code)
+
+    async def score(self, item):
+        """항목 1개 진단 결과 (JSON bytes)"""
+        self.stats['requests'] += 1
+        if not isinstance(item, dict):
+            raise RequestError(400, "항목은 JSON 객체여야 함")
+        code = self.resolve(item)
+        try:
+            if item.get('elevation') is None and item.get('lat') is not None and item.get('lon') is not None:
+                elevation = self.terrain.elevation_at(float(item['lat']), float(item['lon']), DEFAULT_ELEVATION)
+            else:
+                elevation = float(item.get('elevation', DEFAULT_ELEVATION))
+            rainfall = float(item['rainfall']) if item.get('rainfall') is not None else None
+        except (TypeError, ValueError):
+            raise RequestError(400, "elevation/rainfall은 숫자여야 함")
+        # float()은 nan/inf도 받음: JSON에 NaN/Infinity가 나가거나 calculate_risk가 0으로 나누지 않도록
+        if not math.isfinite(elevation) or elevation <= -1:
+            raise RequestError(400, "elevation은 -1보다 큰 유한한 숫자여야 함")
+        if rainfall is not None and (not math.isfinite(rainfall) or rainfall < 0):
+            raise RequestError(400, "rainfall은 0 이상의 유한한 숫자여야 함")
+        sido, gu, nx, ny = self._rows[code]
+
+        base_time = None
+        if rainfall is None:
+            if not self.api_key:
+                raise RequestError(400, "API 키 미설정: rainfall 값을 지정하세요")
+            try:
+                obs = await self.observation(nx, ny)
+            except Exception as e:
+                raise RequestError(502, f"기상청 조회 실패: {e}")
+            rainfall, base_time = obs['rainfall'], obs['base_date'] + obs['base_time']
+
+        # 침수심: 지역 앙상블 중앙값, lat/lon 요청은 배치 CLI(score_portfolio)와 같이 침수심 래스터 값 우선
+        flood_depth = round(float(self.ensemble.depth_percentiles[code][0]), 1)
+        if item.get('lat') is not None and item.get('lon') is not None:
+            flood_depth = float(site_flood_depth(float(item['lat']), float(item['lon']), flood_depth))
+
+        key = (code, elevation, flood_depth, rainfall, base_time)
+        body = self._responses.get(key)
+        if body is not None:
+            self._responses.move_to_end(key)
+            self.stats['response_hits'] += 1
+            return body
+
+        risk_score, predicted_risk = calculate_risk(rainfall, elevation, flood_depth)
+        body = json.dumps({
+            'sido': sido, 'gu': gu, 'nx': nx, 'ny': ny,
+            'rainfall': rainfall, 'base_time': base_time, 'elevation': elevation,
+            'flood_depth': flood_depth, 'risk_score': round(risk_score, 4), 'predicted_risk': predicted_risk,
+            'exceedance': self.ensemble.exceedance(rainfall, elevation, code)
+        }, ensure_ascii=False, allow_nan=False).encode('utf-8')
+        self._responses[key] = body
+        if len(self._responses) > RESPONSE_CACHE_SIZE:
+            self._responses.popitem(last=False)
+        return body
+
+    async def score_batch(self, items):
+        if not isinstance(items, list):
+            raise RequestError(400, "items 배열 필요")
+        if len(items) > MAX_BATCH:
+            raise RequestError(413, f"최대 {MAX_BATCH}건")
+
+        async def score_item(item):
+            try:
+                return await self.score(item)
+            except RequestError as e:
+                return json.dumps({'error': str(e), 'status': e.status}, ensure_ascii=False).encode('utf-8')
+
+        results = await asyncio.gather(*(score_item(item) for item in items))
+        return b'{"results":[' + b','.join(results) + b']}'
+
+    async def refresh_ranking(self):
+        """발표 시각이 바뀌었으면 전국 격자 관측(요청 병합·공용 캐시 경유)으로 순위 갱신 (바뀐 격자만 재채점)"""
+        base = get_base_datetime()
+        if not self.api_key or self._ranking_base == base:
+            return
+        if self._ranking_lock is None:
+            self._ranking_lock = asyncio.Lock()
+        async with self._ranking_lock:
+            if self._ranking_base == base:
+                return
+            cells = list(get_grid_cells())
+            results = await asyncio.gather(*(self.observation(nx, ny) for nx, ny in cells), return_exceptions=True)
+            rainfall = {cell: obs['rainfall'] for cell, obs in zip(cells, results) if not isinstance(obs, BaseException)}
+            self.ranking.update(rainfall, base.strftime('%Y%m%d%H%M'))
+            self._ranking_base = base
+
+    async def ranking_page(self, params):
+        """순위 페이지 (JSON bytes). 관측 없는 항목의 점수·강수량은 null"""
+        try:
+            offset = max(int(params.get('offset', 0)), 0)
+            limit = min(max(int(params.get('limit', 50)), 1), MAX_PAGE)
+            risk_class = int(params['class']) if params.get('class') not in (None, '') else None
+        except ValueError:
+            raise RequestError(400, "offset/limit/class는 정수여야 함")
+        if risk_class is not None and not 0 <= risk_class < len(CLASS_LABELS):
+            raise RequestError(400, f"class는 0–{len(CLASS_LABELS) - 1}")
+        await self.refresh_ranking()
+        total, rows = self.ranking.page(offset, limit, params.get('sido') or None, risk_class)
+        items = []
+        for row in rows:
+            item = row._asdict()
+            item['rainfall'] = None if row.rainfall != row.rainfall else row.rainfall  # NaN → null
+            item['risk_score'] = None if row.risk_score != row.risk_score else row.risk_score
+            item['risk_label'] = CLASS_LABELS[row.risk_class]
+            items.append(item)
+        return json.dumps({
+            'total': total, 'offset': offset, 'limit': limit, 'base_time': self.ranking.base_time,
+            'items': items
+        }, ensure_ascii=False).encode('utf-8')
+
+    async def handle(self, method, target, body):
+        """(status, body bytes, content-type) 반환"""
+        url = urlsplit(target)
+        if method == 'GET' and url.path == '/score':
+            with span('server_score'):
+                return 200, await self.score(dict(parse_qsl(url.query))), JSON_TYPE
+        if method == 'POST' and url.path == '/score/batch':
+            try:
+                payload = json.loads(body or b'{}')
+            except ValueError:
+                raise RequestError(400, "JSON 파싱 실패")
+            if not isinstance(payload, dict):
+                raise RequestError(400, "{\"items\": [...]} 형식 JSON 객체 필요")
+            with span('server_score_batch'):
+                return 200, await self.score_batch(payload.get('items')), JSON_TYPE
+        if method == 'GET' and url.path == '/ranking':
+            with span('server_ranking'):
+                return 200, await self.ranking_page(dict(parse_qsl(url.query))), JSON_TYPE
+        if method == 'GET' and url.path == '/stats':
+            stats = dict(self.stats, observation_cache=get_cache_stats(), response_cache_size=len(self._responses))
+            return 200, json.dumps(stats).encode('utf-8'), JSON_TYPE
+        if method == 'GET' and url.path == '/metrics':
+            return 200, prometheus_text().encode('utf-8'), 'text/plain; version=0.0.4; charset=utf-8'
+        if method == 'GET' and url.path == '/health':
+            return 200, b'{"status":"ok"}', JSON_TYPE
+        raise RequestError(404, "not found")
+
+
+async def _serve_connection(service, reader, writer):
+    """HTTP/1.1 keep-alive 연결 처리 (요청 단위 순차 응답)"""
+    try:
+        while True:
+            try:
+                head = await reader.readuntil(b'\r\n\r\n')
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                break
+            lines = head.decode('latin-1').split('\r\n')
+            try:
+                method, target, version = lines[0].split(' ', 2)
+            except ValueError:
+                break
+            headers = {}
+            for line in lines[1:]:
+                name, _, value = line.partition(':')
+                if name:
+                    headers[name.strip().lower()] = value.strip()
+            try:
+                length = int(headers.get('content-length') or 0)
+            except ValueError:
+                length = -1
+            if length < 0:  # 본문 경계를 알 수 없어 연결 종료
+                status, body, content_type = 400, b'{"error":"invalid content-length"}', JSON_TYPE
+                keep_alive = False
+            elif length > MAX_BODY:
+                status, body, content_type = 413, b'{"error":"payload too large"}', JSON_TYPE
+                keep_alive = False
+            else:
+                try:
+                    request_body = await reader.readexactly(length) if length else b''
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                try:
+                    status, body, content_type = await service.handle(method, target, request_body)
+                except RequestError as e:
+                    status, content_type = e.status, JSON_TYPE
+                    body = json.dumps({'error': str(e)}, ensure_ascii=False).encode('utf-8')
+                except Exception:  # 처리 중 예상 밖 오류도 응답은 보내고 연결 유지
+                    logger.exception("요청 처리 실패: %s %s", method, target)
+                    status, body, content_type = 500, b'{"error":"internal server error"}', JSON_TYPE
+                connection = headers.get('connection', '').lower()
+                keep_alive = connection != 'close' and (version == 'HTTP/1.1' or connection == 'keep-alive')
+
+            writer.write(
+                f"HTTP/1.1 {status} {_STATUS.get(status, '')}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1') + body)
+            await writer.drain()
+            if not keep_alive:
+                break
+    finally:
+        writer.close()
+
+
+async def start_server(service, host='127.0.0.1', port=8080, reuse_port=False):
+    return await asyncio.start_server(lambda r, w: _serve_connection(service, r, w), host, port,
+                                      reuse_port=reuse_port or None)
+
+
+async def _main(args):
+    service = ScoringService(args.api_key, args.fetch_workers)
+    server = await start_server(service, args.host, args.port, reuse_port=args.workers > 1)
+    print(f"침수 위험 진단 서비스 (pid {os.getpid()}): http://{args.host}:{args.port}")
+    async with server:
+        await server.serve_forever()
+
+
+def _serve(args):
+    try:
+        asyncio.run(_main(args))
+    except KeyboardInterrupt:
+        pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="침수 위험 JSON 진단 서비스")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--api-key', default=os.environ.get('KMA_API_KEY', ''))
+    parser.add_argument('--fetch-workers', type=int, default=16, help="기상청 동시 요청 스레드 수")
+    parser.add_argument('--workers', type=int, default=1, help="워커 프로세스 수 (2 이상이면 SO_REUSEPORT, Linux)")
+    args = parser.parse_args(argv)
+    if args.workers <= 1:
+        _serve(args)
+        return
+    # 워커마다 진단 캐시·요청 병합은 따로, 관측값/렌더링 결과는 호스트 공용 캐시로 공유
+    workers = [multiprocessing.Process(target=_serve, args=(args,), daemon=True) for _ in range(args.workers)]
+    for worker in workers:
+        worker.start()
+    try:
+        for worker in workers:
+            worker.join()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()